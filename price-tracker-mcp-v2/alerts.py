@@ -0,0 +1,84 @@
+"""
+가격 알림 인덱스 (검색어별 목표가 정렬 목록, 가격 관측 시 즉시 확인)
+"""
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from naver_api import normalize_query
+
+
+def current_price(products: List[Dict], top_n: int = 1) -> Optional[Dict]:
+    """
+    알림 판정에 쓰는 현재가 항목 (정확도순 상위 top_n개 중 최저가)
+
+    검색, 추적 갱신, 심층 비교, 알림 확인이 모두 같은 기준으로 알림을 판정하도록 함.
+    가격순 페이지나 뒤쪽 페이지의 저가 상품(액세서리 등)으로는 트리거되지 않음
+
+    Args:
+        products: 정확도순(sim) 검색 결과의 상품/가격 기록 목록 (price 포함)
+        top_n: 비교할 상위 항목 수
+    """
+    top = products[:max(top_n, 1)]
+    return min(top, key=lambda p: p['price']) if top else None
+
+
+class AlertIndex:
+    """
+    활성 가격 알림을 정규화된 검색어별로 목표가 순으로 보관
+
+    가격이 관측될 때마다 이분 탐색으로 목표가 이상인 알림(= 가격이 목표가 이하로
+    내려온 알림)을 찾음. 같은 알림이 같은 가격으로 반복 트리거되지 않도록 알림별로
+    마지막으로 알린 가격만 기억함 (알림 수만큼만 메모리 사용, 이전 가격으로 되돌아온
+    경우는 DB의 UNIQUE (alert_id, price)가 걸러냄).
+    """
+
+    def __init__(self):
+        # 검색어 -> (정렬된 목표가 목록, 같은 순서의 알림 목록)
+        self._alerts: Dict[str, Tuple[List[int], List[Dict]]] = {}
+        self._notified: Dict[int, int] = {}  # 알림 id -> 마지막으로 알린 가격
+
+    def load(self, alerts: List[Dict]):
+        """알림 목록으로 인덱스 다시 구성"""
+        self._alerts = {}
+        for alert in sorted(alerts, key=lambda alert: alert['target_price']):
+            targets, entries = self._alerts.setdefault(normalize_query(alert['keyword']), ([], []))
+            targets.append(alert['target_price'])
+            entries.append(alert)
+
+    def add(self, alert: Dict):
+        """알림 추가 (목표가 순서 유지)"""
+        targets, entries = self._alerts.setdefault(normalize_query(alert['keyword']), ([], []))
+        i = bisect_right(targets, alert['target_price'])
+        targets.insert(i, alert['target_price'])
+        entries.insert(i, alert)
+
+    def mark_notified(self, alert_id: int, price: int):
+        """알림을 price로 알렸음을 기록 (트리거 저장 후, 재시작 시 DB의 마지막 트리거로 호출)"""
+        self._notified[alert_id] = price
+
+    def match(self, keyword: str, price: int) -> List[Dict]:
+        """
+        관측 가격으로 새로 트리거된 알림 찾기
+
+        알린 것으로 기록하지는 않음 (트리거를 저장한 뒤 mark_notified 호출)
+
+        Returns:
+            목표가가 price 이상이면서 마지막으로 알린 가격이 price가 아닌 알림 목록
+        """
+        index = self._alerts.get(normalize_query(keyword))
+        if index is None:
+            return []
+
+        targets, entries = index
+        return [
+            alert for alert in entries[bisect_left(targets, price):]
+            if self._notified.get(alert['id']) != price
+        ]
+
+    def stats(self) -> Dict:
+        """인덱스 통계"""
+        return {
+            "keywords": len(self._alerts),
+            "alerts": sum(len(targets) for targets, _ in self._alerts.values()),
+            "notified": len(self._notified)
+        }
@@ -0,0 +1,293 @@
+"""
+벤치마크용 가짜 네이버 쇼핑 검색 서버 (shop.json 호환, 표준 라이브러리만 사용)
+
+기록된 응답 파일이 있으면 그대로 재생하고, 없는 검색어는 검색어별로 항상 같은
+결과를 생성함. 응답 지연/흔들림/오류율을 설정할 수 있음.
+
+사용법:
+    # 단독 실행 (부하 테스트 등)
+    python benchmarks/fake_naver.py --port 8081 --latency 80 --jitter 20 --error-rate 0.01
+    NAVER_API_URL=http://127.0.0.1:8081/v1/search/shop.json python server.py
+
+    # 실제 API 응답 기록 (NAVER_CLIENT_ID/SECRET 필요)
+    python benchmarks/fake_naver.py record --out benchmarks/responses.json 노트북 모니터 키보드
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from naver_api import normalize_query  # noqa: E402
+
+SEARCH_PATH = "/v1/search/shop.json"
+MAX_TOTAL = 1000
+MALLS = ["네이버", "쿠팡", "11번가", "G마켓", "옥션", "SSG닷컴", "롯데ON"]
+SUFFIXES = ["", "", "", " 정품", " 2024년형", " 풀박스", " 리퍼", " 케이스"]  # 일부는 액세서리 필터 대상
+
+
+@lru_cache(maxsize=512)
+def _catalog(query: str, sort: str) -> Tuple[int, List[Dict]]:
+    """검색어별 가짜 상품 목록 (전체 결과 수, 정렬된 상품 최대 1000개)"""
+    seed = zlib.crc32(normalize_query(query).encode("utf-8"))
+    rng = random.Random(seed)
+    base_price = rng.randint(10, 300) * 1000
+    total = rng.randint(200, 50000)
+
+    items = []
+    for rank in range(1, min(total, MAX_TOTAL) + 1):
+        r = random.Random(seed * 1_000_003 + rank)
+        price = int(base_price * r.uniform(0.6, 1.8)) // 10 * 10
+        items.append({
+            "title": f"<b>{query}</b> 상품 {rank}{r.choice(SUFFIXES)}",
+            "link": f"https://search.shopping.naver.com/catalog/{seed % 100000}{rank:04d}",
+            "image": f"https://shopping-phinf.pstatic.net/{seed % 1000}/{rank}.jpg",
+            "lprice": str(price),
+            "hprice": "",
+            "mallName": r.choice(MALLS),
+            "productId": str(seed % 100000 * 10000 + rank),
+            "productType": "1",
+            "brand": "",
+            "maker": "",
+            "category1": "디지털/가전",
+            "category2": "",
+            "category3": "",
+            "category4": ""
+        })
+
+    if sort in ("asc", "dsc"):
+        items.sort(key=lambda item: int(item["lprice"]), reverse=sort == "dsc")
+    return total, items
+
+
+def search_response(total: int, items: List[Dict], display: int, start: int) -> Dict:
+    """상품 목록에서 요청 구간을 네이버 응답 형식으로 반환"""
+    page = items[start - 1:start - 1 + display]
+    return {
+        "lastBuildDate": time.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+        "total": total,
+        "start": start,
+        "display": len(page),
+        "items": page
+    }
+
+
+def synthesize(query: str, display: int, start: int, sort: str) -> Dict:
+    """검색어별로 항상 같은 가짜 검색 결과 생성"""
+    total, items = _catalog(query, sort)
+    return search_response(total, items, display, start)
+
+
+class FakeNaverServer:
+    """가짜 검색 서버 (백그라운드 스레드에서 실행)"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 50,
+        jitter_ms: float = 10,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        responses: Optional[Dict[str, Dict]] = None
+    ):
+        """
+        Args:
+            host: 바인딩 주소
+            port: 포트 (0이면 빈 포트 자동 선택)
+            latency_ms: 평균 응답 지연 (밀리초)
+            jitter_ms: 응답 지연 흔들림 (±밀리초)
+            error_rate: 500 응답 비율 (0~1)
+            throttle_rate: 429 응답 비율 (0~1)
+            responses: 기록된 응답 {"정규화 검색어|sort": 응답} (record로 생성)
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.responses = responses or {}
+
+        self.requests = 0
+        self.errors = 0
+        self.replayed = 0
+        self._lock = threading.Lock()
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """검색 API 주소 (NAVER_API_URL에 지정)"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{SEARCH_PATH}"
+
+    def start(self) -> "FakeNaverServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-naver", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"requests": self.requests, "errors": self.errors, "replayed": self.replayed}
+
+    def reset(self):
+        with self._lock:
+            self.requests = self.errors = self.replayed = 0
+
+    def search(self, params: Dict[str, str]) -> Dict:
+        """검색 응답 (기록된 응답 우선)"""
+        query = params.get("query", "")
+        display = min(int(params.get("display", 10)), 100)
+        start = min(int(params.get("start", 1)), MAX_TOTAL)
+        sort = params.get("sort", "sim")
+
+        # 기록된 범위 안의 요청이면 기록된 상품 목록에서 잘라서 재생
+        recorded = self.responses.get(f"{normalize_query(query)}|{sort}")
+        if recorded is not None and start - 1 + display <= len(recorded["items"]):
+            with self._lock:
+                self.replayed += 1
+            return search_response(int(recorded["total"]), recorded["items"], display, start)
+        return synthesize(query, display, start, sort)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: Dict):
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == "/_stats":
+                    return self._send(200, server.stats())
+                if url.path != SEARCH_PATH:
+                    return self._send(404, {"errorMessage": "Not Found"})
+
+                with server._lock:
+                    server.requests += 1
+
+                delay = server.latency_ms + random.uniform(-server.jitter_ms, server.jitter_ms)
+                time.sleep(max(0.0, delay) / 1000)
+
+                roll = random.random()
+                if roll < server.throttle_rate:
+                    with server._lock:
+                        server.errors += 1
+                    return self._send(429, {"errorMessage": "Rate limit exceeded", "errorCode": "012"})
+                if roll < server.throttle_rate + server.error_rate:
+                    with server._lock:
+                        server.errors += 1
+                    return self._send(500, {"errorMessage": "System error", "errorCode": "500"})
+
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                self._send(200, server.search(params))
+
+            def do_POST(self):
+                if urlparse(self.path).path == "/_reset":
+                    server.reset()
+                    return self._send(200, server.stats())
+                self._send(404, {"errorMessage": "Not Found"})
+
+        return Handler
+
+
+def load_responses(path: Optional[str]) -> Dict[str, Dict]:
+    """기록된 응답 파일 읽기"""
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def record(queries: List[str], out: str, display: int, sorts: List[str]):
+    """실제 API 응답을 재생용 파일로 기록"""
+    from config import Config
+    from naver_api import NaverShoppingAPI
+
+    api = NaverShoppingAPI(Config.NAVER_CLIENT_ID, Config.NAVER_CLIENT_SECRET)
+    responses = load_responses(out) if os.path.exists(out) else {}
+    try:
+        for query in queries:
+            for sort in sorts:
+                result = await api.search_products(query, display=display, sort=sort)
+                if result.get("error"):
+                    print(f"❌ '{query}' ({sort}) 기록 실패: {result['error']}")
+                    continue
+                responses[f"{normalize_query(query)}|{sort}"] = result
+                print(f"✅ '{query}' ({sort}) {len(result.get('items', []))}개 기록")
+    finally:
+        await api.aclose()
+
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(responses, f, ensure_ascii=False, indent=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 네이버 쇼핑 검색 서버")
+    sub = parser.add_subparsers(dest="command")
+
+    rec = sub.add_parser("record", help="실제 API 응답 기록")
+    rec.add_argument("queries", nargs="+")
+    rec.add_argument("--out", default="benchmarks/responses.json")
+    rec.add_argument("--display", type=int, default=100)
+    rec.add_argument("--sorts", default="sim,asc")
+
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=50, help="평균 응답 지연 (ms)")
+    parser.add_argument("--jitter", type=float, default=10, help="응답 지연 흔들림 (±ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--responses", help="기록된 응답 파일 (record로 생성)")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        asyncio.run(record(args.queries, args.out, args.display, args.sorts.split(",")))
+        return
+
+    server = FakeNaverServer(
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        responses=load_responses(args.responses)
+    )
+    print(f"🛒 가짜 네이버 쇼핑 서버: {server.url} (통계: /_stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,556 @@
+"""
+부하 테스트 - streamable-http MCP 서버에 동시 세션을 단계적으로 늘리며 도구 호출 재생
+
+가짜 네이버 서버(fake_naver.py)와 server.py를 별도 프로세스로 띄우고, 단계마다
+동시 세션 수만큼 MCP 세션을 열어 정해진 비율(--mix)로 도구를 호출함.
+단계별 처리량, 지연(p50/p95/p99), 오류율과 서버 프로세스의 CPU/메모리/연결 수를
+기록해 어디서 포화되는지 보여줌. 서버 자원은 psutil이 있으면 사용하고 없으면 /proc에서 읽음.
+
+사용법:
+    python benchmarks/load.py --stages 1,5,10,25,50 --duration 20
+    python benchmarks/load.py --mix search_product=5,compare_prices=3,get_best_deals=2
+    # 이미 실행 중인 서버 (같은 호스트면 --pid로 자원 사용량도 기록)
+    python benchmarks/load.py --url http://127.0.0.1:8000/mcp --pid 12345
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from run import BACKGROUND_OFF_ENV, KEYWORDS, failed, git_commit, percentile  # noqa: E402
+
+# 부하 구성 이름 -> (도구 이름, 인자 생성 함수)
+CALLS: Dict[str, Tuple[str, Callable[[random.Random], Dict]]] = {
+    "search_product": ("search_product", lambda r: {"keyword": r.choice(KEYWORDS)}),
+    "compare_prices": ("compare_prices", lambda r: {"keyword": r.choice(KEYWORDS)}),
+    "compare_prices_deep": ("compare_prices", lambda r: {"keyword": r.choice(KEYWORDS), "deep": True}),
+    "batch_search": ("batch_search", lambda r: {"keywords": r.sample(KEYWORDS, 3)}),
+    "batch_compare": ("batch_compare", lambda r: {"keywords": r.sample(KEYWORDS, 3)}),
+    "set_price_alert": ("set_price_alert", lambda r: {
+        "keyword": r.choice(KEYWORDS), "target_price": r.randint(10, 300) * 1000}),
+    "track_product": ("track_product", lambda r: {"keyword": r.choice(KEYWORDS)}),
+    "get_price_history": ("get_price_history", lambda r: {"keyword": r.choice(KEYWORDS)}),
+    "list_tracked_products": ("list_tracked_products", lambda r: {}),
+    "get_best_deals": ("get_best_deals", lambda r: {"limit": 5}),
+    "check_price_alerts": ("check_price_alerts", lambda r: {}),
+    "get_triggered_alerts": ("get_triggered_alerts", lambda r: {}),
+}
+
+DEFAULT_MIX = "search_product=4,compare_prices=3,get_price_history=1,get_best_deals=1,set_price_alert=1"
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'이름=가중치,...' 형식의 호출 비율 파싱"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in CALLS:
+            raise SystemExit(f"❌ 알 수 없는 호출: {name} (사용 가능: {', '.join(CALLS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_port(port: int, timeout: float, process: Optional[subprocess.Popen] = None):
+    """포트가 연결을 받을 때까지 대기"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"프로세스가 종료됨 (exit {process.returncode})")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{port} 포트 대기 시간 초과 ({timeout:g}초)")
+
+
+class ProcessSampler:
+    """
+    서버 프로세스 자원 사용량을 백그라운드 스레드에서 주기적으로 기록
+
+    psutil이 있으면 사용하고, 없으면 /proc/<pid>에서 직접 읽음 (Linux).
+    연결 수는 서버 포트로 들어온 ESTABLISHED TCP 연결 수.
+    """
+
+    def __init__(self, pid: int, port: int, interval: float = 0.5):
+        self.pid = pid
+        self.port = port
+        self.interval = interval
+        self.samples: List[Dict] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._process = psutil.Process(pid) if psutil is not None else None
+        self._ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._last_cpu: Optional[Tuple[float, float]] = None  # (시각, CPU 시간)
+
+    @property
+    def source(self) -> str:
+        return "psutil" if self._process is not None else "/proc"
+
+    def start(self) -> "ProcessSampler":
+        self._sample()  # CPU 사용률 기준점
+        self._thread = threading.Thread(target=self._run, name="process-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.samples.append(self._sample())
+            except (OSError, ValueError) as e:
+                logging.getLogger(__name__).warning(f"⚠️ 서버 자원 측정 실패: {e}")
+                return
+            except Exception as e:  # psutil.NoSuchProcess 등
+                logging.getLogger(__name__).warning(f"⚠️ 서버 자원 측정 중단: {e}")
+                return
+
+    def _sample(self) -> Dict:
+        now = time.monotonic()
+        if self._process is not None:
+            times = self._process.cpu_times()
+            cpu_time = times.user + times.system
+            rss = self._process.memory_info().rss
+            fds = self._process.num_fds()
+            threads = self._process.num_threads()
+            connections = sum(
+                1 for c in self._process.net_connections(kind="tcp")
+                if c.status == psutil.CONN_ESTABLISHED and c.laddr and c.laddr.port == self.port
+            )
+        else:
+            cpu_time, threads = self._proc_stat()
+            rss = self._proc_rss()
+            fds = len(os.listdir(f"/proc/{self.pid}/fd"))
+            connections = self._proc_connections()
+
+        cpu_percent = None
+        if self._last_cpu is not None:
+            last_at, last_cpu = self._last_cpu
+            cpu_percent = (cpu_time - last_cpu) / max(now - last_at, 1e-6) * 100
+        self._last_cpu = (now, cpu_time)
+
+        return {
+            "at": now,
+            "cpu_percent": cpu_percent,
+            "rss_mb": rss / (1024 * 1024),
+            "fds": fds,
+            "threads": threads,
+            "connections": connections
+        }
+
+    def _proc_stat(self) -> Tuple[float, int]:
+        """(user+system CPU 시간(초), 스레드 수)"""
+        with open(f"/proc/{self.pid}/stat") as f:
+            # 프로세스 이름에 공백이 있을 수 있어 마지막 ')' 뒤부터 분리
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self._ticks, int(fields[17])
+
+    def _proc_rss(self) -> int:
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    def _proc_connections(self) -> int:
+        port = f":{self.port:04X}"
+        count = 0
+        for path in ("/proc/net/tcp", "/proc/net/tcp6"):
+            try:
+                with open(path) as f:
+                    next(f)
+                    for line in f:
+                        fields = line.split()
+                        # local_address가 서버 포트이고 상태가 ESTABLISHED(01)
+                        if fields[1].endswith(port) and fields[3] == "01":
+                            count += 1
+            except FileNotFoundError:
+                continue
+        return count
+
+    def window(self, started: float, ended: float) -> Dict:
+        """구간 안의 표본 요약"""
+        samples = [s for s in self.samples if started <= s["at"] <= ended]
+        if not samples:
+            return {}
+        cpu = [s["cpu_percent"] for s in samples if s["cpu_percent"] is not None]
+        return {
+            "samples": len(samples),
+            "cpu_avg_percent": round(sum(cpu) / len(cpu), 1) if cpu else None,
+            "cpu_max_percent": round(max(cpu), 1) if cpu else None,
+            "rss_max_mb": round(max(s["rss_mb"] for s in samples), 1),
+            "fds_max": max(s["fds"] for s in samples),
+            "threads_max": max(s["threads"] for s in samples),
+            "connections_max": max(s["connections"] for s in samples)
+        }
+
+
+class StageStats:
+    """한 단계의 호출 결과 집계"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Counter = Counter()       # 예외/프로토콜 오류 (호출 이름별)
+        self.failures: Counter = Counter()     # success=False 응답
+        self.error_types: Counter = Counter()
+        self.sessions = 0
+        self.session_errors = 0
+        self.connect_ms: List[float] = []
+
+    def record(self, name: str, elapsed: float, error: Optional[str] = None, failure: bool = False):
+        self.latencies.setdefault(name, []).append(elapsed * 1000)
+        if error is not None:
+            self.errors[name] += 1
+            self.error_types[error] += 1
+        elif failure:
+            self.failures[name] += 1
+
+    def summary(self, elapsed: float) -> Dict:
+        every = sorted(ms for values in self.latencies.values() for ms in values)
+        total = len(every)
+        errors = sum(self.errors.values())
+        connect = sorted(self.connect_ms)
+
+        def latency(values: List[float]) -> Dict:
+            values = sorted(values)
+            return {
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+                "max_ms": round(values[-1], 2) if values else 0.0
+            }
+
+        return {
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            **latency(every),
+            "errors": errors,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "failures": sum(self.failures.values()),
+            "error_types": dict(self.error_types.most_common()),
+            "sessions": self.sessions,
+            "session_errors": self.session_errors,
+            "connect_p50_ms": round(percentile(connect, 50), 2),
+            "connect_p95_ms": round(percentile(connect, 95), 2),
+            "tools": {
+                name: {
+                    "requests": len(values),
+                    "errors": self.errors[name],
+                    "failures": self.failures[name],
+                    **latency(values)
+                }
+                for name, values in sorted(self.latencies.items())
+            }
+        }
+
+
+async def ignore_log(message):
+    """서버 로그 알림은 출력하지 않음"""
+
+
+async def virtual_user(
+    url: str,
+    mix: Dict[str, float],
+    stats: StageStats,
+    stop_at: float,
+    rng: random.Random,
+    think_ms: float,
+    timeout: float
+):
+    """MCP 세션 하나를 열고 stop_at까지 도구를 반복 호출"""
+    from fastmcp import Client
+
+    names = list(mix)
+    weights = [mix[name] for name in names]
+
+    started = time.perf_counter()
+    try:
+        async with Client(url, log_handler=ignore_log, timeout=timeout) as client:
+            stats.sessions += 1
+            stats.connect_ms.append((time.perf_counter() - started) * 1000)
+
+            while time.monotonic() < stop_at:
+                name = rng.choices(names, weights)[0]
+                tool, make_args = CALLS[name]
+                called = time.perf_counter()
+                try:
+                    result = await client.call_tool(tool, make_args(rng), raise_on_error=False)
+                except Exception as e:
+                    stats.record(name, time.perf_counter() - called, error=type(e).__name__)
+                    continue
+
+                elapsed = time.perf_counter() - called
+                if result.is_error:
+                    stats.record(name, elapsed, error="ToolError")
+                else:
+                    stats.record(name, elapsed, failure=failed(result))
+
+                if think_ms:
+                    await asyncio.sleep(rng.uniform(0, 2 * think_ms) / 1000)
+    except Exception as e:
+        stats.session_errors += 1
+        stats.error_types[f"session:{type(e).__name__}"] += 1
+
+
+def upstream_requests(naver_url: Optional[str]) -> Optional[int]:
+    """가짜 네이버 서버의 누적 요청 수 (/_stats)"""
+    if not naver_url:
+        return None
+    try:
+        stats_url = naver_url.split("/v1/", 1)[0] + "/_stats"
+        return httpx.get(stats_url, timeout=2).json()["requests"]
+    except (httpx.HTTPError, ValueError, KeyError):
+        return None
+
+
+async def run_stages(args, url: str, mix: Dict[str, float], sampler: Optional[ProcessSampler]) -> List[Dict]:
+    results = []
+    rng = random.Random(args.seed)
+
+    for concurrency in args.stages:
+        stats = StageStats()
+        upstream_before = upstream_requests(args.naver_url)
+        cpu_before = time.process_time()
+
+        started = time.monotonic()
+        stop_at = started + args.duration
+        await asyncio.gather(*(
+            virtual_user(url, mix, stats, stop_at, random.Random(rng.random()), args.think_ms, args.timeout)
+            for _ in range(concurrency)
+        ))
+        ended = time.monotonic()
+
+        summary = {"concurrency": concurrency, "duration_s": round(ended - started, 2)}
+        summary.update(stats.summary(ended - started))
+        # 부하 생성기 자체가 CPU를 다 쓰면 측정값은 서버가 아니라 생성기의 한계
+        summary["generator_cpu_percent"] = round((time.process_time() - cpu_before) / (ended - started) * 100, 1)
+
+        upstream_after = upstream_requests(args.naver_url)
+        if upstream_before is not None and upstream_after is not None:
+            upstream = upstream_after - upstream_before
+            summary["upstream_calls"] = upstream
+            summary["upstream_per_call"] = round(upstream / summary["requests"], 3) if summary["requests"] else 0.0
+        if sampler is not None:
+            summary["server"] = sampler.window(started, ended)
+
+        results.append(summary)
+        print_stage(summary)
+
+        if args.max_error_rate is not None and summary["error_rate"] > args.max_error_rate:
+            print(f"🛑 오류율 {summary['error_rate']:.1%} > {args.max_error_rate:.1%}, 부하 증가 중단")
+            break
+        if args.max_p95 is not None and summary["p95_ms"] > args.max_p95:
+            print(f"🛑 p95 {summary['p95_ms']:.0f}ms > {args.max_p95:g}ms, 부하 증가 중단")
+            break
+
+        if args.cooldown:
+            await asyncio.sleep(args.cooldown)
+
+    return results
+
+
+def print_stage(s: Dict):
+    server = s.get("server") or {}
+    cpu = server.get("cpu_avg_percent")
+    line = (
+        f"동시 {s['concurrency']:>4}  요청 {s['requests']:>6}  {s['throughput_rps']:>8.1f}/s  "
+        f"p50 {s['p50_ms']:>8.1f}ms  p95 {s['p95_ms']:>8.1f}ms  p99 {s['p99_ms']:>8.1f}ms  "
+        f"오류 {s['error_rate']:>6.1%}  생성기 CPU {s['generator_cpu_percent']:>5.1f}%"
+    )
+    if server:
+        line += (
+            f"  서버 CPU {cpu if cpu is not None else 0:>5.1f}% (최대 {server.get('cpu_max_percent') or 0:.0f}%)"
+            f"  RSS {server['rss_max_mb']:.0f}MB  연결 {server['connections_max']}"
+        )
+    print(line)
+
+
+def print_summary(results: List[Dict]):
+    """최대 처리량과 포화 지점 (동시 세션을 늘려도 처리량이 5% 미만 증가한 첫 단계)"""
+    if not results:
+        return
+    peak = max(results, key=lambda s: s["throughput_rps"])
+    print(f"\n📈 최대 처리량 {peak['throughput_rps']:.1f}/s (동시 {peak['concurrency']}, p95 {peak['p95_ms']:.0f}ms)")
+
+    for previous, current in zip(results, results[1:]):
+        if current["throughput_rps"] < previous["throughput_rps"] * 1.05:
+            print(
+                f"⚠️ 포화 추정: 동시 {previous['concurrency']} → {current['concurrency']}에서 "
+                f"처리량 {previous['throughput_rps']:.1f} → {current['throughput_rps']:.1f}/s, "
+                f"p95 {previous['p95_ms']:.0f} → {current['p95_ms']:.0f}ms"
+            )
+            break
+
+    busiest = max(results, key=lambda s: s["generator_cpu_percent"])
+    if busiest["generator_cpu_percent"] >= 90:
+        print(
+            f"⚠️ 부하 생성기 CPU {busiest['generator_cpu_percent']:.0f}% (동시 {busiest['concurrency']}) - "
+            "이 구간은 서버보다 생성기가 먼저 포화됐을 수 있음"
+        )
+
+
+def start_local(args, workdir: str) -> Tuple[List[subprocess.Popen], str, int, int]:
+    """가짜 네이버 서버와 MCP 서버를 별도 프로세스로 실행"""
+    processes = []
+    naver_port = free_port()
+    fake = subprocess.Popen(
+        [
+            sys.executable, os.path.join(BENCH_DIR, "fake_naver.py"),
+            "--port", str(naver_port),
+            "--latency", str(args.latency),
+            "--jitter", str(args.jitter),
+            "--error-rate", str(args.error_rate),
+            "--throttle-rate", str(args.throttle_rate),
+        ] + (["--responses", args.responses] if args.responses else []),
+        stdout=subprocess.DEVNULL
+    )
+    processes.append(fake)
+    wait_port(naver_port, 10, fake)
+    args.naver_url = f"http://127.0.0.1:{naver_port}/v1/search/shop.json"
+
+    port = args.port or free_port()
+    env = {
+        **os.environ,
+        "NAVER_API_URL": args.naver_url,
+        "NAVER_CLIENT_ID": os.getenv("NAVER_CLIENT_ID") or "loadtest",
+        "NAVER_CLIENT_SECRET": os.getenv("NAVER_CLIENT_SECRET") or "loadtest",
+        "NAVER_RATE_PER_SECOND": "100000",
+        "NAVER_RATE_BURST": "100000",
+        "NAVER_DAILY_LIMIT": "100000000",
+        "DATABASE_PATH": os.path.join(workdir, "load.db"),
+        "CACHE_ENABLED": "false" if args.no_cache else "true",
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(port),
+        "FASTMCP_LOG_LEVEL": "WARNING",
+        **BACKGROUND_OFF_ENV,
+    }
+    log_path = os.path.join(workdir, "server.log")
+    with open(log_path, "w") as log:
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(os.path.dirname(BENCH_DIR), "server.py")],
+            env=env, stdout=log, stderr=subprocess.STDOUT, cwd=workdir
+        )
+    processes.append(server)
+    try:
+        wait_port(port, 30, server)
+    except RuntimeError as e:
+        raise SystemExit(f"❌ MCP 서버 시작 실패: {e} (로그: {log_path})")
+    return processes, f"http://127.0.0.1:{port}/mcp", port, server.pid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price Tracker MCP 서버 부하 테스트 (streamable-http)")
+    parser.add_argument("--stages", default="1,5,10,25,50", help="단계별 동시 세션 수 (쉼표로 구분)")
+    parser.add_argument("--duration", type=float, default=15, help="단계별 실행 시간 (초)")
+    parser.add_argument("--cooldown", type=float, default=1, help="단계 사이 대기 시간 (초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"호출 비율 (사용 가능: {', '.join(CALLS)})")
+    parser.add_argument("--think-ms", type=float, default=0, help="세션별 호출 간 평균 대기 (ms)")
+    parser.add_argument("--timeout", type=float, default=30, help="호출 타임아웃 (초)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-error-rate", type=float, help="이 오류율을 넘으면 부하 증가 중단 (예: 0.05)")
+    parser.add_argument("--max-p95", type=float, help="p95가 이 값(ms)을 넘으면 부하 증가 중단")
+    parser.add_argument("--url", help="실행 중인 MCP 서버 주소 (지정하지 않으면 로컬에 띄움)")
+    parser.add_argument("--pid", type=int, help="--url 서버의 프로세스 id (자원 사용량 기록)")
+    parser.add_argument("--naver-url", help="--url 서버가 쓰는 가짜 네이버 서버 주소 (업스트림 호출 수 기록)")
+    parser.add_argument("--port", type=int, help="로컬 MCP 서버 포트 (기본: 빈 포트)")
+    parser.add_argument("--latency", type=float, default=50, help="가짜 서버 평균 응답 지연 (ms)")
+    parser.add_argument("--jitter", type=float, default=10, help="가짜 서버 응답 지연 흔들림 (±ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="가짜 서버 500 응답 비율")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="가짜 서버 429 응답 비율")
+    parser.add_argument("--responses", help="기록된 응답 파일 (fake_naver.py record로 생성)")
+    parser.add_argument("--no-cache", action="store_true", help="서버의 검색 응답 캐시 끄기")
+    parser.add_argument("--out", help="결과 파일 (기본: benchmarks/results/load-<시각>.json)")
+    args = parser.parse_args()
+
+    args.stages = [int(n) for n in args.stages.split(",") if n.strip()]
+    mix = parse_mix(args.mix)
+    logging.basicConfig(level=logging.WARNING)
+    os.environ.setdefault("FASTMCP_LOG_LEVEL", "WARNING")
+
+    processes: List[subprocess.Popen] = []
+    workdir = tempfile.mkdtemp(prefix="price-tracker-load-")
+    if args.url:
+        url, pid = args.url, args.pid
+        port = int(url.split("://", 1)[1].split("/", 1)[0].rsplit(":", 1)[1]) if pid else None
+    else:
+        processes, url, port, pid = start_local(args, workdir)
+
+    sampler = ProcessSampler(pid, port).start() if pid else None
+    print(f"🚀 부하 테스트: {url} (단계 {args.stages}, 단계별 {args.duration:g}초)")
+    print(f"🎯 호출 비율: {', '.join(f'{name}={weight:g}' for name, weight in mix.items())}")
+    if sampler is not None:
+        print(f"🖥️ 서버 자원 측정: pid {pid} ({sampler.source})")
+
+    try:
+        results = asyncio.run(run_stages(args, url, mix, sampler))
+    finally:
+        if sampler is not None:
+            sampler.stop()
+        for process in reversed(processes):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    print_summary(results)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "url": url,
+        "settings": {
+            "stages": args.stages,
+            "duration_s": args.duration,
+            "mix": mix,
+            "think_ms": args.think_ms,
+            "latency_ms": args.latency,
+            "jitter_ms": args.jitter,
+            "error_rate": args.error_rate,
+            "throttle_rate": args.throttle_rate,
+            "cache": not args.no_cache,
+            "resource_source": sampler.source if sampler is not None else None
+        },
+        "stages": results
+    }
+
+    out = args.out or os.path.join(BENCH_DIR, "results", f"load-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {out}")
+
+
+if __name__ == "__main__":
+    main()
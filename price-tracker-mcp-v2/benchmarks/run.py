@@ -0,0 +1,286 @@
+"""
+오프라인 벤치마크 - 가짜 네이버 서버로 PriceTracker 메서드와 MCP 도구의 지연/처리량 측정
+
+각 시나리오마다 p50/p95/p99 지연, 처리량, 호출 1회당 업스트림(네이버) 요청 수를
+출력하고 결과를 JSON으로 저장함. --baseline으로 이전 결과와 비교할 수 있음.
+
+사용법:
+    python benchmarks/run.py
+    python benchmarks/run.py --iterations 200 --concurrency 20 --latency 80 --jitter 30
+    python benchmarks/run.py --only tool: --baseline benchmarks/results/bench-20250101-120000.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from fake_naver import FakeNaverServer, load_responses  # noqa: E402
+
+KEYWORDS = [
+    "노트북", "모니터", "키보드", "마우스", "블루투스 스피커", "스마트워치", "태블릿", "웹캠",
+    "아이폰 15", "갤럭시 S24", "에어팟 프로", "닌텐도 스위치", "플레이스테이션 5", "맥북 에어",
+    "로봇청소기", "공기청정기", "전기포트", "커피머신", "게이밍 의자", "외장 SSD"
+]
+
+
+# 백그라운드 작업(추적 갱신 스케줄러, 베스트 딜 갱신)을 끄는 설정
+# 시나리오와 무관한 업스트림 요청이 호출당 업스트림 수에 섞이지 않도록 함
+BACKGROUND_OFF_ENV = {
+    "TRACK_REFRESH_ENABLED": "false",
+    "BEST_DEAL_REFRESH_INTERVAL": "0",
+}
+
+
+def percentile(values: List[float], p: float) -> float:
+    """정렬된 값 목록의 백분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    rank = max(1, int(round(p / 100 * len(values) + 0.5)))
+    return values[min(rank, len(values)) - 1]
+
+
+def failed(result: Any) -> bool:
+    """도구 응답이 실패인지 확인 (success=False)"""
+    data = getattr(result, "data", result)
+    return isinstance(data, dict) and data.get("success") is False
+
+
+async def measure(
+    name: str,
+    call: Callable[[int], Awaitable[Any]],
+    fake: FakeNaverServer,
+    iterations: int,
+    concurrency: int
+) -> Dict:
+    """시나리오를 iterations번 (동시 concurrency개) 실행하고 통계 계산"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                if failed(await call(i)):
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    before = fake.stats()["requests"]
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(iterations)))
+    elapsed = time.perf_counter() - started
+    upstream = fake.stats()["requests"] - before
+
+    latencies.sort()
+    ms = [v * 1000 for v in latencies]
+    return {
+        "name": name,
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "errors": errors,
+        "p50_ms": round(percentile(ms, 50), 2),
+        "p95_ms": round(percentile(ms, 95), 2),
+        "p99_ms": round(percentile(ms, 99), 2),
+        "mean_ms": round(sum(ms) / len(ms), 2),
+        "max_ms": round(ms[-1], 2),
+        "throughput_rps": round(iterations / elapsed, 2),
+        "upstream_calls": upstream,
+        "upstream_per_call": round(upstream / iterations, 3)
+    }
+
+
+def scenarios(tracker, client) -> List[tuple]:
+    """(이름, 호출 함수) 목록 - tracker:* 는 PriceTracker 메서드, tool:* 는 MCP 도구"""
+    kw = lambda i: KEYWORDS[i % len(KEYWORDS)]  # noqa: E731
+    batch = lambda i: [kw(i + j) for j in range(5)]  # noqa: E731
+
+    return [
+        ("tracker:search_products", lambda i: tracker.search_products(kw(i))),
+        ("tracker:compare_prices", lambda i: tracker.compare_prices(kw(i))),
+        ("tracker:compare_prices_deep", lambda i: tracker.compare_prices(kw(i), deep=True)),
+        ("tracker:batch_search", lambda i: tracker.batch_search(batch(i))),
+        ("tracker:batch_compare", lambda i: tracker.batch_compare(batch(i))),
+        ("tracker:set_price_alert", lambda i: tracker.set_price_alert(kw(i), 50000 + i * 1000)),
+        ("tracker:track_product", lambda i: tracker.track_product(kw(i))),
+        ("tracker:get_price_history", lambda i: tracker.get_price_history(kw(i), days=30)),
+        ("tracker:list_tracked_products", lambda i: tracker.list_tracked_products()),
+        ("tracker:get_best_deals", lambda i: tracker.get_best_deals(limit=5)),
+        ("tracker:check_price_alerts", lambda i: tracker.check_price_alerts()),
+        ("tracker:get_triggered_alerts", lambda i: tracker.get_triggered_alerts()),
+
+        ("tool:search_product", lambda i: client.call_tool("search_product", {"keyword": kw(i)})),
+        ("tool:search_product_fields", lambda i: client.call_tool(
+            "search_product", {"keyword": kw(i), "fields": ["title", "price"]})),
+        ("tool:compare_prices", lambda i: client.call_tool("compare_prices", {"keyword": kw(i)})),
+        ("tool:compare_prices_deep", lambda i: client.call_tool(
+            "compare_prices", {"keyword": kw(i), "deep": True})),
+        ("tool:batch_search", lambda i: client.call_tool("batch_search", {"keywords": batch(i)})),
+        ("tool:batch_compare", lambda i: client.call_tool("batch_compare", {"keywords": batch(i)})),
+        ("tool:set_price_alert", lambda i: client.call_tool(
+            "set_price_alert", {"keyword": kw(i), "target_price": 50000 + i * 1000})),
+        ("tool:track_product", lambda i: client.call_tool("track_product", {"keyword": kw(i)})),
+        ("tool:get_price_history", lambda i: client.call_tool("get_price_history", {"keyword": kw(i)})),
+        ("tool:get_price_history_columnar", lambda i: client.call_tool(
+            "get_price_history", {"keyword": kw(i), "format": "columnar"})),
+        ("tool:list_tracked_products", lambda i: client.call_tool("list_tracked_products", {})),
+        ("tool:get_best_deals", lambda i: client.call_tool("get_best_deals", {"limit": 5})),
+        ("tool:check_price_alerts", lambda i: client.call_tool("check_price_alerts", {})),
+        ("tool:get_triggered_alerts", lambda i: client.call_tool("get_triggered_alerts", {})),
+    ]
+
+
+async def ignore_log(message):
+    """진행 상황 로그 알림은 측정에만 영향을 주므로 출력하지 않음"""
+
+
+async def run(args, fake: FakeNaverServer) -> List[Dict]:
+    # Config는 import 시점에 환경 변수를 읽으므로 환경 설정 후 import
+    from fastmcp import Client
+    import server
+
+    tracker = await server.get_tracker()
+    results = []
+    try:
+        async with Client(server.mcp, log_handler=ignore_log) as client:
+            for name, call in scenarios(tracker, client):
+                if args.only and not any(name.startswith(prefix) for prefix in args.only):
+                    continue
+                # 시나리오마다 캐시를 비워 업스트림 호출 수를 비교 가능하게 함
+                if tracker.cache is not None and not args.warm:
+                    tracker.cache.clear()
+                tracker.best_deals = []
+                tracker._best_deals_refreshed = None
+
+                result = await measure(name, call, fake, args.iterations, args.concurrency)
+                results.append(result)
+                print(
+                    f"{name:<36} p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+                    f"p99 {result['p99_ms']:>8.2f}ms  {result['throughput_rps']:>8.1f}/s  "
+                    f"업스트림 {result['upstream_per_call']:>6.2f}/호출  오류 {result['errors']}"
+                )
+    finally:
+        await tracker.aclose()
+    return results
+
+
+def compare(results: List[Dict], baseline_path: str):
+    """이전 결과와 p50/p95/처리량 비교"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+
+    print(f"\n📊 기준 결과와 비교: {baseline_path}")
+    for result in results:
+        base = baseline.get(result["name"])
+        if base is None:
+            continue
+
+        def delta(key: str) -> str:
+            if not base[key]:
+                return "    -"
+            return f"{(result[key] - base[key]) / base[key] * 100:+6.1f}%"
+
+        print(
+            f"{result['name']:<36} p50 {delta('p50_ms')}  p95 {delta('p95_ms')}  "
+            f"처리량 {delta('throughput_rps')}  업스트림 {base['upstream_per_call']:.2f} → {result['upstream_per_call']:.2f}"
+        )
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price Tracker 오프라인 벤치마크")
+    parser.add_argument("--iterations", type=int, default=50, help="시나리오별 호출 수")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 호출 수")
+    parser.add_argument("--latency", type=float, default=50, help="가짜 서버 평균 응답 지연 (ms)")
+    parser.add_argument("--jitter", type=float, default=10, help="가짜 서버 응답 지연 흔들림 (±ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="가짜 서버 500 응답 비율")
+    parser.add_argument("--responses", help="기록된 응답 파일 (fake_naver.py record로 생성)")
+    parser.add_argument("--no-cache", action="store_true", help="검색 응답 캐시 끄기")
+    parser.add_argument("--warm", action="store_true", help="시나리오 사이에 캐시를 비우지 않음")
+    parser.add_argument("--only", nargs="*", help="이름이 이 접두어로 시작하는 시나리오만 (예: tool: tracker:search)")
+    parser.add_argument("--out", help="결과 파일 (기본: benchmarks/results/bench-<시각>.json)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 파일")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    fake = FakeNaverServer(
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        responses=load_responses(args.responses)
+    ).start()
+
+    workdir = tempfile.mkdtemp(prefix="price-tracker-bench-")
+    os.environ.update({
+        "NAVER_API_URL": fake.url,
+        "NAVER_CLIENT_ID": os.getenv("NAVER_CLIENT_ID") or "bench",
+        "NAVER_CLIENT_SECRET": os.getenv("NAVER_CLIENT_SECRET") or "bench",
+        # 호출 한도가 아니라 서버 자체의 성능을 측정
+        "NAVER_RATE_PER_SECOND": "100000",
+        "NAVER_RATE_BURST": "100000",
+        "NAVER_DAILY_LIMIT": "100000000",
+        "DATABASE_PATH": os.path.join(workdir, "bench.db"),
+        "CACHE_ENABLED": "false" if args.no_cache else "true",
+        "FASTMCP_LOG_LEVEL": "WARNING",
+        **BACKGROUND_OFF_ENV,
+    })
+
+    print(f"🛒 가짜 네이버 서버: {fake.url} (지연 {args.latency:g}±{args.jitter:g}ms, 오류율 {args.error_rate:g})")
+    try:
+        results = asyncio.run(run(args, fake))
+    finally:
+        fake.stop()
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency,
+            "jitter_ms": args.jitter,
+            "error_rate": args.error_rate,
+            "cache": not args.no_cache,
+            "warm": args.warm,
+            "recorded_responses": bool(args.responses)
+        },
+        "fake_server": fake.stats(),
+        "results": results
+    }
+
+    out = args.out or os.path.join(BENCH_DIR, "results", f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {out}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
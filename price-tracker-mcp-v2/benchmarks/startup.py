@@ -0,0 +1,272 @@
+"""
+시작 시간 벤치마크 - 모듈별 import 비용, 구성 요소별 초기화 비용, 바인딩/준비 완료까지 걸린 시간
+
+1. import: `python -X importtime`으로 server와 price_tracker를 import하며 모듈별(최상위와 그 직접 import) 누적 시간 측정
+2. 초기화: 새 프로세스에서 PriceTracker 구성 요소(Database, RateLimiter, AlertIndex 등)를 하나씩 생성하며 측정
+   (빈 DB와 기존 DB 각각)
+3. 서버: server.py를 실행해 /healthz(바인딩)와 /readyz(PriceTracker 준비)가 200을 반환할 때까지 시간 측정
+
+사용법:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 10 --top 25
+    python benchmarks/startup.py --baseline benchmarks/results/startup-20250101-120000.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PROJECT_DIR)
+
+from fake_naver import FakeNaverServer  # noqa: E402
+from load import free_port  # noqa: E402
+from run import git_commit  # noqa: E402
+
+# 프로젝트 모듈 (import 결과에서 따로 표시)
+PROJECT_MODULES = {
+    os.path.splitext(name)[0] for name in os.listdir(PROJECT_DIR) if name.endswith(".py")
+}
+
+
+def bench_env(workdir: str, naver_url: str) -> Dict[str, str]:
+    return {
+        **os.environ,
+        "NAVER_API_URL": naver_url,
+        "NAVER_CLIENT_ID": os.getenv("NAVER_CLIENT_ID") or "startup-bench",
+        "NAVER_CLIENT_SECRET": os.getenv("NAVER_CLIENT_SECRET") or "startup-bench",
+        "DATABASE_PATH": os.path.join(workdir, "startup.db"),
+        "FASTMCP_LOG_LEVEL": "WARNING",
+    }
+
+
+def measure_imports(env: Dict[str, str]) -> List[Dict]:
+    """
+    최상위 import별 누적 시간 (ms)
+
+    최상위 import(depth 0)와 그 모듈이 직접 import한 모듈(depth 1)을 반환함.
+    server를 import한 뒤 price_tracker를 import하므로 price_tracker 항목은
+    server가 불러오지 않은(첫 사용 시 불러오는) 모듈의 비용만 포함함
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server; import price_tracker"],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+    imports = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time: 자체(us) | 누적(us) | 모듈" - 하위 import는 단계마다 두 칸씩 더 들여쓰기됨
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth > 1:
+            continue
+        name = name.strip()
+        imports.append({
+            "module": name,
+            "depth": depth,
+            "project": name.split(".")[0] in PROJECT_MODULES,
+            "self_ms": round(int(self_us) / 1000, 2),
+            "cumulative_ms": round(int(cumulative_us) / 1000, 2)
+        })
+    return imports
+
+
+COMPONENTS_SCRIPT = r'''
+import json, sys, time
+results = {}
+
+def timed(name, func):
+    started = time.perf_counter()
+    value = func()
+    results[name] = round((time.perf_counter() - started) * 1000, 2)
+    return value
+
+timed("import config", lambda: __import__("config"))
+timed("import price_tracker", lambda: __import__("price_tracker"))
+
+from config import Config
+from database import Database
+from cache import ResponseCache
+from rate_limiter import RateLimiter
+from naver_api import NaverShoppingAPI
+from alerts import AlertIndex
+from classifier import ProductClassifier
+from price_tracker import PriceTracker
+
+db = timed("Database", lambda: Database(
+    db_path=Config.DATABASE_PATH,
+    cache_size_kb=Config.DB_CACHE_SIZE_KB,
+    mmap_size=Config.DB_MMAP_SIZE,
+    statement_cache=Config.DB_STATEMENT_CACHE,
+    write_behind=Config.DB_WRITE_BEHIND,
+    history_mode=Config.HISTORY_STORAGE_MODE
+))
+timed("ResponseCache", lambda: ResponseCache(ttls=Config.CACHE_TTLS))
+timed("RateLimiter", lambda: RateLimiter(per_second=Config.NAVER_RATE_PER_SECOND, store=db))
+timed("NaverShoppingAPI", lambda: NaverShoppingAPI(Config.NAVER_CLIENT_ID, Config.NAVER_CLIENT_SECRET))
+timed("AlertIndex.load", lambda: AlertIndex().load(db.get_price_alerts()))
+timed("ProductClassifier", lambda: ProductClassifier(Config.PHONE_KEYWORDS, Config.ACCESSORY_KEYWORDS))
+db.close()
+
+tracker = timed("PriceTracker (전체)", PriceTracker)
+tracker.db.close()
+print(json.dumps(results))
+'''
+
+
+def measure_components(env: Dict[str, str]) -> Dict[str, float]:
+    """구성 요소별 생성 시간 (ms, 새 프로세스)"""
+    completed = subprocess.run(
+        [sys.executable, "-c", COMPONENTS_SCRIPT],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def wait_status(client: httpx.Client, url: str, deadline: float) -> Optional[float]:
+    """url이 200을 반환한 시각 (perf_counter)"""
+    while time.perf_counter() < deadline:
+        try:
+            if client.get(url).status_code == 200:
+                return time.perf_counter()
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.005)
+    return None
+
+
+def measure_server(env: Dict[str, str], timeout: float) -> Dict[str, Optional[float]]:
+    """server.py 실행부터 바인딩(/healthz), 준비 완료(/readyz)까지 시간 (ms)"""
+    port = free_port()
+    env = {**env, "SERVER_HOST": "127.0.0.1", "SERVER_PORT": str(port)}
+    base = f"http://127.0.0.1:{port}"
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(PROJECT_DIR, "server.py")],
+        cwd=PROJECT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(timeout=1) as client:
+            deadline = started + timeout
+            live = wait_status(client, f"{base}/healthz", deadline)
+            ready = wait_status(client, f"{base}/readyz", deadline) if live else None
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    ms = lambda at: round((at - started) * 1000, 1) if at else None  # noqa: E731
+    return {"live_ms": ms(live), "ready_ms": ms(ready)}
+
+
+def median(values: List[Optional[float]]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 1) if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price Tracker 시작 시간 벤치마크")
+    parser.add_argument("--runs", type=int, default=5, help="서버 시작 측정 횟수 (첫 회는 빈 DB)")
+    parser.add_argument("--top", type=int, default=15, help="표시할 무거운 import 수")
+    parser.add_argument("--timeout", type=float, default=60, help="서버 시작 대기 시간 (초)")
+    parser.add_argument("--out", help="결과 파일 (기본: benchmarks/results/startup-<시각>.json)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 파일")
+    args = parser.parse_args()
+
+    fake = FakeNaverServer(latency_ms=20, jitter_ms=5).start()
+    workdir = tempfile.mkdtemp(prefix="price-tracker-startup-")
+    env = bench_env(workdir, fake.url)
+
+    try:
+        print("📦 import 비용 (누적, 들여쓴 항목은 바로 위 모듈이 직접 import한 모듈)")
+        imports = measure_imports(env)
+        # importtime은 하위 모듈을 부모보다 먼저 출력하므로 모아 두었다가 다음 최상위 모듈에 묶음
+        top_level = [i for i in imports if i["depth"] == 0]
+        children, group = {}, []
+        for item in imports:
+            if item["depth"] == 1:
+                group.append(item)
+            else:
+                children[item["module"]] = group
+                group = []
+        for item in sorted(top_level, key=lambda i: i["cumulative_ms"], reverse=True)[:args.top]:
+            mark = "*" if item["project"] else " "
+            print(f"  {mark} {item['module']:<34} {item['cumulative_ms']:>9.1f}ms  (자체 {item['self_ms']:.1f}ms)")
+            for child in sorted(children.get(item["module"], []), key=lambda i: i["cumulative_ms"], reverse=True)[:args.top]:
+                mark = "*" if child["project"] else " "
+                print(f"  {mark}   {child['module']:<32} {child['cumulative_ms']:>9.1f}ms")
+        total_import = round(sum(i["cumulative_ms"] for i in top_level), 1)
+        print(f"    합계 {total_import:.1f}ms  (* 프로젝트 모듈)")
+
+        print("\n🔧 구성 요소 초기화 비용")
+        components = {}
+        for label in ("empty_db", "existing_db"):
+            components[label] = measure_components(env)  # 첫 실행이 빈 DB 생성
+        for name in components["empty_db"]:
+            print(
+                f"    {name:<24} 빈 DB {components['empty_db'][name]:>8.2f}ms  "
+                f"기존 DB {components['existing_db'][name]:>8.2f}ms"
+            )
+
+        print(f"\n🚀 서버 시작 ({args.runs}회)")
+        os.remove(env["DATABASE_PATH"])
+        runs = []
+        for i in range(args.runs):
+            result = measure_server(env, args.timeout)
+            runs.append(result)
+            print(f"    {i + 1}회  바인딩(/healthz) {result['live_ms']}ms  준비(/readyz) {result['ready_ms']}ms"
+                  + ("  (빈 DB)" if i == 0 else ""))
+        server_summary = {
+            "live_ms_median": median([r["live_ms"] for r in runs]),
+            "ready_ms_median": median([r["ready_ms"] for r in runs]),
+        }
+        print(f"    중앙값  바인딩 {server_summary['live_ms_median']}ms  준비 {server_summary['ready_ms_median']}ms")
+    finally:
+        fake.stop()
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": sys.version.split()[0],
+        "imports": imports,
+        "import_total_ms": total_import,
+        "components": components,
+        "server_runs": runs,
+        "server": server_summary
+    }
+
+    out = args.out or os.path.join(BENCH_DIR, "results", f"startup-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\n📊 기준 결과와 비교: {args.baseline}")
+        for key in ("live_ms_median", "ready_ms_median"):
+            before, after = baseline["server"].get(key), server_summary.get(key)
+            if before and after:
+                print(f"    {key:<18} {before:>8.1f} → {after:>8.1f}ms ({(after - before) / before * 100:+.1f}%)")
+        before, after = baseline.get("import_total_ms"), total_import
+        if before:
+            print(f"    {'import_total_ms':<18} {before:>8.1f} → {after:>8.1f}ms ({(after - before) / before * 100:+.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
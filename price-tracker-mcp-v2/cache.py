@@ -0,0 +1,136 @@
+"""
+네이버 검색 응답 캐시 (TTL + LRU, stale-while-revalidate)
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class CacheEntry:
+    """캐시 항목"""
+
+    __slots__ = ("value", "size", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, size: int, fresh_until: float, stale_until: float):
+        self.value = value
+        self.size = size
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class ResponseCache:
+    """검색 응답 캐시 - 항목 수 / 바이트 크기 기준 LRU 제거"""
+
+    FRESH = "fresh"
+    STALE = "stale"
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 300,
+        stale_ttl: float = 600,
+        max_entries: int = 1000,
+        max_bytes: int = 32 * 1024 * 1024
+    ):
+        """
+        Args:
+            ttls: 정렬 옵션별 TTL (초), 예: {"sim": 300, "asc": 120}
+            default_ttl: ttls에 없는 정렬 옵션의 TTL (초)
+            stale_ttl: TTL 만료 후 stale 응답을 허용할 시간 (초)
+            max_entries: 최대 항목 수
+            max_bytes: 최대 총 크기 (바이트)
+        """
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[Tuple, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(query: str, display: int, start: int, sort: str) -> Tuple:
+        """캐시 키 생성"""
+        return (query, display, start, sort)
+
+    def get(self, key: Tuple) -> Tuple[Any, Optional[str]]:
+        """
+        캐시 조회
+
+        Returns:
+            (값, 상태) - 상태는 FRESH, STALE 또는 None(미스)
+        """
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is None:
+            self.misses += 1
+            return None, None
+
+        if now >= entry.stale_until:
+            # 한도 초과 시 대체 응답으로 쓸 수 있도록 LRU 제거 전까지 보관
+            self.expirations += 1
+            self.misses += 1
+            return None, None
+
+        self._entries.move_to_end(key)
+
+        if now < entry.fresh_until:
+            self.hits += 1
+            return entry.value, self.FRESH
+
+        self.stale_hits += 1
+        return entry.value, self.STALE
+
+    def peek(self, key: Tuple) -> Any:
+        """만료 여부와 관계없이 저장된 값 조회 (통계에 반영하지 않음)"""
+        entry = self._entries.get(key)
+        return entry.value if entry is not None else None
+
+    def set(self, key: Tuple, value: Any, size: int):
+        """캐시 저장 (크기 초과 시 오래된 항목부터 제거)"""
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        ttl = self.ttls.get(key[-1], self.default_ttl)
+        now = time.monotonic()
+        self._entries[key] = CacheEntry(value, size, now + ttl, now + ttl + self.stale_ttl)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self):
+        """전체 캐시 비우기"""
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: Tuple):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def stats(self) -> Dict:
+        """캐시 통계"""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+        }
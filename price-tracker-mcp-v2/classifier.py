@@ -0,0 +1,110 @@
+"""
+상품 분류 엔진 (휴대폰 검색어 / 액세서리 판별, 규칙별 필터링 통계)
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 네이버 검색 결과 제목의 <b> 강조 태그 등
+_HTML_TAG = re.compile(r'<[^>]+>')
+
+# 필터링 사유 (accessory 규칙은 "accessory:<키워드>" 형식)
+RULE_PHONE_MIN_PRICE = "phone_min_price"
+
+
+def clean_html(text: str) -> str:
+    """HTML 태그 제거"""
+    return _HTML_TAG.sub('', text)
+
+
+def compile_keywords(keywords: Iterable[str]) -> Optional["re.Pattern"]:
+    """
+    키워드 목록을 하나의 정규식으로 컴파일 (대소문자 무시)
+
+    긴 키워드를 먼저 두어 '보호필름'처럼 다른 키워드('필름')를 포함하는 규칙이
+    매칭 결과로 보고되도록 함
+    """
+    keywords = sorted({k.lower() for k in keywords if k}, key=len, reverse=True)
+    if not keywords:
+        return None
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+
+class ProductClassifier:
+    """검색 결과 분류기 - 규칙은 생성 시 한 번만 컴파일"""
+
+    def __init__(
+        self,
+        phone_keywords: Iterable[str],
+        accessory_keywords: Iterable[str],
+        phone_min_price: int = 100000
+    ):
+        """
+        Args:
+            phone_keywords: 휴대폰 검색어 판별 키워드
+            accessory_keywords: 액세서리 상품 제목 키워드
+            phone_min_price: 휴대폰 검색 시 이 가격 미만은 액세서리로 간주
+        """
+        self.phone_min_price = phone_min_price
+        self._phone = compile_keywords(phone_keywords)
+        self._accessory = compile_keywords(accessory_keywords)
+
+        self.filtered: Counter = Counter()  # 규칙별 누적 필터링 수
+
+    def is_phone_keyword(self, keyword: str) -> bool:
+        """휴대폰 검색어인지 확인"""
+        return self._phone is not None and self._phone.search(keyword) is not None
+
+    def match_accessory(self, title: str) -> Optional[str]:
+        """제목이 액세서리면 매칭된 키워드 반환"""
+        if self._accessory is None:
+            return None
+        match = self._accessory.search(title)
+        return match.group(0).lower() if match else None
+
+    def classify(
+        self,
+        keyword: str,
+        items: List[Dict],
+        limit: Optional[int] = None
+    ) -> Tuple[List[Tuple[Dict, str, int]], Dict[str, int]]:
+        """
+        검색 결과 한 배치 분류
+
+        Args:
+            keyword: 검색어 (휴대폰 검색어면 최소 가격 규칙 적용)
+            items: 네이버 API 검색 결과 항목
+            limit: 통과 항목이 이 개수가 되면 중단
+
+        Returns:
+            (통과 항목 목록 [(원본 항목, 정리된 제목, 가격)], 규칙별 필터링 수)
+        """
+        is_phone = self.is_phone_keyword(keyword)
+        accepted = []
+        filtered: Counter = Counter()
+
+        for item in items:
+            price = int(item.get('lprice', 0))
+            title = clean_html(item.get('title', ''))
+
+            # 가격 필터링: 휴대폰은 최소 가격 이상
+            if is_phone and price < self.phone_min_price:
+                filtered[RULE_PHONE_MIN_PRICE] += 1
+                continue
+
+            # 제목으로 액세서리 필터링
+            rule = self.match_accessory(title)
+            if rule is not None:
+                filtered[f"accessory:{rule}"] += 1
+                continue
+
+            accepted.append((item, title, price))
+            if limit is not None and len(accepted) >= limit:
+                break
+
+        self.filtered.update(filtered)
+        return accepted, dict(filtered)
+
+    def stats(self) -> Dict:
+        """규칙별 누적 필터링 수 (많은 순)"""
+        return dict(self.filtered.most_common())
@@ -14,9 +14,108 @@ class Config:
     # 네이버 쇼핑 API
     NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID", "")
     NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET", "")
-    
+    NAVER_API_URL = os.getenv("NAVER_API_URL", "https://openapi.naver.com/v1/search/shop.json")  # 벤치마크 시 가짜 서버 주소
+
+    # HTTP 클라이언트 (커넥션 풀)
+    NAVER_HTTP2 = os.getenv("NAVER_HTTP2", "true").lower() == "true"
+    NAVER_TIMEOUT = float(os.getenv("NAVER_TIMEOUT", "10"))
+    NAVER_MAX_CONNECTIONS = int(os.getenv("NAVER_MAX_CONNECTIONS", "100"))
+    NAVER_MAX_KEEPALIVE = int(os.getenv("NAVER_MAX_KEEPALIVE", "20"))
+    NAVER_KEEPALIVE_EXPIRY = float(os.getenv("NAVER_KEEPALIVE_EXPIRY", "30"))
+
+    # API 호출 한도
+    NAVER_RATE_PER_SECOND = float(os.getenv("NAVER_RATE_PER_SECOND", "10"))
+    NAVER_RATE_BURST = int(os.getenv("NAVER_RATE_BURST", "10"))
+    NAVER_DAILY_LIMIT = int(os.getenv("NAVER_DAILY_LIMIT", "25000"))
+
+    # 검색 응답 캐시
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1000"))
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    CACHE_TTLS = {  # 정렬 옵션별 TTL (초)
+        "sim": float(os.getenv("CACHE_TTL_SIM", "300")),
+        "date": float(os.getenv("CACHE_TTL_DATE", "60")),
+        "asc": float(os.getenv("CACHE_TTL_ASC", "120")),
+        "dsc": float(os.getenv("CACHE_TTL_DSC", "120")),
+    }
+    CACHE_STALE_TTL = float(os.getenv("CACHE_STALE_TTL", "600"))  # 만료 후 stale 응답 허용 시간
+
     # 데이터베이스
     DATABASE_PATH = os.getenv("DATABASE_PATH", "price_history.db")
+    DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "16384"))  # 연결별 페이지 캐시
+    DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+    DB_STATEMENT_CACHE = int(os.getenv("DB_STATEMENT_CACHE", "256"))
+    DB_WRITE_BEHIND = os.getenv("DB_WRITE_BEHIND", "true").lower() == "true"  # 가격 기록 일괄 저장
+    DB_WRITE_BATCH_SIZE = int(os.getenv("DB_WRITE_BATCH_SIZE", "500"))
+    DB_WRITE_FLUSH_INTERVAL = float(os.getenv("DB_WRITE_FLUSH_INTERVAL", "1.0"))
+    DB_WRITE_MAX_PENDING = int(os.getenv("DB_WRITE_MAX_PENDING", "10000"))  # 재시도 대기 기록 포함
+    DB_WRITE_MAX_RETRIES = int(os.getenv("DB_WRITE_MAX_RETRIES", "5"))  # 저장 실패 시 재시도 횟수, 넘으면 버림
+    HISTORY_STORAGE_MODE = os.getenv("HISTORY_STORAGE_MODE", "points")  # points | intervals (가격 변경 시에만 새 행)
+    HISTORY_RAW_MAX_DAYS = int(os.getenv("HISTORY_RAW_MAX_DAYS", "31"))      # 이 기간까지는 원본 기록
+    HISTORY_DAILY_MAX_DAYS = int(os.getenv("HISTORY_DAILY_MAX_DAYS", "400"))  # 이 기간까지는 일 단위, 넘으면 주 단위
+    RECORD_SEARCH_RESULTS = os.getenv("RECORD_SEARCH_RESULTS", "false").lower() == "true"  # 모든 검색 결과 가격 기록
+    
+    # 추적 상품 백그라운드 갱신
+    TRACK_REFRESH_ENABLED = os.getenv("TRACK_REFRESH_ENABLED", "true").lower() == "true"
+    TRACK_REFRESH_INTERVAL = float(os.getenv("TRACK_REFRESH_INTERVAL", "3600"))  # 기록이 없는 상품의 기본 주기 (초)
+    TRACK_MIN_INTERVAL = float(os.getenv("TRACK_MIN_INTERVAL", "300"))  # 변동이 잦은 상품의 최소 주기
+    TRACK_MAX_INTERVAL = float(os.getenv("TRACK_MAX_INTERVAL", "21600"))  # 변동이 없는 상품의 최대 주기
+    TRACK_DAILY_BUDGET = int(os.getenv("TRACK_DAILY_BUDGET", "12500"))  # 추적 갱신에 쓸 일일 호출 수
+    TRACK_VOLATILITY_DAYS = int(os.getenv("TRACK_VOLATILITY_DAYS", "7"))  # 변동성 계산 기간
+    TRACK_REFRESH_CONCURRENCY = int(os.getenv("TRACK_REFRESH_CONCURRENCY", "4"))
+    TRACK_REFRESH_JITTER = float(os.getenv("TRACK_REFRESH_JITTER", "0.1"))  # 주기 ±10%
+    TRACK_REFRESH_COUNT = int(os.getenv("TRACK_REFRESH_COUNT", "10"))  # 검색어당 조회 상품 수
+
+    # 베스트 딜
+    BEST_DEAL_KEYWORDS = [
+        k.strip() for k in os.getenv(
+            "BEST_DEAL_KEYWORDS", "노트북,무선이어폰,스마트워치,태블릿,키보드,마우스,모니터,웹캠"
+        ).split(",") if k.strip()
+    ]
+    BEST_DEAL_TIMEOUT = float(os.getenv("BEST_DEAL_TIMEOUT", "5"))  # 검색어별 최대 대기 시간 (초)
+    BEST_DEAL_REFRESH_INTERVAL = float(os.getenv("BEST_DEAL_REFRESH_INTERVAL", "600"))  # 백그라운드 갱신 주기 (0이면 요청 시 계산)
+
+    # 심층 가격 비교 (여러 페이지 동시 조회)
+    DEEP_COMPARE_MAX_PAGES = int(os.getenv("DEEP_COMPARE_MAX_PAGES", "10"))  # 정렬(가격순/정확도순)별 최대 페이지 수, 페이지당 100개
+    DEEP_COMPARE_TIMEOUT = float(os.getenv("DEEP_COMPARE_TIMEOUT", "3"))  # 시간 예산 (초)
+
+    # 상품 분류 규칙 (쉼표로 구분)
+    PHONE_KEYWORDS = [
+        k.strip() for k in os.getenv(
+            "PHONE_KEYWORDS", "아이폰,iphone,갤럭시,galaxy,핸드폰,스마트폰,휴대폰,폰,phone"
+        ).split(",") if k.strip()
+    ]
+    ACCESSORY_KEYWORDS = [
+        k.strip() for k in os.getenv(
+            "ACCESSORY_KEYWORDS",
+            "케이스,커버,필름,보호필름,강화유리,케이블,충전기,어댑터,젠더,이어폰,"
+            "스트랩,링,홀더,거치대,스탠드,보호대,범퍼,카드,지갑,파우치"
+        ).split(",") if k.strip()
+    ]
+    PHONE_MIN_PRICE = int(os.getenv("PHONE_MIN_PRICE", "100000"))  # 휴대폰 검색 시 이 가격 미만은 액세서리로 간주
+
+    # 일괄 검색/비교 도구
+    BATCH_MAX_KEYWORDS = int(os.getenv("BATCH_MAX_KEYWORDS", "20"))  # 한 번에 처리할 최대 검색어 수
+
+    # 도구 응답 크기 제한 (바이트, 넘으면 목록 뒤쪽을 잘라냄, 0이면 제한 없음)
+    RESPONSE_MAX_BYTES = int(os.getenv("RESPONSE_MAX_BYTES", str(64 * 1024)))
+
+    # 가격 알림 확인
+    ALERT_CHECK_CONCURRENCY = int(os.getenv("ALERT_CHECK_CONCURRENCY", "8"))  # 동시에 확인할 검색어 수
+    ALERT_PRICE_TOP_N = int(os.getenv("ALERT_PRICE_TOP_N", "1"))  # 현재가 = 정확도순 상위 N개 중 최저가
+
+    # MCP 서버 (streamable-http)
+    SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"  # /metrics (Prometheus)
+
+    # 요청 트레이싱 / 샘플링 프로파일러 (선택)
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))  # 트레이싱할 도구 호출 비율 (0~1)
+    TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "traces.jsonl")  # OTLP JSON (요청마다 한 줄)
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # 프로파일링할 도구 호출 비율 (0이면 끔)
+    PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))  # 스택 수집 간격
+    PROFILE_OUTPUT_PATH = os.getenv("PROFILE_OUTPUT_PATH", "profile.folded")  # SIGUSR1 시 저장 경로
     
     # 기본 설정
     DEFAULT_SEARCH_COUNT = 10  # 검색 결과 개수
@@ -1,25 +1,178 @@
 """
 가격 히스토리 데이터베이스 관리
 """
+import logging
 import sqlite3
-from datetime import datetime
-from typing import List, Dict, Optional
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple
+from write_buffer import PriceRecordWriter
+from metrics import DB_QUERY_DURATION, timed
+from tracing import traced
 
+logger = logging.getLogger(__name__)
+
+
+def utc_timestamp() -> str:
+    """CURRENT_TIMESTAMP와 같은 형식의 현재 UTC 시각"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+# 롤업 테이블과 버킷 계산식 (일 단위: UTC 날짜, 주 단위: 월요일 날짜)
+ROLLUP_TABLES = {
+    "daily": ("price_daily", "date({col})"),
+    "weekly": ("price_weekly", "date({col}, 'weekday 0', '-6 days')"),
+}
+
+
+def rollup_bucket(resolution: str, timestamp: str) -> str:
+    """'YYYY-MM-DD HH:MM:SS' 시각이 속한 롤업 버킷"""
+    day = date.fromisoformat(timestamp[:10])
+    if resolution == "weekly":
+        day -= timedelta(days=day.weekday())
+    return day.isoformat()
+
+
+def instrumented(label: Optional[str] = None):
+    """쿼리 메서드 계측 - 실행 시간 메트릭과 트레이싱 span (statement: 메서드 이름)"""
+    def decorator(func):
+        statement = label or func.__name__
+        return traced(f"db.{statement}", statement=statement)(timed(DB_QUERY_DURATION, statement)(func))
+    return decorator
 
-class Database:
-    """가격 추적 데이터베이스"""
 
-    def __init__(self, db_path: str = "price_history.db"):
+def trigram_supported() -> bool:
+    """FTS5 trigram 토크나이저 지원 여부 (SQLite 3.34+)"""
+    try:
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE VIRTUAL TABLE t USING fts5(x, tokenize='trigram')")
+        conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+class Database:
+    """가격 추적 데이터베이스 (스레드별 연결 재사용, WAL 모드)"""
+
+    def __init__(
+        self,
+        db_path: str = "price_history.db",
+        cache_size_kb: int = 16384,
+        mmap_size: int = 256 * 1024 * 1024,
+        statement_cache: int = 256,
+        busy_timeout_ms: int = 5000,
+        write_behind: bool = False,
+        write_batch_size: int = 500,
+        write_flush_interval: float = 1.0,
+        write_max_pending: int = 10000,
+        write_max_retries: int = 5,
+        history_mode: str = "points"
+    ):
         """
         Args:
             db_path: 데이터베이스 파일 경로
+            cache_size_kb: 연결별 페이지 캐시 크기 (KB)
+            mmap_size: 메모리 맵 I/O 크기 (바이트, 0이면 사용 안 함)
+            statement_cache: 연결별 prepared statement 캐시 개수
+            busy_timeout_ms: 잠금 대기 시간 (ms)
+            write_behind: 가격 기록을 버퍼에 모아 일괄 저장
+            write_batch_size: 일괄 저장 기준 개수
+            write_flush_interval: 일괄 저장 최대 간격 (초)
+            write_max_pending: 버퍼 최대 크기 (초과 시 기록 추가가 대기)
+            write_max_retries: 일괄 저장 시도 횟수 (계속 실패하면 해당 기록을 버림)
+            history_mode: 가격 기록 저장 방식
+                - "points": 관측마다 한 행
+                - "intervals": 가격이 바뀔 때만 새 행, 같은 가격이면 valid_to 연장과 관측 횟수 증가
+                  (구간은 UTC 날짜를 넘지 않음 - 날짜가 바뀌면 같은 가격이어도 새 행)
         """
         self.db_path = db_path
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.statement_cache = statement_cache
+        self.busy_timeout_ms = busy_timeout_ms
+        self.history_mode = history_mode
+
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        # 조회 테이블 id 캐시 (상품/판매처/플랫폼) - 쓰기 스레드 간 공유
+        self._id_lock = threading.Lock()
+        self._product_ids: Dict[Tuple, Tuple[int, str]] = {}
+        self._lookup_ids: Dict[Tuple[str, str], int] = {}
+        self._last_intervals: Dict[Tuple, Tuple[int, int, str]] = {}  # (상품, 플랫폼, 판매처) -> (행 id, 가격, 시작 날짜)
+
         self.init_database()
 
+        self.writer = PriceRecordWriter(
+            self._insert_price_records,
+            batch_size=write_batch_size,
+            flush_interval=write_flush_interval,
+            max_pending=write_max_pending,
+            max_retries=write_max_retries
+        ) if write_behind else None
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        현재 스레드의 연결 반환 (없으면 생성)
+
+        WAL 모드이므로 한 스레드가 쓰는 동안 다른 스레드의 읽기가 막히지 않음
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            cached_statements=self.statement_cache,
+            check_same_thread=False  # close()에서 다른 스레드의 연결을 닫기 위함
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+
+        self._local.conn = conn
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def flush(self):
+        """버퍼에 남은 가격 기록 저장"""
+        if self.writer is not None:
+            self.writer.flush()
+
+    def _flush_before_read(self):
+        """조회 전 버퍼 저장 (실패하면 로그만 남기고 이미 저장된 기록으로 조회)"""
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning(f"⚠️ 조회 전 가격 기록 저장 실패 - 저장된 기록만 조회: {e}")
+
+    def close(self):
+        """버퍼 저장 후 모든 스레드의 연결 종료 (버퍼 저장이 실패해도 연결은 닫음)"""
+        try:
+            if self.writer is not None:
+                self.writer.close()
+        finally:
+            with self._lock:
+                connections, self._connections = self._connections, []
+                self._local = threading.local()
+
+            for conn in connections:
+                try:
+                    conn.execute("PRAGMA optimize")
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+
     def init_database(self):
         """데이터베이스 초기화 및 테이블 생성"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
 
         # 가격 히스토리 테이블
@@ -54,76 +207,575 @@ class Database:
             )
         ''')
 
+        # API 호출량 테이블 (재시작 후에도 일일 한도 유지)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS api_usage (
+                day TEXT PRIMARY KEY,
+                calls INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+
         conn.commit()
-        conn.close()
 
-    def add_price_record(self, product_name: str, platform: str, price: int):
-        """가격 기록 추가"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self._migrate(conn)
+        self.fts_enabled = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'products_fts'"
+        ).fetchone() is not None
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """스키마 마이그레이션 (PRAGMA user_version 기준, 기존 DB 파일도 순서대로 적용)"""
+        migrations = [
+            self._migration_product_catalog,
+            self._migration_price_intervals,
+            self._migration_price_rollups,
+            self._migration_alert_triggers,
+            self._migration_history_valid_to_index,
+            self._migration_price_observations,
+        ]
+
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        applied = False
+        for target, migration in enumerate(migrations, start=1):
+            if version >= target:
+                continue
+
+            logger.info(f"🛠️ DB 마이그레이션 v{target}: {migration.__doc__}")
+            with conn:
+                conn.execute("BEGIN")
+                migration(conn)
+                conn.execute(f"PRAGMA user_version = {target}")
+            applied = True
+
+        # 테이블 재구성으로 생긴 빈 페이지가 많으면 파일 크기 회수
+        if applied:
+            free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            total_pages = conn.execute("PRAGMA page_count").fetchone()[0]
+            if total_pages and free_pages / total_pages > 0.25:
+                conn.execute("VACUUM")
+
+    def _migration_product_catalog(self, conn: sqlite3.Connection):
+        """상품 카탈로그 정규화 (products/malls/platforms 테이블, 히스토리는 정수 id 참조, 상품명 trigram 색인)"""
+        conn.execute('''
+            CREATE TABLE products (
+                id INTEGER PRIMARY KEY,
+                naver_product_id TEXT UNIQUE,
+                title TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        # productId가 없는 기존 기록은 제목으로 식별
+        conn.execute('CREATE INDEX idx_products_title ON products (title)')
+        conn.execute('CREATE TABLE malls (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)')
+        conn.execute('CREATE TABLE platforms (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)')
+
+        conn.execute('INSERT INTO platforms (name) SELECT DISTINCT platform FROM price_history')
+        conn.execute('''
+            INSERT INTO products (title)
+            SELECT product_name FROM price_history
+            UNION
+            SELECT product_name FROM tracked_products
+        ''')
 
-        cursor.execute('''
-            INSERT INTO price_history (product_name, platform, price)
-            VALUES (?, ?, ?)
-        ''', (product_name, platform, price))
+        conn.execute('''
+            CREATE TABLE price_history_v2 (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                product_id INTEGER NOT NULL REFERENCES products (id),
+                platform_id INTEGER NOT NULL REFERENCES platforms (id),
+                mall_id INTEGER REFERENCES malls (id),
+                price INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.execute('''
+            INSERT INTO price_history_v2 (id, product_id, platform_id, price, created_at)
+            SELECT h.id, p.id, pl.id, h.price, h.created_at
+            FROM price_history h
+            JOIN products p ON p.title = h.product_name
+            JOIN platforms pl ON pl.name = h.platform
+        ''')
 
-        conn.commit()
-        conn.close()
+        conn.execute('DROP TABLE price_history')
+        conn.execute('ALTER TABLE price_history_v2 RENAME TO price_history')
+        conn.execute('''
+            CREATE INDEX idx_price_history_product_created
+            ON price_history (product_id, created_at)
+        ''')
+        conn.execute('CREATE INDEX idx_price_history_created ON price_history (created_at)')
+
+        conn.execute('ALTER TABLE tracked_products ADD COLUMN product_id INTEGER REFERENCES products (id)')
+        conn.execute('''
+            UPDATE tracked_products
+            SET product_id = (SELECT id FROM products WHERE title = tracked_products.product_name)
+        ''')
+
+        if not trigram_supported():
+            logger.warning("⚠️ SQLite FTS5 trigram 미지원 - 히스토리 검색은 LIKE 스캔으로 동작")
+            return
+
+        # 상품명 검색 색인 (히스토리 행이 아닌 상품 단위로 색인)
+        conn.execute('''
+            CREATE VIRTUAL TABLE products_fts USING fts5(
+                title,
+                content='products',
+                content_rowid='id',
+                tokenize='trigram'
+            )
+        ''')
+        conn.execute('''
+            CREATE TRIGGER products_fts_insert AFTER INSERT ON products BEGIN
+                INSERT INTO products_fts (rowid, title) VALUES (new.id, new.title);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER products_fts_delete AFTER DELETE ON products BEGIN
+                INSERT INTO products_fts (products_fts, rowid, title) VALUES ('delete', old.id, old.title);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER products_fts_update AFTER UPDATE OF title ON products BEGIN
+                INSERT INTO products_fts (products_fts, rowid, title) VALUES ('delete', old.id, old.title);
+                INSERT INTO products_fts (rowid, title) VALUES (new.id, new.title);
+            END
+        ''')
+        conn.execute("INSERT INTO products_fts (products_fts) VALUES ('rebuild')")
+
+    def _migration_price_intervals(self, conn: sqlite3.Connection):
+        """가격 구간 저장 지원 (valid_to: 같은 가격이 마지막으로 관측된 시각)"""
+        conn.execute('ALTER TABLE price_history ADD COLUMN valid_to TIMESTAMP')
+
+    def _migration_price_rollups(self, conn: sqlite3.Connection):
+        """상품별 일/주 단위 롤업 테이블 (시가/종가/최저/최고/합계/건수) 생성 및 기존 기록 집계"""
+        for table, bucket_expr in ROLLUP_TABLES.values():
+            conn.execute(f'''
+                CREATE TABLE {table} (
+                    product_id INTEGER NOT NULL REFERENCES products (id),
+                    platform_id INTEGER NOT NULL REFERENCES platforms (id),
+                    bucket TEXT NOT NULL,
+                    open_price INTEGER NOT NULL,
+                    close_price INTEGER NOT NULL,
+                    min_price INTEGER NOT NULL,
+                    max_price INTEGER NOT NULL,
+                    sum_price INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    first_at TIMESTAMP NOT NULL,
+                    last_at TIMESTAMP NOT NULL,
+                    PRIMARY KEY (product_id, platform_id, bucket)
+                ) WITHOUT ROWID
+            ''')
+
+        # 관측 횟수 컬럼(v6) 전이므로 구간 행은 시작/마지막 두 번의 관측으로 집계
+        self._backfill_rollups(conn, counted=False)
+
+    def _backfill_rollups(self, conn: sqlite3.Connection, counted: bool = True):
+        """
+        price_history로 빈 롤업 테이블 채움 (실시간 갱신과 같은 기준: 관측 한 번이 한 건)
+
+        구간 행은 created_at에 첫 관측, valid_to에 나머지 observations - 1번의 관측으로 집계함.
+        구간은 날짜를 넘지 않아 중간 관측도 같은 버킷이므로 실시간 집계와 결과가 같음.
+        같은 시각의 관측은 id(저장 순서)로 시가/종가를 정함
+
+        Args:
+            counted: observations 컬럼 사용 (False면 v6 이전 스키마 - 시작/마지막 관측만 집계)
+        """
+        if counted:
+            repeats = '''
+                    SELECT id, product_id, platform_id, price, COALESCE(valid_to, created_at), observations - 1
+                    FROM price_history
+                    WHERE observations > 1'''
+        else:
+            repeats = '''
+                    SELECT id, product_id, platform_id, price, valid_to, 1
+                    FROM price_history
+                    WHERE valid_to IS NOT NULL AND valid_to != created_at'''
+
+        for table, bucket_expr in ROLLUP_TABLES.values():
+            conn.execute(f'''
+                WITH observations AS (
+                    SELECT id, product_id, platform_id, price, created_at AS observed_at, 1 AS n
+                    FROM price_history
+                    UNION ALL{repeats}
+                ),
+                ranked AS (
+                    SELECT *,
+                        {bucket_expr.format(col='observed_at')} AS bucket,
+                        ROW_NUMBER() OVER w_asc AS first_rank,
+                        ROW_NUMBER() OVER w_desc AS last_rank
+                    FROM observations
+                    WINDOW
+                        w_asc AS (PARTITION BY product_id, platform_id, {bucket_expr.format(col='observed_at')}
+                                  ORDER BY observed_at, id),
+                        w_desc AS (PARTITION BY product_id, platform_id, {bucket_expr.format(col='observed_at')}
+                                   ORDER BY observed_at DESC, id DESC)
+                )
+                INSERT INTO {table}
+                SELECT product_id, platform_id, bucket,
+                    MAX(CASE WHEN first_rank = 1 THEN price END),
+                    MAX(CASE WHEN last_rank = 1 THEN price END),
+                    MIN(price), MAX(price), SUM(price * n), SUM(n),
+                    MIN(observed_at), MAX(observed_at)
+                FROM ranked
+                GROUP BY product_id, platform_id, bucket
+            ''')
+
+    def _migration_alert_triggers(self, conn: sqlite3.Connection):
+        """트리거된 가격 알림 기록 테이블 (같은 알림은 같은 가격으로 한 번만 기록)"""
+        conn.execute('''
+            CREATE TABLE alert_triggers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                alert_id INTEGER NOT NULL REFERENCES price_alerts(id),
+                product_id INTEGER REFERENCES products(id),
+                price INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (alert_id, price)
+            )
+        ''')
+        conn.execute('CREATE INDEX idx_alert_triggers_created_at ON alert_triggers (created_at)')
+
+    def _migration_history_valid_to_index(self, conn: sqlite3.Connection):
+        """구간 행 조회용 (상품, valid_to) 부분 인덱스 (points 방식 행은 색인하지 않음)"""
+        conn.execute('''
+            CREATE INDEX idx_price_history_product_valid_to
+            ON price_history (product_id, valid_to)
+            WHERE valid_to IS NOT NULL
+        ''')
+
+    def _migration_price_observations(self, conn: sqlite3.Connection):
+        """가격 기록 행별 관측 횟수 (구간 행의 연장 관측 포함, 롤업 건수와 같은 기준)"""
+        conn.execute('ALTER TABLE price_history ADD COLUMN observations INTEGER NOT NULL DEFAULT 1')
+        # 기존 구간 행은 시작/마지막 관측만 알 수 있음 (v3 롤업 집계와 같은 값)
+        conn.execute('''
+            UPDATE price_history SET observations = 2
+            WHERE valid_to IS NOT NULL AND valid_to != created_at
+        ''')
+
+    def _update_rollups(self, conn: sqlite3.Connection, resolved: List[Tuple]):
+        """저장된 관측을 일/주 롤업에 반영 (배치 안에서 먼저 합친 뒤 버킷당 한 번 upsert)"""
+        for resolution, (table, _) in ROLLUP_TABLES.items():
+            buckets: Dict[Tuple, List] = {}
+            for product_id, platform_id, _, price, created_at in resolved:
+                key = (product_id, platform_id, rollup_bucket(resolution, created_at))
+                agg = buckets.get(key)
+                if agg is None:
+                    # open, close, min, max, sum, count, first_at, last_at
+                    buckets[key] = [price, price, price, price, price, 1, created_at, created_at]
+                    continue
+                if created_at < agg[6]:
+                    agg[0], agg[6] = price, created_at
+                if created_at >= agg[7]:
+                    agg[1], agg[7] = price, created_at
+                agg[2] = min(agg[2], price)
+                agg[3] = max(agg[3], price)
+                agg[4] += price
+                agg[5] += 1
+
+            conn.executemany(f'''
+                INSERT INTO {table} (
+                    product_id, platform_id, bucket, open_price, close_price,
+                    min_price, max_price, sum_price, count, first_at, last_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (product_id, platform_id, bucket) DO UPDATE SET
+                    open_price = CASE WHEN excluded.first_at < first_at THEN excluded.open_price ELSE open_price END,
+                    close_price = CASE WHEN excluded.last_at >= last_at THEN excluded.close_price ELSE close_price END,
+                    min_price = MIN(min_price, excluded.min_price),
+                    max_price = MAX(max_price, excluded.max_price),
+                    sum_price = sum_price + excluded.sum_price,
+                    count = count + excluded.count,
+                    first_at = MIN(first_at, excluded.first_at),
+                    last_at = MAX(last_at, excluded.last_at)
+            ''', [key + tuple(agg) for key, agg in buckets.items()])
+
+    def _lookup_id(self, conn: sqlite3.Connection, table: str, name: str) -> int:
+        """판매처/플랫폼 이름을 조회 테이블 id로 변환 (없으면 추가)"""
+        key = (table, name)
+        lookup_id = self._lookup_ids.get(key)
+        if lookup_id is not None:
+            return lookup_id
+
+        conn.execute(f'INSERT OR IGNORE INTO {table} (name) VALUES (?)', (name,))
+        lookup_id = conn.execute(f'SELECT id FROM {table} WHERE name = ?', (name,)).fetchone()[0]
+        self._lookup_ids[key] = lookup_id
+        return lookup_id
+
+    def _product_row_id(self, conn: sqlite3.Connection, naver_product_id: Optional[str], title: str) -> int:
+        """
+        상품을 products id로 변환 (없으면 추가)
+
+        네이버 productId가 있으면 productId 기준 - 제목이 바뀌면 최신 제목으로 갱신하고
+        같은 상품의 히스토리를 유지함. 없으면 제목 기준.
+        """
+        key = ('naver', naver_product_id) if naver_product_id else ('title', title)
+        cached = self._product_ids.get(key)
+        if cached is not None and cached[1] == title:
+            return cached[0]
+
+        if naver_product_id:
+            conn.execute('''
+                INSERT INTO products (naver_product_id, title) VALUES (?, ?)
+                ON CONFLICT (naver_product_id) DO UPDATE
+                SET title = excluded.title, updated_at = CURRENT_TIMESTAMP
+                WHERE title != excluded.title
+            ''', (naver_product_id, title))
+            row = conn.execute(
+                'SELECT id FROM products WHERE naver_product_id = ?', (naver_product_id,)
+            ).fetchone()
+        else:
+            row = conn.execute(
+                'SELECT id FROM products WHERE title = ? AND naver_product_id IS NULL', (title,)
+            ).fetchone()
+            if row is None:
+                row = (conn.execute('INSERT INTO products (title) VALUES (?)', (title,)).lastrowid,)
+
+        self._product_ids[key] = (row[0], title)
+        return row[0]
+
+    def _reset_id_cache(self):
+        """롤백된 트랜잭션에서 캐시된 id 제거"""
+        self._product_ids.clear()
+        self._lookup_ids.clear()
+        self._last_intervals.clear()
+
+    def add_price_record(
+        self,
+        product_name: str,
+        platform: str,
+        price: int,
+        product_id: Optional[str] = None,
+        mall_name: Optional[str] = None
+    ):
+        """가격 기록 추가 (product_id: 네이버 productId)"""
+        self.add_price_records([{
+            "product_name": product_name,
+            "platform": platform,
+            "price": price,
+            "product_id": product_id,
+            "mall_name": mall_name
+        }])
+
+    def add_price_records(self, records: List[Dict]):
+        """
+        가격 기록 여러 건 추가
+
+        각 기록은 product_name, platform, price와 선택 항목 product_id(네이버 productId),
+        mall_name을 가짐. write-behind 모드에서는 버퍼에 넣고 바로 반환함 (버퍼가 가득 차면 대기)
+        """
+        created_at = utc_timestamp()
+        rows = [
+            (r.get("product_id") or None, r["product_name"], r["platform"],
+             r.get("mall_name") or None, r["price"], created_at)
+            for r in records
+        ]
+
+        if self.writer is None:
+            self._insert_price_records(rows)
+            return
+
+        for row in rows:
+            self.writer.add(row)
+
+    @instrumented("insert_price_records")
+    def _insert_price_records(self, rows: List[Tuple]):
+        """가격 기록을 한 트랜잭션으로 저장"""
+        conn = self._connect()
+
+        with self._id_lock:
+            try:
+                with conn:
+                    resolved = [
+                        (
+                            self._product_row_id(conn, naver_product_id, title),
+                            self._lookup_id(conn, 'platforms', platform),
+                            self._lookup_id(conn, 'malls', mall_name) if mall_name else None,
+                            price,
+                            created_at
+                        )
+                        for naver_product_id, title, platform, mall_name, price, created_at in rows
+                    ]
+                    if self.history_mode == "intervals":
+                        self._insert_price_intervals(conn, resolved)
+                    else:
+                        conn.executemany('''
+                            INSERT INTO price_history (product_id, platform_id, mall_id, price, created_at)
+                            VALUES (?, ?, ?, ?, ?)
+                        ''', resolved)
+                    self._update_rollups(conn, resolved)
+            except sqlite3.Error:
+                self._reset_id_cache()
+                raise
+
+    def _insert_price_intervals(self, conn: sqlite3.Connection, resolved: List[Tuple]):
+        """
+        가격이 바뀐 관측만 새 행으로 저장하고, 나머지는 직전 구간의 valid_to 연장과 관측 횟수 증가
+
+        날짜(UTC)가 바뀌면 같은 가격이어도 새 행을 시작함 (한 행의 관측이 모두 같은 롤업 버킷에 속함)
+        """
+        extensions = []
+
+        for product_id, platform_id, mall_id, price, created_at in resolved:
+            series = (product_id, platform_id, mall_id)
+            last = self._last_intervals.get(series)
+            if last is None:
+                last = conn.execute('''
+                    SELECT id, price, substr(created_at, 1, 10) FROM price_history
+                    WHERE product_id = ? AND platform_id = ? AND mall_id IS ?
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT 1
+                ''', series).fetchone()
+
+            if last is not None and last[1] == price and last[2] == created_at[:10]:
+                extensions.append((created_at, created_at, last[0]))
+                self._last_intervals[series] = last
+                continue
+
+            row_id = conn.execute('''
+                INSERT INTO price_history (product_id, platform_id, mall_id, price, created_at, valid_to)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (product_id, platform_id, mall_id, price, created_at, created_at)).lastrowid
+            self._last_intervals[series] = (row_id, price, created_at[:10])
+
+        conn.executemany('''
+            UPDATE price_history
+            SET observations = observations + 1,
+                valid_to = CASE WHEN valid_to IS NULL OR valid_to < ? THEN ? ELSE valid_to END
+            WHERE id = ?
+        ''', extensions)
+
+    def _product_filter(self, keyword: str) -> str:
+        """상품명 부분 일치 서브쿼리 (trigram 색인은 3글자 이상일 때만 사용 가능, LIKE와 같은 대소문자 무시)"""
+        if self.fts_enabled and len(keyword) >= 3:
+            return "SELECT rowid FROM products_fts WHERE title LIKE ?"
+        return "SELECT id FROM products WHERE title LIKE ?"
+
+    def _history_since(self, product_filter: str, filter_params: List, since: Optional[str]) -> Tuple[str, List]:
+        """
+        product_filter 상품의 가격 기록 중 since 이후 관측이 있는 행을 고르는 서브쿼리와 파라미터
 
+        since 이후 시작한 행은 (product_id, created_at) 인덱스로, 그 전에 시작해 since 이후까지
+        이어진 구간 행은 valid_to 부분 인덱스로 범위 탐색함 (COALESCE나 OR 조건은 인덱스 범위
+        탐색이 되지 않아 상품의 모든 행을 읽음)
+        """
+        columns = "id, product_id, platform_id, mall_id, price, created_at, valid_to, observations"
+        if not since:
+            return f"SELECT {columns} FROM price_history WHERE product_id IN ({product_filter})", list(filter_params)
+        return f'''
+            SELECT {columns} FROM price_history
+            WHERE product_id IN ({product_filter}) AND created_at >= ?
+            UNION ALL
+            SELECT {columns} FROM price_history
+            WHERE product_id IN ({product_filter}) AND valid_to >= ? AND created_at < ?
+        ''', [*filter_params, since, *filter_params, since, since]
+
+    @instrumented()
     def get_price_history(self, keyword: str, start_date: str = None) -> List[Dict]:
-        """상품 가격 히스토리 조회"""
-        conn = sqlite3.connect(self.db_path)
+        """
+        상품 가격 히스토리 조회
+
+        기록 하나(구간 저장이면 구간 하나)당 한 항목을 반환함. created_at은 첫 관측,
+        last_seen은 마지막 관측 시각, observations는 관측 횟수 (points 방식은 같은 시각, 1회)
+        """
+        self._flush_before_read()
+
+        conn = self._connect()
         cursor = conn.cursor()
 
-        if start_date:
-            cursor.execute('''
-                SELECT product_name, platform, price, created_at
-                FROM price_history
-                WHERE product_name LIKE ?
-                AND created_at >= ?
-                ORDER BY created_at DESC
-            ''', (f'%{keyword}%', start_date))
-        else:
-            cursor.execute('''
-                SELECT product_name, platform, price, created_at
-                FROM price_history
-                WHERE product_name LIKE ?
-                ORDER BY created_at DESC
-            ''', (f'%{keyword}%',))
+        rows_query, params = self._history_since(self._product_filter(keyword), [f'%{keyword}%'], start_date)
+
+        cursor.execute(f'''
+            SELECT p.title, pl.name, h.price, h.created_at, h.valid_to, h.observations
+            FROM ({rows_query}) h
+            CROSS JOIN products p ON p.id = h.product_id  -- 기록 행 기준으로 상품/플랫폼을 기본 키로 조회
+            CROSS JOIN platforms pl ON pl.id = h.platform_id
+            ORDER BY h.created_at DESC, h.id DESC
+        ''', params)
 
         rows = cursor.fetchall()
-        conn.close()
 
         history = []
-        for row in rows:
+        for product_name, platform, price, created_at, valid_to, observations in rows:
             history.append({
+                "product_name": product_name,
+                "platform": platform,
+                "price": price,
+                "created_at": created_at,
+                "last_seen": valid_to or created_at,
+                "observations": observations
+            })
+
+        return history
+
+    @instrumented()
+    def get_price_rollup(self, keyword: str, resolution: str, start_date: str = None) -> List[Dict]:
+        """
+        상품 가격 롤업 조회 (기간이 길 때 원본 기록 대신 사용)
+
+        Args:
+            keyword: 상품명 검색어
+            resolution: "daily" 또는 "weekly"
+            start_date: 조회 시작 시각 (UTC, 'YYYY-MM-DD HH:MM:SS')
+        """
+        if resolution not in ROLLUP_TABLES:
+            raise ValueError(f"지원하지 않는 롤업 단위: {resolution}")
+        table, _ = ROLLUP_TABLES[resolution]
+
+        self._flush_before_read()
+
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        product_filter = self._product_filter(keyword)
+        params = [f'%{keyword}%']
+        date_filter = ""
+        if start_date:
+            date_filter = "AND r.bucket >= ?"
+            params.append(rollup_bucket(resolution, start_date))
+
+        cursor.execute(f'''
+            SELECT p.title, pl.name, r.bucket, r.open_price, r.close_price,
+                r.min_price, r.max_price, r.sum_price, r.count
+            FROM {table} r
+            JOIN products p ON p.id = r.product_id
+            JOIN platforms pl ON pl.id = r.platform_id
+            WHERE r.product_id IN ({product_filter})
+            {date_filter}
+            ORDER BY r.bucket DESC
+        ''', params)
+
+        rows = cursor.fetchall()
+
+        rollup = []
+        for row in rows:
+            rollup.append({
                 "product_name": row[0],
                 "platform": row[1],
-                "price": row[2],
-                "created_at": row[3]
+                "date": row[2],
+                "open_price": row[3],
+                "close_price": row[4],
+                "min_price": row[5],
+                "max_price": row[6],
+                "average_price": row[7] // row[8],
+                "count": row[8]
             })
 
-        return history
+        return rollup
 
+    @instrumented()
     def add_price_alert(self, keyword: str, target_price: int, platform: str = '네이버쇼핑') -> int:
         """가격 알림 설정"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        conn = self._connect()
 
-        cursor.execute('''
-            INSERT INTO price_alerts (keyword, target_price, platform)
-            VALUES (?, ?, ?)
-        ''', (keyword, target_price, platform))
+        with conn:
+            cursor = conn.execute('''
+                INSERT INTO price_alerts (keyword, target_price, platform)
+                VALUES (?, ?, ?)
+            ''', (keyword, target_price, platform))
 
-        alert_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-
-        return alert_id
+        return cursor.lastrowid
 
+    @instrumented()
     def get_price_alerts(self) -> List[Dict]:
         """활성 가격 알림 목록"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
 
         cursor.execute('''
@@ -133,7 +785,6 @@ class Database:
         ''')
 
         rows = cursor.fetchall()
-        conn.close()
 
         alerts = []
         for row in rows:
@@ -147,35 +798,115 @@ class Database:
 
         return alerts
 
-    def add_tracked_product(self, product_name: str, keyword: str) -> int:
-        """추적 상품 추가"""
-        conn = sqlite3.connect(self.db_path)
+    @instrumented()
+    def add_alert_triggers(self, triggers: List[Dict]) -> List[Dict]:
+        """
+        트리거된 알림 저장 (이미 같은 가격으로 기록된 알림은 건너뜀)
+
+        Args:
+            triggers: alert_id, price, product_name, product_id(네이버 productId) 목록
+
+        Returns:
+            새로 저장된 트리거 목록
+        """
+        conn = self._connect()
+        created_at = utc_timestamp()
+        inserted = []
+
+        with self._id_lock:
+            try:
+                with conn:
+                    for trigger in triggers:
+                        row_id = self._product_row_id(conn, trigger.get('product_id'), trigger['product_name'])
+                        cursor = conn.execute('''
+                            INSERT OR IGNORE INTO alert_triggers (alert_id, product_id, price, created_at)
+                            VALUES (?, ?, ?, ?)
+                        ''', (trigger['alert_id'], row_id, trigger['price'], created_at))
+                        if cursor.rowcount:
+                            inserted.append({**trigger, 'created_at': created_at})
+            except sqlite3.Error:
+                self._reset_id_cache()
+                raise
+
+        return inserted
+
+    @instrumented()
+    def get_alert_triggers(self, limit: int = 100) -> List[Dict]:
+        """최근 트리거된 알림 목록"""
+        conn = self._connect()
         cursor = conn.cursor()
 
         cursor.execute('''
-            INSERT INTO tracked_products (product_name, keyword)
-            VALUES (?, ?)
-        ''', (product_name, keyword))
+            SELECT t.alert_id, a.keyword, a.target_price, t.price, p.title, p.naver_product_id, t.created_at
+            FROM alert_triggers t
+            JOIN price_alerts a ON a.id = t.alert_id
+            LEFT JOIN products p ON p.id = t.product_id
+            ORDER BY t.created_at DESC, t.id DESC
+            LIMIT ?
+        ''', (limit,))
 
-        track_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        rows = cursor.fetchall()
 
-        return track_id
+        triggers = []
+        for row in rows:
+            triggers.append({
+                "alert_id": row[0],
+                "keyword": row[1],
+                "target_price": row[2],
+                "price": row[3],
+                "product_name": row[4],
+                "product_id": row[5],
+                "created_at": row[6]
+            })
 
+        return triggers
+
+    @instrumented()
+    def get_notified_alerts(self) -> List[Tuple[int, int]]:
+        """알림별 마지막 트리거의 (알림 id, 가격) 목록 (등록된 알림만)"""
+        conn = self._connect()
+        # MAX(id)와 함께 고른 price는 SQLite에서 같은 행(가장 최근 트리거)의 값
+        rows = conn.execute('''
+            SELECT t.alert_id, t.price, MAX(t.id)
+            FROM alert_triggers t
+            JOIN price_alerts a ON a.id = t.alert_id
+            GROUP BY t.alert_id
+        ''').fetchall()
+        return [(alert_id, price) for alert_id, price, _ in rows]
+
+    @instrumented()
+    def add_tracked_product(self, product_name: str, keyword: str, product_id: Optional[str] = None) -> int:
+        """추적 상품 추가 (product_id: 네이버 productId)"""
+        conn = self._connect()
+
+        with self._id_lock:
+            try:
+                with conn:
+                    row_id = self._product_row_id(conn, product_id, product_name)
+                    cursor = conn.execute('''
+                        INSERT INTO tracked_products (product_name, keyword, product_id)
+                        VALUES (?, ?, ?)
+                    ''', (product_name, keyword, row_id))
+            except sqlite3.Error:
+                self._reset_id_cache()
+                raise
+
+        return cursor.lastrowid
+
+    @instrumented()
     def get_tracked_products(self) -> List[Dict]:
         """추적 중인 상품 목록"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
 
         cursor.execute('''
-            SELECT id, product_name, keyword, created_at
-            FROM tracked_products
-            ORDER BY created_at DESC
+            SELECT t.id, COALESCE(p.title, t.product_name), t.keyword, t.created_at, p.naver_product_id
+            FROM tracked_products t
+            LEFT JOIN products p ON p.id = t.product_id
+            ORDER BY t.created_at DESC
         ''')
 
         rows = cursor.fetchall()
-        conn.close()
 
         products = []
         for row in rows:
@@ -183,7 +914,93 @@ class Database:
                 "id": row[0],
                 "product_name": row[1],
                 "keyword": row[2],
-                "created_at": row[3]
+                "created_at": row[3],
+                "product_id": row[4]
             })
 
-        return products
\ No newline at end of file
+        return products
+
+    def get_price_change_stats(self, keywords: List[str], since: str) -> Dict:
+        """
+        추적 검색어의 최근 가격 변동 통계
+
+        Args:
+            keywords: 추적 상품의 검색어 목록 (tracked_products.keyword)
+            since: 집계 시작 시각 (UTC, 'YYYY-MM-DD HH:MM:SS')
+
+        Returns:
+            {"changes": 기간 내 가격 변경 횟수 (상품/플랫폼/판매처 시계열별 합), "last_change_at": 마지막 변경 시각}
+        """
+        return self.get_price_change_stats_by_group({"": keywords}, since)[""]
+
+    @instrumented()
+    def get_price_change_stats_by_group(self, groups: Dict[str, List[str]], since: str) -> Dict[str, Dict]:
+        """
+        검색어 묶음별 최근 가격 변동 통계 (한 번의 쿼리로 여러 묶음 집계)
+
+        Args:
+            groups: 묶음 이름 -> 추적 상품의 검색어 목록 (tracked_products.keyword)
+            since: 집계 시작 시각 (UTC, 'YYYY-MM-DD HH:MM:SS')
+
+        Returns:
+            묶음 이름 -> {"changes": 기간 내 가격 변경 횟수 (묶음의 상품/플랫폼/판매처 시계열별 합),
+            "last_change_at": 마지막 변경 시각}
+        """
+        stats = {name: {"changes": 0, "last_change_at": None} for name in groups}
+        members = [(name, keyword) for name, keywords in groups.items() for keyword in keywords]
+        if not members:
+            return stats
+
+        self._flush_before_read()
+
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        rows_query, params = self._history_since("SELECT product_id FROM targets", [], since)
+        cursor.execute(f'''
+            WITH members (name, keyword) AS (VALUES {", ".join("(?, ?)" for _ in members)}),
+            targets AS (
+                SELECT DISTINCT m.name, t.product_id
+                FROM members m
+                JOIN tracked_products t ON t.keyword = m.keyword
+            ),
+            observations AS (
+                SELECT product_id, price, created_at,
+                    LAG(price) OVER (
+                        PARTITION BY product_id, platform_id, mall_id ORDER BY created_at, id
+                    ) AS prev_price
+                FROM ({rows_query})
+            )
+            SELECT t.name, COUNT(*), MAX(o.created_at)
+            FROM observations o
+            JOIN targets t ON t.product_id = o.product_id
+            WHERE o.prev_price IS NOT NULL AND o.price != o.prev_price
+            GROUP BY t.name
+        ''', [value for member in members for value in member] + params)
+
+        for name, changes, last_change_at in cursor.fetchall():
+            stats[name] = {"changes": changes, "last_change_at": last_change_at}
+
+        return stats
+
+    @instrumented()
+    def get_api_usage(self, day: str) -> int:
+        """일일 API 호출량 조회"""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT calls FROM api_usage WHERE day = ?', (day,))
+        row = cursor.fetchone()
+
+        return row[0] if row else 0
+
+    @instrumented()
+    def set_api_usage(self, day: str, calls: int):
+        """일일 API 호출량 저장"""
+        conn = self._connect()
+
+        with conn:
+            conn.execute('''
+                INSERT INTO api_usage (day, calls) VALUES (?, ?)
+                ON CONFLICT(day) DO UPDATE SET calls = excluded.calls
+            ''', (day, calls))
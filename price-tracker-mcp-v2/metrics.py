@@ -0,0 +1,329 @@
+"""
+Prometheus 메트릭 (외부 의존성 없는 Counter/Gauge/Histogram, 텍스트 노출 형식)
+
+값 갱신은 잠금 한 번과 덧셈뿐이라 운영 중에도 항상 켜 둘 수 있음. 캐시/호출 한도/
+스케줄러처럼 이미 통계를 가진 구성 요소는 스크레이프 시점에 observe_stats()로 반영함.
+"""
+import functools
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 지연 히스토그램 기본 구간 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)) + "}"
+
+
+class Registry:
+    """메트릭 모음 (등록 순서대로 출력)"""
+
+    def __init__(self):
+        self._metrics: List["Metric"] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: "Metric"):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        lines = []
+        for metric in list(self._metrics):
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, names, values, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Value:
+    """카운터/게이지 값 하나"""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        """값 지정 (카운터는 구성 요소가 직접 누적한 값을 스크레이프 시 반영할 때만 사용)"""
+        self.value = float(value)
+
+
+class _HistogramValue:
+    """히스토그램 하나 (구간별 개수는 누적하지 않고 저장, 출력 시 누적)"""
+
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막은 +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def time(self) -> "_Timer":
+        """with 블록 실행 시간 기록"""
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_started")
+
+    def __init__(self, histogram: _HistogramValue):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._started)
+
+
+class Metric:
+    """레이블별 값을 가진 메트릭"""
+
+    type = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional[Registry] = REGISTRY
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def _new_child(self):
+        return _Value()
+
+    def labels(self, *values) -> object:
+        """레이블 값에 해당하는 값 객체 (처음이면 생성)"""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name}: 레이블 {self.labelnames} 필요, {key} 전달됨")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def clear(self):
+        """모든 레이블 값 제거 (스크레이프 시 다시 채우는 메트릭용)"""
+        with self._lock:
+            self._children = {}
+
+    def samples(self) -> Iterable[Tuple[str, Sequence[str], Sequence[str], float]]:
+        for key, child in sorted(self._children.items()):
+            yield "", self.labelnames, key, child.value
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1):
+        self.labels().dec(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional[Registry] = REGISTRY
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self) -> _Timer:
+        return self.labels().time()
+
+    def samples(self):
+        names = self.labelnames + ("le",)
+        for key, child in sorted(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield "_bucket", names, key + (_format_value(float(bound)),), cumulative
+            yield "_sum", self.labelnames, key, total
+            yield "_count", self.labelnames, key, cumulative
+
+
+def timed(histogram: Histogram, label: Optional[str] = None) -> Callable:
+    """함수 실행 시간을 기록하는 데코레이터 (레이블 기본값: 함수 이름)"""
+    def decorator(func: Callable) -> Callable:
+        child = histogram.labels(label or func.__name__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+# 도구
+TOOL_CALLS = Counter(
+    "price_tracker_tool_calls_total", "MCP 도구 호출 수 (status: ok, failure=success:false, error=예외)",
+    ["tool", "status"]
+)
+TOOL_DURATION = Histogram("price_tracker_tool_duration_seconds", "MCP 도구 실행 시간", ["tool"])
+
+# 네이버 API
+NAVER_REQUESTS = Counter(
+    "price_tracker_naver_requests_total", "네이버 API 요청 수 (status: HTTP 상태 코드 또는 error=연결 실패)",
+    ["status"]
+)
+NAVER_DURATION = Histogram("price_tracker_naver_request_duration_seconds", "네이버 API 응답 시간")
+NAVER_QUOTA_REMAINING = Gauge("price_tracker_naver_quota_remaining", "오늘 남은 네이버 API 호출 수")
+NAVER_QUOTA_USED = Gauge("price_tracker_naver_quota_used", "오늘 사용한 네이버 API 호출 수")
+NAVER_QUEUE = Gauge("price_tracker_naver_rate_limit_waiting", "호출 한도 대기열 길이")
+NAVER_THROTTLED = Counter("price_tracker_naver_throttled_total", "네이버 429 응답으로 대기한 횟수")
+
+# 검색 응답 캐시
+CACHE_LOOKUPS = Counter("price_tracker_cache_lookups_total", "검색 캐시 조회 수", ["result"])
+CACHE_EVICTIONS = Counter("price_tracker_cache_evictions_total", "크기 초과로 제거된 캐시 항목 수")
+CACHE_ENTRIES = Gauge("price_tracker_cache_entries", "검색 캐시 항목 수")
+CACHE_BYTES = Gauge("price_tracker_cache_bytes", "검색 캐시 크기 (바이트)")
+CACHE_HIT_RATIO = Gauge("price_tracker_cache_hit_ratio", "검색 캐시 적중률 (stale 포함)")
+
+# 검색 결과 필터링
+SEARCH_ITEMS = Counter(
+    "price_tracker_search_items_total", "search_products 분류 결과 항목 수 (accepted, filtered)", ["result"]
+)
+SEARCH_FILTERED_RATIO = Gauge("price_tracker_search_filtered_ratio", "search_products에서 필터링된 항목 비율")
+FILTERED_BY_RULE = Counter("price_tracker_filtered_items_total", "분류 규칙별 필터링된 항목 수", ["rule"])
+
+# 데이터베이스
+DB_QUERY_DURATION = Histogram(
+    "price_tracker_db_query_duration_seconds", "SQLite 쿼리 실행 시간 (statement: Database 메서드)",
+    ["statement"], buckets=DB_BUCKETS
+)
+DB_WRITE_PENDING = Gauge("price_tracker_db_write_pending", "저장 대기 중인 가격 기록 수")
+
+# 추적 스케줄러 / 알림
+SCHEDULER_QUEUE_DEPTH = Gauge("price_tracker_scheduler_queue_depth", "갱신 대기 중인 추적 검색어 수")
+SCHEDULER_PLANNED_CALLS = Gauge("price_tracker_scheduler_planned_calls_per_day", "현재 주기 기준 하루 갱신 호출 수")
+SCHEDULER_FAILURES = Counter("price_tracker_scheduler_failures_total", "추적 갱신 실패 수")
+SCHEDULER_CYCLES = Counter("price_tracker_scheduler_cycles_total", "추적 갱신 주기 실행 수")
+SCHEDULER_KEYWORDS_REFRESHED = Counter("price_tracker_scheduler_keywords_refreshed_total", "갱신한 추적 검색어 수")
+SCHEDULER_RECORDS_WRITTEN = Counter("price_tracker_scheduler_records_written_total", "추적 갱신으로 저장한 가격 기록 수")
+SCHEDULER_LAST_CYCLE_SECONDS = Gauge("price_tracker_scheduler_last_cycle_seconds", "마지막 갱신 주기 실행 시간")
+SCHEDULER_LAST_CYCLE_KEYWORDS = Gauge("price_tracker_scheduler_last_cycle_keywords", "마지막 갱신 주기에 갱신한 검색어 수")
+SCHEDULER_KEYWORDS_PER_SECOND = Gauge(
+    "price_tracker_scheduler_keywords_per_second", "마지막 갱신 주기의 초당 갱신 검색어 수"
+)
+ALERTS_ACTIVE = Gauge("price_tracker_alerts_active", "활성 가격 알림 수")
+
+
+def observe_stats(stats: Dict):
+    """PriceTracker.get_stats() 결과를 메트릭에 반영 (스크레이프 시 호출)"""
+    quota = stats["quota"]
+    NAVER_QUOTA_REMAINING.set(quota["remaining"])
+    NAVER_QUOTA_USED.set(quota["used"])
+    NAVER_QUEUE.set(quota["queued"])
+    NAVER_THROTTLED.set(quota["throttled"])
+
+    cache = stats.get("cache")
+    if cache:
+        CACHE_LOOKUPS.labels("hit").set(cache["hits"])
+        CACHE_LOOKUPS.labels("stale").set(cache["stale_hits"])
+        CACHE_LOOKUPS.labels("miss").set(cache["misses"])
+        CACHE_EVICTIONS.set(cache["evictions"])
+        CACHE_ENTRIES.set(cache["entries"])
+        CACHE_BYTES.set(cache["bytes"])
+        CACHE_HIT_RATIO.set(cache["hit_ratio"])
+
+    accepted = SEARCH_ITEMS.labels("accepted").value
+    filtered = SEARCH_ITEMS.labels("filtered").value
+    SEARCH_FILTERED_RATIO.set(filtered / (accepted + filtered) if accepted + filtered else 0)
+    for rule, count in stats.get("filtered", {}).items():
+        FILTERED_BY_RULE.labels(rule).set(count)
+
+    writer = stats.get("write_buffer")
+    DB_WRITE_PENDING.set(writer["pending"] if writer else 0)
+
+    scheduler = stats["scheduler"]
+    SCHEDULER_QUEUE_DEPTH.set(scheduler["queue_depth"])
+    SCHEDULER_PLANNED_CALLS.set(scheduler["planned_calls_per_day"])
+    SCHEDULER_LAST_CYCLE_SECONDS.set(scheduler["last_cycle_seconds"])
+    SCHEDULER_LAST_CYCLE_KEYWORDS.set(scheduler["last_cycle_keywords"])
+    SCHEDULER_KEYWORDS_PER_SECOND.set(scheduler["keywords_per_second"])
+
+    ALERTS_ACTIVE.set(stats["alerts"]["alerts"])
@@ -1,43 +1,116 @@
 """
 네이버 쇼핑 API 클라이언트
 """
-import requests
+import asyncio
+import importlib.util
+import time
+import httpx
 from typing import List, Dict, Optional
+from cache import ResponseCache
+from classifier import clean_html
+from metrics import NAVER_DURATION, NAVER_REQUESTS
+from tracing import KIND_CLIENT, TRACER, current_span, span, traced
+from singleflight import SingleFlight
+from rate_limiter import RateLimiter, QuotaExceeded, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+
+
+def normalize_query(query: str) -> str:
+    """검색어 정규화 (공백 정리, 소문자) - 동일 검색어 판별용"""
+    return " ".join(query.split()).lower()
 
 
 class NaverShoppingAPI:
-    """네이버 쇼핑 검색 API 클라이언트"""
+    """네이버 쇼핑 검색 API 클라이언트 (비동기, 커넥션 풀 재사용)"""
     
     BASE_URL = "https://openapi.naver.com/v1/search/shop.json"
     
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        timeout: float = 10,
+        http2: bool = True,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        keepalive_expiry: float = 30,
+        cache: Optional[ResponseCache] = None,
+        limiter: Optional[RateLimiter] = None,
+        base_url: str = BASE_URL
+    ):
         """
         Args:
             client_id: 네이버 API Client ID
             client_secret: 네이버 API Client Secret
+            timeout: 요청 타임아웃 (초)
+            http2: 서버가 지원하면 HTTP/2 사용
+            max_connections: 커넥션 풀 최대 연결 수
+            max_keepalive: 유지할 keep-alive 연결 수
+            keepalive_expiry: keep-alive 연결 유지 시간 (초)
+            cache: 검색 응답 캐시 (None이면 캐시 사용 안 함)
+            limiter: 호출 한도 관리자 (None이면 제한 없음)
+            base_url: 검색 API 주소 (벤치마크용 가짜 서버 등)
         """
         self.client_id = client_id
+        self.base_url = base_url
         self.client_secret = client_secret
         self.headers = {
             "X-Naver-Client-Id": client_id,
             "X-Naver-Client-Secret": client_secret
         }
+        self.timeout = timeout
+        # h2 패키지가 없으면 HTTP/1.1 keep-alive로 동작
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self.cache = cache
+        self.limiter = limiter
+        self.flight = SingleFlight()
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """공유 AsyncClient (첫 사용 시 생성)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2
+            )
+        return self._client
+    
+    async def aclose(self):
+        """진행 중인 호출 취소 및 커넥션 풀 종료"""
+        self.flight.cancel_all()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
-    def search_products(
+    @traced()
+    async def search_products(
         self, 
         query: str, 
         display: int = 10,
         start: int = 1,
-        sort: str = "sim"  # sim(유사도), date(날짜), asc(가격낮은순), dsc(가격높은순)
+        sort: str = "sim",  # sim(유사도), date(날짜), asc(가격낮은순), dsc(가격높은순)
+        priority: int = PRIORITY_INTERACTIVE
     ) -> Dict:
         """
         상품 검색
         
+        정규화된 검색어가 같은 동시 호출은 하나의 API 호출을 공유하며,
+        호출 한도를 모두 쓴 경우 캐시된 응답으로 대체함
+        (정규화는 캐시/공유 키에만 쓰고 API에는 입력한 검색어를 그대로 보냄)
+        
         Args:
             query: 검색어
             display: 검색 결과 출력 건수 (기본 10, 최대 100)
             start: 검색 시작 위치 (기본 1, 최대 1000)
             sort: 정렬 옵션
+            priority: 한도 대기열 우선순위 (PRIORITY_INTERACTIVE / PRIORITY_BACKGROUND)
         
         Returns:
             검색 결과 딕셔너리
@@ -49,19 +122,82 @@ class NaverShoppingAPI:
             "sort": sort
         }
         
+        key = ResponseCache.make_key(normalize_query(query), display, start, sort)
+        
+        if self.cache is None:
+            return await self.flight.do(key, lambda: self._fetch(params, key, priority))
+        
+        cached, state = self.cache.get(key)
+        parent = current_span()
+        if parent is not None:
+            parent.set_attribute("cache", state or "miss")
+        
+        if state == ResponseCache.FRESH:
+            return cached
+        
+        if state == ResponseCache.STALE:
+            # 만료된 응답을 즉시 반환하고 백그라운드에서 갱신
+            if not self.flight.in_flight(key):
+                self.flight.start(key, lambda: self._fetch(params, key, PRIORITY_BACKGROUND))
+            return cached
+        
+        return await self.flight.do(key, lambda: self._fetch(params, key, priority))
+    
+    async def _fetch(self, params: Dict, key: tuple, priority: int = PRIORITY_INTERACTIVE) -> Dict:
+        """API 호출 (성공 응답은 캐시에 저장)"""
+        if self.limiter is not None:
+            try:
+                with span("rate_limit_wait", priority=priority):
+                    await self.limiter.acquire(priority)
+            except QuotaExceeded as e:
+                return self._fallback(key, str(e))
+        
+        with span("naver.request", KIND_CLIENT, sort=params["sort"], start=params["start"],
+                  display=params["display"]) as request_span:
+            # 트레이싱 중이면 연결/TLS/전송/수신 단계를 하위 span으로 기록
+            extensions = {"trace": TRACER.http_trace(request_span)} if request_span is not None else None
+            started = time.perf_counter()
+            try:
+                response = await self.client.get(self.base_url, params=params, extensions=extensions)
+            except httpx.HTTPError as e:
+                NAVER_DURATION.observe(time.perf_counter() - started)
+                NAVER_REQUESTS.labels("error").inc()
+                if request_span is not None:
+                    request_span.set_error(e)
+                return {"error": str(e), "items": []}
+            NAVER_DURATION.observe(time.perf_counter() - started)
+            NAVER_REQUESTS.labels(response.status_code).inc()
+            if request_span is not None:
+                request_span.set_attribute("http.status_code", response.status_code)
+                request_span.set_attribute("http.response_bytes", len(response.content))
+                request_span.set_attribute("http.version", response.http_version)
+                if response.status_code >= 400:
+                    request_span.set_error(f"HTTP {response.status_code}")
+        
         try:
-            response = requests.get(
-                self.BASE_URL,
-                headers=self.headers,
-                params=params,
-                timeout=10
-            )
+            if response.status_code == 429 and self.limiter is not None:
+                self.limiter.throttle()
+                return self._fallback(key, "네이버 API 호출 한도 초과 (429)")
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            with span("json_parse"):
+                result = response.json()
+        except httpx.HTTPError as e:
             return {"error": str(e), "items": []}
+        except ValueError as e:
+            return {"error": f"응답 JSON 파싱 실패: {e}", "items": []}
+        
+        if self.cache is not None:
+            self.cache.set(key, result, size=len(response.content))
+        return result
+    
+    def _fallback(self, key: tuple, message: str) -> Dict:
+        """한도 초과 시 만료된 캐시라도 있으면 반환"""
+        cached = self.cache.peek(key) if self.cache is not None else None
+        if cached is None:
+            return {"error": message, "items": []}
+        return {**cached, "degraded": True}
     
-    def get_lowest_prices(self, query: str, count: int = 3) -> List[Dict]:
+    async def get_lowest_prices(self, query: str, count: int = 3) -> List[Dict]:
         """
         최저가 상품 검색
         
@@ -72,7 +208,7 @@ class NaverShoppingAPI:
         Returns:
             최저가순 상품 리스트
         """
-        result = self.search_products(query, display=count, sort="asc")
+        result = await self.search_products(query, display=count, sort="asc")
         
         if "items" not in result:
             return []
@@ -80,7 +216,7 @@ class NaverShoppingAPI:
         products = []
         for item in result["items"]:
             products.append({
-                "title": self._clean_html(item.get("title", "")),
+                "title": clean_html(item.get("title", "")),
                 "price": int(item.get("lprice", 0)),
                 "link": item.get("link", ""),
                 "image": item.get("image", ""),
@@ -93,11 +229,6 @@ class NaverShoppingAPI:
             })
         
         return products
-    
-    def _clean_html(self, text: str) -> str:
-        """HTML 태그 제거"""
-        import re
-        return re.sub(r'<[^>]+>', '', text)
 
 
 # 테스트 코드
@@ -106,11 +237,17 @@ if __name__ == "__main__":
     client_id = "YOUR_CLIENT_ID"
     client_secret = "YOUR_CLIENT_SECRET"
     
-    api = NaverShoppingAPI(client_id, client_secret)
-    results = api.get_lowest_prices("아이패드", count=3)
+    async def main():
+        api = NaverShoppingAPI(client_id, client_secret)
+        try:
+            results = await api.get_lowest_prices("아이패드", count=3)
+        finally:
+            await api.aclose()
+        
+        for idx, product in enumerate(results, 1):
+            print(f"{idx}. {product['title']}")
+            print(f"   가격: {product['price']:,}원")
+            print(f"   판매처: {product['mall_name']}")
+            print()
     
-    for idx, product in enumerate(results, 1):
-        print(f"{idx}. {product['title']}")
-        print(f"   가격: {product['price']:,}원")
-        print(f"   판매처: {product['mall_name']}")
-        print()
+    asyncio.run(main())
@@ -1,12 +1,24 @@
 """
 가격 추적 메인 로직 - 네이버 쇼핑 전용
 """
-import re
+import asyncio
+import heapq
 import logging
+import time
+from bisect import bisect_left
 from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from database import Database
-from naver_api import NaverShoppingAPI
+from naver_api import NaverShoppingAPI, normalize_query
+from cache import ResponseCache
+from rate_limiter import RateLimiter, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from scheduler import TrackingScheduler
+from alerts import AlertIndex, current_price
+from classifier import ProductClassifier
+from singleflight import SingleFlight
+from progress import ProgressCallback, gather_with_progress
+from metrics import SEARCH_ITEMS
+from tracing import detached_task, span, traced
 from config import Config
 
 logger = logging.getLogger(__name__)
@@ -16,108 +28,268 @@ class PriceTracker:
 
     def __init__(self):
         logger.info("🔧 PriceTracker 초기화 중...")
-        self.db = Database()
+        self.db = Database(
+            db_path=Config.DATABASE_PATH,
+            cache_size_kb=Config.DB_CACHE_SIZE_KB,
+            mmap_size=Config.DB_MMAP_SIZE,
+            statement_cache=Config.DB_STATEMENT_CACHE,
+            write_behind=Config.DB_WRITE_BEHIND,
+            write_batch_size=Config.DB_WRITE_BATCH_SIZE,
+            write_flush_interval=Config.DB_WRITE_FLUSH_INTERVAL,
+            write_max_pending=Config.DB_WRITE_MAX_PENDING,
+            write_max_retries=Config.DB_WRITE_MAX_RETRIES,
+            history_mode=Config.HISTORY_STORAGE_MODE
+        )
         
         logger.info(f"🔑 API 키로 NaverShoppingAPI 초기화...")
         logger.info(f"   Client ID: {Config.NAVER_CLIENT_ID[:10] if Config.NAVER_CLIENT_ID else 'None'}...")
         logger.info(f"   Client Secret: {Config.NAVER_CLIENT_SECRET[:5] if Config.NAVER_CLIENT_SECRET else 'None'}...")
         
+        self.cache = ResponseCache(
+            ttls=Config.CACHE_TTLS,
+            stale_ttl=Config.CACHE_STALE_TTL,
+            max_entries=Config.CACHE_MAX_ENTRIES,
+            max_bytes=Config.CACHE_MAX_BYTES
+        ) if Config.CACHE_ENABLED else None
+        
+        self.limiter = RateLimiter(
+            per_second=Config.NAVER_RATE_PER_SECOND,
+            daily_limit=Config.NAVER_DAILY_LIMIT,
+            burst=Config.NAVER_RATE_BURST,
+            store=self.db
+        )
+        
         self.naver = NaverShoppingAPI(
             client_id=Config.NAVER_CLIENT_ID,
-            client_secret=Config.NAVER_CLIENT_SECRET
+            client_secret=Config.NAVER_CLIENT_SECRET,
+            timeout=Config.NAVER_TIMEOUT,
+            http2=Config.NAVER_HTTP2,
+            max_connections=Config.NAVER_MAX_CONNECTIONS,
+            max_keepalive=Config.NAVER_MAX_KEEPALIVE,
+            keepalive_expiry=Config.NAVER_KEEPALIVE_EXPIRY,
+            cache=self.cache,
+            limiter=self.limiter,
+            base_url=Config.NAVER_API_URL
+        )
+        
+        # 서버 실행 시 start()로 시작
+        self.scheduler = TrackingScheduler(
+            self,
+            interval=Config.TRACK_REFRESH_INTERVAL,
+            min_interval=Config.TRACK_MIN_INTERVAL,
+            max_interval=Config.TRACK_MAX_INTERVAL,
+            concurrency=Config.TRACK_REFRESH_CONCURRENCY,
+            jitter=Config.TRACK_REFRESH_JITTER,
+            refresh_count=Config.TRACK_REFRESH_COUNT,
+            batch_size=Config.DB_WRITE_BATCH_SIZE,
+            daily_budget=Config.TRACK_DAILY_BUDGET,
+            volatility_days=Config.TRACK_VOLATILITY_DAYS
+        )
+
+        # 가격이 관측될 때마다 확인하는 알림 인덱스
+        self.alerts = AlertIndex()
+        self.alerts.load(self.db.get_price_alerts())
+        for alert_id, price in self.db.get_notified_alerts():
+            self.alerts.mark_notified(alert_id, price)
+
+        # 베스트 딜 스냅샷 (백그라운드에서 갱신, 도구는 메모리에서 응답)
+        self.best_deals: List[Dict] = []
+        self.best_deals_missing: List[str] = []
+        self.best_deals_updated_at: Optional[float] = None
+        self._best_deals_refreshed: Optional[float] = None
+        self._best_deals_flight = SingleFlight()
+        self._best_deals_task: Optional[asyncio.Task] = None
+        # 휴대폰 검색어 / 액세서리 판별 규칙
+        self.classifier = ProductClassifier(
+            phone_keywords=Config.PHONE_KEYWORDS,
+            accessory_keywords=Config.ACCESSORY_KEYWORDS,
+            phone_min_price=Config.PHONE_MIN_PRICE
         )
         logger.info("✅ PriceTracker 초기화 완료")
 
-    def search_products(self, keyword: str, count: int = 10) -> List[Dict]:
-        """상품 검색 (액세서리 필터링 포함)"""
+    async def aclose(self):
+        """스케줄러 중지, HTTP 커넥션 풀 및 DB 연결 정리"""
+        if self._best_deals_task is not None:
+            self._best_deals_task.cancel()
+        self._best_deals_flight.cancel_all()
+        await self.scheduler.stop()
+        await self.naver.aclose()
+        await asyncio.to_thread(self.db.close)
+
+    def get_stats(self) -> Dict:
+        """내부 통계 (캐시 적중률, 요청 병합, 호출 한도 등)"""
+        return {
+            'quota': self.limiter.stats(),
+            'cache': self.cache.stats() if self.cache else None,
+            'singleflight': self.naver.flight.stats(),
+            'write_buffer': self.db.writer.stats() if self.db.writer else None,
+            'scheduler': self.scheduler.stats(),
+            'alerts': self.alerts.stats(),
+            'filtered': self.classifier.stats(),
+            'best_deals': {
+                'keywords': len(Config.BEST_DEAL_KEYWORDS),
+                'deals': len(self.best_deals),
+                'missing': self.best_deals_missing,
+                'updated_at': self.best_deals_updated_at
+            }
+        }
+
+    @traced()
+    async def search_products(
+        self,
+        keyword: str,
+        count: int = 10,
+        priority: int = PRIORITY_INTERACTIVE,
+        record: bool = True
+    ) -> List[Dict]:
+        """
+        상품 검색 (액세서리 필터링 포함)
+
+        record가 False이면 RECORD_SEARCH_RESULTS가 켜져 있어도 가격을 기록하지 않음
+        (호출한 쪽에서 직접 기록하는 추적 시작/스케줄러 갱신용)
+        """
         logger.info(f"🔍 네이버 쇼핑에서 '{keyword}' 검색 중...")
 
         products = []
-        filtered_count = 0
 
         try:
             # 더 많은 결과를 가져와서 필터링 후 원하는 개수 확보
-            fetch_count = count * 3 if self._is_phone_keyword(keyword) else count
+            fetch_count = count * 3 if self.classifier.is_phone_keyword(keyword) else count
             
             # 네이버 검색
-            result = self.naver.search_products(
+            result = await self.naver.search_products(
                 query=keyword,
                 display=min(fetch_count, 100),  # 최대 100개
-                sort="sim"
+                sort="sim",
+                priority=priority
             )
             
             logger.info(f"📦 API 응답: {len(result.get('items', []))}개 아이템")
+            if result.get('degraded'):
+                logger.warning(f"⚠️ API 호출 한도 초과 - '{keyword}' 캐시된 결과 사용")
             
-            if "items" in result:
-                for item in result["items"]:
-                    price = int(item.get('lprice', 0))
-                    title = self._clean_html(item.get('title', ''))
-                    
-                    # 가격 필터링: 휴대폰은 최소 10만원 이상
-                    if self._is_phone_keyword(keyword) and price < 100000:
-                        logger.debug(f"⏭️ 액세서리 제외: {title} ({price:,}원)")
-                        filtered_count += 1
-                        continue
-                    
-                    # 제목으로 액세서리 필터링
-                    if self._is_accessory(title):
-                        logger.debug(f"⏭️ 액세서리 제외: {title}")
-                        filtered_count += 1
-                        continue
-                    
-                    products.append({
-                        'platform': '네이버쇼핑',
-                        'title': title,
-                        'price': price,
-                        'link': item.get('link', ''),
-                        'image': item.get('image', ''),
-                        'brand': item.get('brand', ''),
-                        'maker': item.get('maker', ''),
-                        'category': item.get('category1', '')
-                    })
-                    
-                    # 원하는 개수만큼 수집했으면 중단
-                    if len(products) >= count:
-                        break
+            # 원하는 개수만큼 통과하면 분류 중단
+            with span("classify", items=len(result.get("items", []))):
+                accepted, filtered = self.classifier.classify(keyword, result.get("items", []), limit=count)
+            products = [self._to_product(*entry) for entry in accepted]
+            SEARCH_ITEMS.labels("accepted").inc(len(accepted))
+            SEARCH_ITEMS.labels("filtered").inc(sum(filtered.values()))
+            
+            reasons = ", ".join(f"{rule} {n}" for rule, n in filtered.items())
+            logger.info(
+                f"✅ {len(products)}개 상품 검색 완료! ({sum(filtered.values())}개 액세서리 필터링됨"
+                + (f": {reasons})" if reasons else ")")
+            )
             
-            logger.info(f"✅ {len(products)}개 상품 검색 완료! ({filtered_count}개 액세서리 필터링됨)")
+            records = [self._to_record(p) for p in products]
+
+            if record and Config.RECORD_SEARCH_RESULTS and records:
+                await asyncio.to_thread(self.db.add_price_records, records)
+
+            # 검색/추적/스케줄러 갱신 모두 이 경로로 가격을 관측하므로 여기서 알림 확인
+            await self.notify_prices(keyword, records)
             
         except Exception as e:
             logger.error(f"❌ 검색 실패: {type(e).__name__}: {e}", exc_info=True)
             
         return products
 
-    def _is_phone_keyword(self, keyword: str) -> bool:
-        """휴대폰 키워드인지 확인"""
-        phone_keywords = [
-            '아이폰', 'iphone', 
-            '갤럭시', 'galaxy',
-            '핸드폰', '스마트폰', '휴대폰',
-            '폰', 'phone'
-        ]
-        keyword_lower = keyword.lower()
-        return any(pk in keyword_lower for pk in phone_keywords)
-    
-    def _is_accessory(self, title: str) -> bool:
-        """액세서리인지 제목으로 판단"""
-        accessory_keywords = [
-            '케이스', '커버', '필름', '보호필름', '강화유리',
-            '케이블', '충전기', '어댑터', '젠더', '이어폰',
-            '스트랩', '링', '홀더', '거치대', '스탠드',
-            '보호대', '범퍼', '카드', '지갑', '파우치'
+    @staticmethod
+    def _to_product(item: Dict, title: str, price: int) -> Dict:
+        """분류를 통과한 검색 결과 항목을 상품 정보로 변환"""
+        return {
+            'platform': '네이버쇼핑',
+            'title': title,
+            'price': price,
+            'product_id': item.get('productId', ''),
+            'mall_name': item.get('mallName', ''),
+            'link': item.get('link', ''),
+            'image': item.get('image', ''),
+            'brand': item.get('brand', ''),
+            'maker': item.get('maker', ''),
+            'category': item.get('category1', '')
+        }
+
+    @staticmethod
+    def _to_record(product: Dict) -> Dict:
+        """상품 정보를 가격 기록 형식으로 변환"""
+        return {
+            'product_name': product['title'],
+            'platform': product['platform'],
+            'price': product['price'],
+            'product_id': product['product_id'],
+            'mall_name': product['mall_name']
+        }
+
+    @traced()
+    async def notify_prices(self, keyword: str, records: List[Dict]) -> List[Dict]:
+        """
+        관측된 가격으로 알림 인덱스를 확인해 새로 트리거된 알림 저장 (추가 API 호출 없음)
+
+        현재가는 alerts.current_price 기준 (정확도순 상위 ALERT_PRICE_TOP_N개 중 최저가)
+
+        Args:
+            keyword: 검색어
+            records: 정확도순 검색 결과의 가격 기록 (순서 유지)
+
+        Returns:
+            새로 트리거된 알림 목록
+        """
+        lowest = current_price(records, Config.ALERT_PRICE_TOP_N)
+        if lowest is None:
+            return []
+
+        matched = self.alerts.match(keyword, lowest['price'])
+        if not matched:
+            return []
+
+        triggers = [
+            {
+                'alert_id': alert['id'],
+                'keyword': alert['keyword'],
+                'target_price': alert['target_price'],
+                'price': lowest['price'],
+                'product_name': lowest['product_name'],
+                'product_id': lowest['product_id'],
+                'message': f"🎉 '{alert['keyword']}'이(가) 목표가 {alert['target_price']:,}원 이하입니다! (현재가: {lowest['price']:,}원)"
+            }
+            for alert in matched
         ]
-        title_lower = title.lower()
-        return any(acc in title_lower for acc in accessory_keywords)
 
-    def _clean_html(self, text: str) -> str:
-        """HTML 태그 제거"""
-        return re.sub(r'<[^>]+>', '', text)
+        try:
+            triggered = await asyncio.to_thread(self.db.add_alert_triggers, triggers)
+        except Exception as e:
+            # 알린 것으로 기록하지 않았으므로 다음 관측 때 다시 시도함
+            logger.error(f"❌ 알림 트리거 저장 실패: {e}")
+            return []
+
+        for alert in matched:
+            self.alerts.mark_notified(alert['id'], lowest['price'])
+        for trigger in triggered:
+            logger.info(trigger['message'])
+        return triggered
+
+    @traced()
+    async def get_triggered_alerts(self, limit: int = 20) -> List[Dict]:
+        """최근 트리거된 알림 조회"""
+        logger.info(f"🔔 트리거된 알림 조회 (limit: {limit})")
+        return await asyncio.to_thread(self.db.get_alert_triggers, limit)
+
+    @traced()
+    async def compare_prices(
+        self,
+        keyword: str,
+        priority: int = PRIORITY_INTERACTIVE,
+        deep: bool = False,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict:
+        """가격 비교 및 최저가 찾기 (deep=True면 여러 페이지를 가격순/정확도순으로 조회)"""
+        if deep:
+            return await self.deep_compare_prices(keyword, priority=priority, on_progress=on_progress)
 
-    def compare_prices(self, keyword: str) -> Dict:
-        """가격 비교 및 최저가 찾기"""
         logger.info(f"💰 '{keyword}' 가격 비교 중...")
         
-        products = self.search_products(keyword, count=20)
+        products = await self.search_products(keyword, count=20, priority=priority)
 
         if not products:
             logger.warning(f"⚠️ '{keyword}' 상품을 찾을 수 없습니다")
@@ -149,15 +321,202 @@ class PriceTracker:
             'products': sorted_products[:10]  # 상위 10개만
         }
 
-    def set_price_alert(self, keyword: str, target_price: int) -> Dict:
+    @traced()
+    async def deep_compare_prices(
+        self,
+        keyword: str,
+        priority: int = PRIORITY_INTERACTIVE,
+        max_pages: Optional[int] = None,
+        timeout: Optional[float] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict:
+        """
+        여러 페이지 가격 비교
+
+        가격 낮은순(asc)과 정확도순(sim)으로 start 오프셋별 페이지(100개씩, 최대 1000개)를
+        동시에 조회하고 productId로 중복을 제거함. 첫 페이지의 total로 필요한 페이지만
+        정렬별로 max_pages까지 추가 요청하며, 페이지가 도착하는 대로 통계를 갱신하다 페이지/시간 예산을 넘으면
+        그때까지의 결과를 반환함. on_progress로 페이지마다 중간 통계를 전달함.
+        """
+        max_pages = max_pages or Config.DEEP_COMPARE_MAX_PAGES
+        timeout = timeout or Config.DEEP_COMPARE_TIMEOUT
+        deadline = time.monotonic() + timeout
+        logger.info(f"💰 '{keyword}' 심층 가격 비교 중... (정렬별 최대 {max_pages}페이지, {timeout:g}초)")
+
+        page_size = 100
+        sorts = ("asc", "sim")
+        seen = set()
+        products: List[Dict] = []
+        lowest_price = highest_price = None
+        price_sum = 0
+        total_available = 0
+        fetched = 0
+
+        def fetch(sort: str, start: int) -> asyncio.Task:
+            return asyncio.create_task(self.naver.search_products(
+                query=keyword, display=page_size, start=start, sort=sort, priority=priority
+            ))
+
+        def add_page(result: Dict) -> List[Dict]:
+            """페이지 결과 반영 후 분류를 통과한 상품을 페이지 순서대로 반환"""
+            nonlocal lowest_price, highest_price, price_sum
+            accepted, _ = self.classifier.classify(keyword, result.get('items', []))
+            page_products = [self._to_product(*entry) for entry in accepted]
+            for product in page_products:
+                key = product['product_id'] or product['title']
+                if key in seen:
+                    continue
+                seen.add(key)
+                products.append(product)
+                price = product['price']
+                price_sum += price
+                lowest_price = price if lowest_price is None else min(lowest_price, price)
+                highest_price = price if highest_price is None else max(highest_price, price)
+            return page_products
+
+        # 1단계: 정렬별 첫 페이지로 전체 결과 수 확인
+        first_pages = {sort: fetch(sort, 1) for sort in sorts}
+        pending = set(first_pages.values())
+        relevant: List[Dict] = []  # 정확도순 첫 페이지 (알림 판정용)
+        planned = len(pending)
+        first_wave = True
+
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    result = task.result()
+                    fetched += 1
+                    if result.get('error'):
+                        logger.warning(f"⚠️ '{keyword}' 페이지 조회 실패: {result['error']}")
+                        continue
+                    total_available = max(total_available, int(result.get('total', 0)))
+                    page_products = add_page(result)
+                    if task is first_pages['sim']:
+                        relevant = page_products
+
+                if on_progress is not None and done:
+                    await on_progress(fetched, planned, f"'{keyword}' {fetched}/{planned}페이지 조회", {
+                        'total_count': len(products),
+                        'lowest_price': lowest_price,
+                        'highest_price': highest_price,
+                        'average_price': price_sum // len(products) if products else None
+                    })
+
+                # 2단계: 결과 수와 정렬별 페이지 예산 안에서 나머지 페이지 동시 요청
+                if first_wave and not pending:
+                    first_wave = False
+                    # 마지막 페이지가 page_size보다 작아도 포함 (start는 최대 1000)
+                    last = min(total_available, 1000, max_pages * page_size)
+                    for start in range(1 + page_size, last + 1, page_size):
+                        for sort in sorts:
+                            pending.add(fetch(sort, start))
+                            planned += 1
+        finally:
+            for task in pending:
+                task.cancel()
+
+        partial = bool(pending)
+        if partial:
+            logger.warning(f"⚠️ '{keyword}' 시간 예산 초과 - {fetched}/{planned}페이지 결과로 비교")
+
+        # 알림은 검색과 같은 기준(정확도순 상위 결과)으로 판정
+        if relevant:
+            await self.notify_prices(keyword, [self._to_record(p) for p in relevant])
+
+        logger.info(f"✅ 심층 가격 비교 완료: 상품 {len(products)}개, 페이지 {fetched}/{planned}")
+
+        return {
+            'keyword': keyword,
+            'total_count': len(products),
+            'lowest_price': lowest_price,
+            'highest_price': highest_price,
+            'average_price': price_sum // len(products) if products else None,
+            'products': heapq.nsmallest(10, products, key=lambda x: x['price']),
+            'deep': True,
+            'pages_fetched': fetched,
+            'pages_planned': planned,
+            'total_available': total_available,
+            'partial': partial
+        }
+
+    async def batch_search(
+        self,
+        keywords: List[str],
+        count: int = 10,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Dict]:
+        """여러 검색어 동시 검색 (검색어별 결과 또는 오류)"""
+        return await self._run_batch(
+            keywords, lambda keyword: self.search_products(keyword, count), on_progress
+        )
+
+    async def batch_compare(
+        self,
+        keywords: List[str],
+        deep: bool = False,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Dict]:
+        """여러 검색어 동시 가격 비교 (검색어별 결과 또는 오류)"""
+        return await self._run_batch(
+            keywords, lambda keyword: self.compare_prices(keyword, deep=deep), on_progress
+        )
+
+    @traced()
+    async def _run_batch(
+        self,
+        keywords: List[str],
+        call,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Dict]:
+        """
+        검색어별 호출을 동시에 실행 (캐시/호출 한도/요청 병합은 개별 호출과 동일하게 적용)
+
+        검색어가 끝날 때마다 on_progress로 해당 검색어의 결과를 전달함
+
+        Raises:
+            ValueError: 검색어가 없거나 BATCH_MAX_KEYWORDS를 넘는 경우
+        """
+        keywords = list(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+        if not keywords:
+            raise ValueError("검색어를 1개 이상 입력하세요")
+        if len(keywords) > Config.BATCH_MAX_KEYWORDS:
+            raise ValueError(f"한 번에 최대 {Config.BATCH_MAX_KEYWORDS}개 검색어까지 처리할 수 있습니다 ({len(keywords)}개 입력)")
+
+        logger.info(f"📦 {len(keywords)}개 검색어 일괄 처리 중...")
+
+        async def run(keyword: str):
+            try:
+                return keyword, {'result': await call(keyword)}
+            except Exception as e:
+                logger.warning(f"⚠️ '{keyword}' 일괄 처리 실패: {e}")
+                return keyword, {'error': str(e)}
+
+        async def done(completed: int, total: int, result):
+            if on_progress is not None:
+                keyword, item = result
+                await on_progress(completed, total, f"'{keyword}' 완료 ({completed}/{total})", {keyword: item})
+
+        results = await gather_with_progress((run(keyword) for keyword in keywords), done)
+        return dict(results)
+
+    @traced()
+    async def set_price_alert(self, keyword: str, target_price: int) -> Dict:
         """가격 알림 설정"""
         logger.info(f"🔔 가격 알림 설정: {keyword} -> {target_price:,}원")
         
-        alert_id = self.db.add_price_alert(
+        alert_id = await asyncio.to_thread(
+            self.db.add_price_alert,
             keyword=keyword,
             target_price=target_price,
             platform='네이버쇼핑'
         )
+        self.alerts.add({'id': alert_id, 'keyword': keyword, 'target_price': target_price})
 
         return {
             'alert_id': alert_id,
@@ -168,24 +527,53 @@ class PriceTracker:
             'message': f"'{keyword}'의 목표가 {target_price:,}원 알림이 설정되었습니다."
         }
 
-    def get_price_history(self, keyword: str, days: int = 30) -> List[Dict]:
-        """가격 히스토리 조회"""
-        logger.info(f"📊 '{keyword}' 가격 히스토리 조회 ({days}일)")
+    def pick_history_resolution(self, days: int, resolution: str = "auto") -> str:
+        """조회 기간에 맞는 히스토리 단위 선택 (raw / daily / weekly)"""
+        if resolution != "auto":
+            if resolution not in ("raw", "daily", "weekly"):
+                raise ValueError(f"지원하지 않는 조회 단위: {resolution} (auto, raw, daily, weekly)")
+            return resolution
+        if days <= Config.HISTORY_RAW_MAX_DAYS:
+            return "raw"
+        if days <= Config.HISTORY_DAILY_MAX_DAYS:
+            return "daily"
+        return "weekly"
+
+    @traced()
+    async def get_price_history(self, keyword: str, days: int = 30, resolution: str = "auto") -> List[Dict]:
+        """
+        가격 히스토리 조회
+
+        긴 기간은 원본 기록 대신 일/주 단위 롤업(시가/종가/최저/최고/평균)을 반환함
+        """
+        resolution = self.pick_history_resolution(days, resolution)
+        logger.info(f"📊 '{keyword}' 가격 히스토리 조회 ({days}일, {resolution})")
         
-        start_date = datetime.now() - timedelta(days=days)
-        history = self.db.get_price_history(
+        # created_at은 CURRENT_TIMESTAMP(UTC, 'YYYY-MM-DD HH:MM:SS') 형식으로 저장됨
+        start_date = datetime.now(timezone.utc) - timedelta(days=days)
+        start_date = start_date.strftime('%Y-%m-%d %H:%M:%S')
+
+        if resolution == "raw":
+            return await asyncio.to_thread(
+                self.db.get_price_history,
+                keyword=keyword,
+                start_date=start_date
+            )
+
+        return await asyncio.to_thread(
+            self.db.get_price_rollup,
             keyword=keyword,
-            start_date=start_date.isoformat()
+            resolution=resolution,
+            start_date=start_date
         )
 
-        return history
-
-    def track_product(self, keyword: str) -> Dict:
+    @traced()
+    async def track_product(self, keyword: str) -> Dict:
         """상품 추적 시작"""
         logger.info(f"🎯 '{keyword}' 추적 시작...")
         
-        # 현재 가격 검색
-        products = self.search_products(keyword, count=1)
+        # 현재 가격 검색 (가격은 아래에서 한 번만 기록)
+        products = await self.search_products(keyword, count=1, record=False)
 
         if not products:
             return {
@@ -196,16 +584,21 @@ class PriceTracker:
         product = products[0]
 
         # 추적 상품 등록
-        track_id = self.db.add_tracked_product(
+        track_id = await asyncio.to_thread(
+            self.db.add_tracked_product,
             product_name=product['title'],
-            keyword=keyword
+            keyword=keyword,
+            product_id=product['product_id']
         )
 
         # 현재 가격 저장
-        self.db.add_price_record(
+        await asyncio.to_thread(
+            self.db.add_price_record,
             product_name=product['title'],
             platform=product['platform'],
-            price=product['price']
+            price=product['price'],
+            product_id=product['product_id'],
+            mall_name=product['mall_name']
         )
 
         logger.info(f"✅ 추적 시작 완료: {product['title']}")
@@ -217,72 +610,194 @@ class PriceTracker:
             'message': f"'{keyword}' 상품 추적을 시작했습니다."
         }
 
-    def list_tracked_products(self) -> List[Dict]:
+    @traced()
+    async def list_tracked_products(self) -> List[Dict]:
         """추적 중인 상품 목록 조회"""
         logger.info("📋 추적 상품 목록 조회")
-        return self.db.get_tracked_products()
-
-    def get_best_deals(self, category: Optional[str] = None, limit: int = 10) -> List[Dict]:
-        """베스트 딜 추천"""
+        return await asyncio.to_thread(self.db.get_tracked_products)
+
+    @traced()
+    async def get_best_deals(
+        self,
+        category: Optional[str] = None,
+        limit: int = 10,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> List[Dict]:
+        """
+        베스트 딜 추천
+
+        백그라운드에서 갱신된 스냅샷으로 응답하고, 스냅샷이 없거나 갱신 주기보다
+        오래됐으면 그때 계산함 (동시 요청은 한 번의 계산을 공유하며, 진행 상황은
+        계산을 시작한 요청에만 전달됨)
+        """
         logger.info(f"🏆 베스트 딜 조회 (limit: {limit})")
-        
-        # 인기 키워드 목록
-        keywords = [
-            "노트북", "무선이어폰", "스마트워치", "태블릿",
-            "키보드", "마우스", "모니터", "웹캠"
-        ]
 
-        best_deals = []
+        interval = Config.BEST_DEAL_REFRESH_INTERVAL
+        if (
+            self._best_deals_refreshed is None
+            or time.monotonic() - self._best_deals_refreshed > (interval or 0)
+        ):
+            await self._best_deals_flight.do(
+                "best_deals", lambda: self.refresh_best_deals(on_progress=on_progress)
+            )
+
+        return self.best_deals[:limit]
+
+    @traced()
+    async def refresh_best_deals(
+        self,
+        priority: int = PRIORITY_INTERACTIVE,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> List[Dict]:
+        """
+        인기 키워드를 동시에 가격 비교해 베스트 딜 스냅샷 갱신
 
-        for keyword in keywords[:limit]:
+        검색어별로 BEST_DEAL_TIMEOUT 안에 끝나지 않으면 제외하고 나머지 결과로 갱신함
+        """
+        keywords = Config.BEST_DEAL_KEYWORDS
+
+        async def compare(keyword: str) -> Optional[Dict]:
             try:
-                comparison = self.compare_prices(keyword)
-                if comparison['total_count'] > 0:
-                    best_deals.append({
-                        'keyword': keyword,
-                        'lowest_price': comparison['lowest_price'],
-                        'average_price': comparison['average_price'],
-                        'product_count': comparison['total_count'],
-                        'best_product': comparison['products'][0] if comparison['products'] else None
-                    })
+                return await asyncio.wait_for(
+                    self.compare_prices(keyword, priority=priority),
+                    timeout=Config.BEST_DEAL_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ '{keyword}' 검색 시간 초과 ({Config.BEST_DEAL_TIMEOUT:g}초)")
             except Exception as e:
                 logger.warning(f"⚠️ '{keyword}' 검색 실패: {e}")
-                continue
+            return None
+
+        async def done(completed: int, total: int, result):
+            keyword, comparison = result
+            if on_progress is not None:
+                if comparison is None:
+                    status = '실패'
+                elif comparison['total_count'] == 0:
+                    status = '결과 없음'
+                else:
+                    status = f"최저가 {comparison['lowest_price']:,}원"
+                await on_progress(completed, total, f"'{keyword}' {status} ({completed}/{total})", {
+                    keyword: {
+                        'lowest_price': comparison['lowest_price'],
+                        'average_price': comparison['average_price'],
+                        'product_count': comparison['total_count']
+                    } if comparison else None
+                })
 
-        # 가격 대비 가치 순으로 정렬
-        best_deals.sort(key=lambda x: x['lowest_price'] / max(x['average_price'], 1))
+        async def run(keyword: str):
+            return keyword, await compare(keyword)
 
-        logger.info(f"✅ {len(best_deals)}개 베스트 딜 발견")
-        return best_deals[:limit]
+        comparisons = [
+            comparison for _, comparison in
+            await gather_with_progress((run(keyword) for keyword in keywords), done)
+        ]
 
-    def check_price_alerts(self) -> List[Dict]:
-        """가격 알림 확인"""
-        logger.info("🔔 가격 알림 확인 중...")
-        
-        alerts = self.db.get_price_alerts()
-        triggered_alerts = []
+        best_deals = []
+        missing = []
+        for keyword, comparison in zip(keywords, comparisons):
+            if comparison is None:
+                missing.append(keyword)
+                continue
+            if comparison['total_count'] > 0:
+                best_deals.append({
+                    'keyword': keyword,
+                    'lowest_price': comparison['lowest_price'],
+                    'average_price': comparison['average_price'],
+                    'product_count': comparison['total_count'],
+                    'best_product': comparison['products'][0] if comparison['products'] else None
+                })
 
-        for alert in alerts:
-            keyword = alert['keyword']
-            target_price = alert['target_price']
+        # 가격 대비 가치 순으로 정렬
+        best_deals.sort(key=lambda x: x['lowest_price'] / max(x['average_price'], 1))
 
+        # 모든 검색어가 실패하면 이전 스냅샷 유지
+        if best_deals or not self.best_deals:
+            self.best_deals = best_deals
+            self.best_deals_missing = missing
+            self.best_deals_updated_at = time.time()
+        self._best_deals_refreshed = time.monotonic()
+
+        logger.info(f"✅ {len(best_deals)}개 베스트 딜 발견 (실패 {len(missing)}개)")
+        return self.best_deals
+
+    def start_best_deals_refresh(self):
+        """베스트 딜 백그라운드 갱신 시작 (BEST_DEAL_REFRESH_INTERVAL 주기)"""
+        if Config.BEST_DEAL_REFRESH_INTERVAL <= 0:
+            return
+        if self._best_deals_task is None or self._best_deals_task.done():
+            self._best_deals_task = detached_task(self._best_deals_loop())
+
+    async def _best_deals_loop(self):
+        while True:
             try:
-                products = self.search_products(keyword, count=1)
-                if products:
-                    current_price = products[0]['price']
-
-                    if current_price <= target_price:
-                        triggered_alerts.append({
-                            'alert_id': alert['id'],
-                            'keyword': keyword,
-                            'target_price': target_price,
-                            'current_price': current_price,
-                            'product': products[0],
-                            'message': f"🎉 '{keyword}'이(가) 목표가 {target_price:,}원 이하입니다! (현재가: {current_price:,}원)"
-                        })
+                await self._best_deals_flight.do(
+                    "best_deals", lambda: self.refresh_best_deals(priority=PRIORITY_BACKGROUND)
+                )
             except Exception as e:
-                logger.warning(f"⚠️ '{keyword}' 알림 확인 실패: {e}")
-                continue
+                logger.error(f"❌ 베스트 딜 갱신 실패: {type(e).__name__}: {e}", exc_info=True)
+            await asyncio.sleep(Config.BEST_DEAL_REFRESH_INTERVAL)
+
+    @traced()
+    async def check_price_alerts(self, on_progress: Optional[ProgressCallback] = None) -> List[Dict]:
+        """
+        가격 알림 확인
+
+        같은 검색어(정규화 기준)의 알림은 한 번만 조회하고, 검색어별로 동시에 확인함.
+        검색어별 목표가를 정렬해 두고 현재가 이상인 목표가를 이분 탐색으로 한 번에 찾음.
+        검색어 확인이 끝날 때마다 on_progress로 트리거된 알림을 전달함.
+        """
+        logger.info("🔔 가격 알림 확인 중...")
 
-        logger.info(f"✅ {len(triggered_alerts)}개 알림 트리거됨")
+        alerts = await asyncio.to_thread(self.db.get_price_alerts)
+
+        groups: Dict[str, List[Dict]] = {}
+        for alert in alerts:
+            groups.setdefault(normalize_query(alert['keyword']), []).append(alert)
+
+        semaphore = asyncio.Semaphore(Config.ALERT_CHECK_CONCURRENCY)
+
+        async def check(group: List[Dict]) -> List[Dict]:
+            keyword = group[0]['keyword']
+            async with semaphore:
+                try:
+                    products = await self.search_products(
+                        keyword, count=Config.ALERT_PRICE_TOP_N, priority=PRIORITY_BACKGROUND
+                    )
+                except Exception as e:
+                    logger.warning(f"⚠️ '{keyword}' 알림 확인 실패: {e}")
+                    return []
+
+            product = current_price(products, Config.ALERT_PRICE_TOP_N)
+            if product is None:
+                return []
+            price = product['price']
+
+            group.sort(key=lambda alert: alert['target_price'])
+            targets = [alert['target_price'] for alert in group]
+
+            return [
+                {
+                    'alert_id': alert['id'],
+                    'keyword': alert['keyword'],
+                    'target_price': alert['target_price'],
+                    'current_price': price,
+                    'product': product,
+                    'message': f"🎉 '{alert['keyword']}'이(가) 목표가 {alert['target_price']:,}원 이하입니다! (현재가: {price:,}원)"
+                }
+                for alert in group[bisect_left(targets, price):]
+            ]
+
+        async def done(completed: int, total: int, group_alerts: List[Dict]):
+            if on_progress is not None:
+                await on_progress(
+                    completed, total,
+                    f"알림 확인 {completed}/{total} (트리거 {len(group_alerts)}개)",
+                    {'triggered_alerts': group_alerts}
+                )
+
+        results = await gather_with_progress((check(group) for group in groups.values()), done)
+        triggered_alerts = [alert for group_alerts in results for alert in group_alerts]
+
+        logger.info(f"✅ {len(triggered_alerts)}개 알림 트리거됨 (알림 {len(alerts)}개, 검색어 {len(groups)}개)")
         return triggered_alerts
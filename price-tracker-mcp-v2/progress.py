@@ -0,0 +1,54 @@
+"""
+장시간 작업의 진행 상황 보고 (완료되는 순서대로 부분 결과 전달)
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+# (완료 수, 전체 수, 메시지, 부분 결과)
+ProgressCallback = Callable[[int, int, str, Dict], Awaitable[None]]
+
+# progress 알림 _meta에서 부분 결과를 담는 키
+PARTIAL_META_KEY = "price-tracker/partial"
+
+
+def progress_partial(params: Any) -> Optional[Dict]:
+    """
+    progress 알림 params에서 부분 결과 꺼내기 (server.progress_reporter가 _meta에 담아 보냄)
+
+    Args:
+        params: ProgressNotificationParams 또는 notifications/progress params dict
+
+    Returns:
+        부분 결과 (다른 서버의 일반 progress 알림이면 None)
+    """
+    meta = params.get("_meta") if isinstance(params, dict) else getattr(params, "meta", None)
+    return (meta or {}).get(PARTIAL_META_KEY)
+
+
+async def gather_with_progress(
+    aws: Iterable[Awaitable],
+    on_done: Optional[Callable[[int, int, Any], Awaitable[None]]] = None
+) -> List[Any]:
+    """
+    작업을 동시에 실행하고 끝나는 순서대로 on_done 호출
+
+    호출 측이 취소되면 남은 작업도 모두 취소함 (클라이언트가 요청을 취소한 경우 등)
+
+    Args:
+        aws: 실행할 코루틴 목록
+        on_done: (완료 수, 전체 수, 결과)를 받는 콜백
+
+    Returns:
+        입력 순서대로 정렬된 결과 목록
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        for done, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+            result = await next_done
+            if on_done is not None:
+                await on_done(done, len(tasks), result)
+        return [task.result() for task in tasks]
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
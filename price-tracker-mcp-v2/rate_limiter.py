@@ -0,0 +1,156 @@
+"""
+네이버 API 호출 한도 관리 (초당 토큰 버킷 + 일일 한도, 우선순위 대기열)
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 우선순위 (값이 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0   # search_product, compare_prices 등 사용자 요청
+PRIORITY_BACKGROUND = 10   # 알림 확인, 추적 갱신, 캐시 갱신
+
+# 네이버 API 일일 한도는 한국 시간 자정에 초기화됨
+KST = timezone(timedelta(hours=9))
+
+
+class QuotaExceeded(Exception):
+    """일일 호출 한도 초과"""
+
+
+class RateLimiter:
+    """초당/일일 호출 한도 관리자"""
+
+    def __init__(
+        self,
+        per_second: float = 10,
+        daily_limit: int = 25000,
+        burst: Optional[int] = None,
+        store=None
+    ):
+        """
+        Args:
+            per_second: 초당 허용 호출 수
+            daily_limit: 일일 허용 호출 수
+            burst: 순간 허용 호출 수 (기본값: per_second)
+            store: 사용량 저장소 (get_api_usage/set_api_usage 제공, 예: Database)
+        """
+        self.rate = per_second
+        self.capacity = burst or max(1, int(per_second))
+        self.daily_limit = daily_limit
+        self.store = store
+
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._save_task: Optional[asyncio.Task] = None
+
+        self.day = self._today()
+        self.used = store.get_api_usage(self.day) if store else 0
+        self.throttled = 0
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(KST).date().isoformat()
+
+    @property
+    def remaining(self) -> int:
+        """오늘 남은 호출 수"""
+        self._roll_day()
+        return max(0, self.daily_limit - self.used)
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE):
+        """
+        호출 토큰 획득 (우선순위 순으로 대기)
+
+        Raises:
+            QuotaExceeded: 일일 한도를 모두 사용한 경우
+        """
+        if self.remaining <= 0:
+            raise QuotaExceeded(f"네이버 API 일일 한도 초과 ({self.daily_limit:,}회)")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        await future
+
+    def throttle(self):
+        """업스트림이 429를 반환했을 때 토큰을 비워 잠시 대기"""
+        self._tokens = 0
+        self._updated = time.monotonic()
+        self.throttled += 1
+
+    async def _dispatch(self):
+        """토큰이 생길 때마다 우선순위가 가장 높은 대기자에게 할당"""
+        while self._waiters:
+            self._refill()
+
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():  # 대기 중 취소됨
+                continue
+
+            if self.remaining <= 0:
+                future.set_exception(
+                    QuotaExceeded(f"네이버 API 일일 한도 초과 ({self.daily_limit:,}회)")
+                )
+                continue
+
+            self._tokens -= 1
+            self.used += 1
+            future.set_result(None)
+            self._schedule_save()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _roll_day(self):
+        today = self._today()
+        if today != self.day:
+            logger.info(f"📅 API 사용량 초기화 ({self.day}: {self.used:,}회)")
+            self.day = today
+            self.used = 0
+
+    def _schedule_save(self):
+        """사용량 저장 (진행 중인 저장이 있으면 끝난 뒤 최신 값으로 한 번 더)"""
+        if self.store is None:
+            return
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._save())
+
+    async def _save(self):
+        saved = None
+        while saved != (self.day, self.used):
+            saved = (self.day, self.used)
+            try:
+                await asyncio.to_thread(self.store.set_api_usage, *saved)
+            except Exception as e:
+                logger.warning(f"⚠️ API 사용량 저장 실패: {e}")
+                return
+
+    def stats(self) -> Dict:
+        """한도 사용 현황"""
+        return {
+            "day": self.day,
+            "used": self.used,
+            "remaining": self.remaining,
+            "daily_limit": self.daily_limit,
+            "per_second": self.rate,
+            "queued": len(self._waiters),
+            "throttled": self.throttled
+        }
@@ -0,0 +1,170 @@
+"""
+도구 응답 크기 최적화 (필드 선택, 컬럼형 히스토리, 응답 크기 제한)
+"""
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 상품 목록 필드 (PriceTracker._to_product)
+PRODUCT_FIELDS = (
+    "platform", "title", "price", "product_id", "mall_name",
+    "link", "image", "brand", "maker", "category"
+)
+
+# 히스토리에서 행마다 반복되는 문자열 컬럼 (사전 인덱스로 인코딩)
+HISTORY_DICTIONARY_FIELDS = ("product_name", "platform")
+
+# 조회 단위별 히스토리 기록 필드
+RAW_HISTORY_FIELDS = ("product_name", "platform", "price", "created_at", "last_seen", "observations")
+ROLLUP_HISTORY_FIELDS = (
+    "product_name", "platform", "date", "open_price", "close_price",
+    "min_price", "max_price", "average_price", "count"
+)
+# 롤업(daily/weekly) 조회에서 원본 필드 이름으로 요청하면 대응하는 롤업 컬럼 값을 그 이름으로 반환
+ROLLUP_FIELD_ALIASES = {"price": "close_price", "created_at": "date", "observations": "count"}
+
+
+def json_size(value: Any) -> int:
+    """JSON 직렬화 시 바이트 크기 (공백 없는 UTF-8 기준)"""
+    return len(json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def project(items: List[Dict], fields: Optional[List[str]]) -> List[Dict]:
+    """
+    상품별로 지정한 필드만 남김 (결과가 없어도 필드를 검사함)
+
+    Args:
+        items: 상품 목록
+        fields: 남길 필드 목록 (None이나 빈 목록이면 전체)
+
+    Raises:
+        ValueError: PRODUCT_FIELDS에 없는 필드를 지정한 경우
+    """
+    if not fields:
+        return items
+
+    unknown = [f for f in fields if f not in PRODUCT_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"지원하지 않는 필드: {', '.join(unknown)} (사용 가능: {', '.join(PRODUCT_FIELDS)})"
+        )
+
+    return [{f: item[f] for f in fields if f in item} for item in items]
+
+
+def history_fields(resolution: str) -> Tuple[str, ...]:
+    """조회 단위(raw, daily, weekly)에서 fields로 지정할 수 있는 필드"""
+    if resolution == "raw":
+        return RAW_HISTORY_FIELDS
+    return ROLLUP_HISTORY_FIELDS + tuple(ROLLUP_FIELD_ALIASES)
+
+
+def project_history(history: List[Dict], fields: Optional[List[str]], resolution: str) -> List[Dict]:
+    """
+    가격 히스토리에서 지정한 필드만 남김 (기록이 없어도 필드를 검사함)
+
+    롤업 조회에서 price/created_at을 지정하면 close_price/date 값을 그 이름으로 반환하므로
+    기간에 따라 조회 단위가 바뀌어도 같은 fields를 쓸 수 있음
+
+    Raises:
+        ValueError: 조회 단위에 없는 필드를 지정한 경우 (사용 가능한 필드 포함)
+    """
+    if not fields:
+        return history
+
+    available = history_fields(resolution)
+    unknown = [f for f in fields if f not in available]
+    if unknown:
+        raise ValueError(
+            f"{resolution} 히스토리에서 지원하지 않는 필드: {', '.join(unknown)} "
+            f"(사용 가능: {', '.join(available)})"
+        )
+
+    if resolution == "raw":
+        return [{f: item[f] for f in fields} for item in history]
+    sources = [(f, ROLLUP_FIELD_ALIASES.get(f, f)) for f in fields]
+    return [{f: item[source] for f, source in sources} for item in history]
+
+
+def to_columnar(rows: List[Dict], dictionary_fields: Iterable[str] = HISTORY_DICTIONARY_FIELDS) -> Dict:
+    """
+    행 목록을 컬럼형으로 변환
+
+    컬럼별 값 배열로 바꾸고, 반복되는 문자열 컬럼은 공유 사전의 인덱스로 저장함.
+    i번째 행은 columns[c][i] (사전 컬럼이면 dictionaries[c][columns[c][i]])
+
+    Returns:
+        {"format": "columnar", "count", "columns", "dictionaries"}
+    """
+    names = list(rows[0].keys()) if rows else []
+    dictionary_fields = [f for f in dictionary_fields if f in names]
+
+    columns: Dict[str, List] = {name: [] for name in names}
+    dictionaries: Dict[str, List[str]] = {f: [] for f in dictionary_fields}
+    indexes: Dict[str, Dict[str, int]] = {f: {} for f in dictionary_fields}
+
+    for row in rows:
+        for name in names:
+            value = row.get(name)
+            index = indexes.get(name)
+            if index is not None:
+                position = index.get(value)
+                if position is None:
+                    position = index[value] = len(dictionaries[name])
+                    dictionaries[name].append(value)
+                value = position
+            columns[name].append(value)
+
+    return {
+        "format": "columnar",
+        "count": len(rows),
+        "columns": columns,
+        "dictionaries": dictionaries
+    }
+
+
+def cap_response(response: Dict, key: str, max_bytes: int) -> Dict:
+    """
+    응답이 max_bytes를 넘으면 response[key]의 뒤쪽 항목을 잘라 크기 제한
+
+    response[key]는 목록 또는 to_columnar() 결과. 잘린 경우 truncated=True와
+    returned_count(남은 항목 수)를 추가함.
+    """
+    if not max_bytes or json_size(response) <= max_bytes:
+        return response
+
+    value = response[key]
+    columnar = isinstance(value, dict) and value.get("format") == "columnar"
+
+    if columnar:
+        count = value["count"]
+        empty = {**value, "count": 0, "columns": {name: [] for name in value["columns"]}}
+        # 행 크기 = 컬럼별 값 크기 + 구분자(,)
+        sizes = [
+            sum(json_size(column[i]) + 1 for column in value["columns"].values())
+            for i in range(count)
+        ]
+    else:
+        count = len(value)
+        empty = []
+        sizes = [json_size(item) + 1 for item in value]
+
+    # 잘린 응답에 추가될 필드 크기까지 고려
+    budget = max_bytes - json_size({**response, key: empty, "truncated": True, "returned_count": count})
+
+    keep = 0
+    for size in sizes:
+        if size > budget:
+            break
+        budget -= size
+        keep += 1
+
+    if columnar:
+        trimmed = {
+            **value,
+            "count": keep,
+            "columns": {name: column[:keep] for name, column in value["columns"].items()}
+        }
+    else:
+        trimmed = value[:keep]
+
+    return {**response, key: trimmed, "truncated": True, "returned_count": keep}
@@ -0,0 +1,371 @@
+"""
+추적 상품 백그라운드 갱신 스케줄러 (가격 변동성 기반 적응형 주기)
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from metrics import (
+    SCHEDULER_CYCLES, SCHEDULER_FAILURES, SCHEDULER_KEYWORDS_REFRESHED, SCHEDULER_RECORDS_WRITTEN
+)
+from naver_api import normalize_query
+from rate_limiter import PRIORITY_BACKGROUND
+from tracing import detached_task
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 86400
+RETRY_BASE_DELAY = 1.0  # 갱신 실패 후 첫 재시도 대기 (초, 실패가 이어지면 두 배씩 최소 주기까지)
+
+
+def adaptive_interval(
+    changes: int,
+    window_seconds: float,
+    since_last_change: Optional[float],
+    alert_distance: Optional[float],
+    min_interval: float,
+    max_interval: float
+) -> float:
+    """
+    가격 변동 특성으로 다음 조회까지의 간격 계산
+
+    Args:
+        changes: 관측 기간 동안의 가격 변경 횟수
+        window_seconds: 관측 기간 (초)
+        since_last_change: 마지막 가격 변경 후 경과 시간 (초, 없으면 None)
+        alert_distance: 현재가와 가장 가까운 알림 목표가의 거리 비율 (0이면 도달, 없으면 None)
+        min_interval: 최소 간격 (초)
+        max_interval: 최대 간격 (초)
+
+    Returns:
+        조회 간격 (초)
+    """
+    candidates = [max_interval]
+
+    # 평균 변경 간격의 절반마다 조회 (변경을 놓치지 않도록)
+    if changes:
+        candidates.append(window_seconds / changes / 2)
+
+    # 최근에 바뀐 상품은 다시 바뀔 가능성이 높음 (타임세일 등)
+    if since_last_change is not None:
+        candidates.append(since_last_change / 2)
+
+    # 목표가에 가까울수록 자주 조회 (거리 50% 이상이면 최대 간격)
+    if alert_distance is not None:
+        candidates.append(min_interval + min(alert_distance * 2, 1.0) * (max_interval - min_interval))
+
+    return max(min_interval, min(candidates))
+
+
+class TrackingScheduler:
+    """
+    추적 중인 상품의 가격을 검색어별 주기로 갱신
+
+    같은 검색어를 쓰는 추적 상품은 한 번의 검색으로 함께 갱신하고, 다음 조회 시각 순의
+    우선순위 큐에서 꺼내 처리함. 주기는 가격 변동성, 알림 목표가와의 거리, 마지막 변경
+    시점으로 정하며, 전체 호출량이 일일 예산을 넘으면 모든 주기를 같은 비율로 늘림.
+    """
+
+    def __init__(
+        self,
+        tracker,
+        interval: float = 3600,
+        min_interval: float = 300,
+        max_interval: float = 21600,
+        concurrency: int = 4,
+        jitter: float = 0.1,
+        refresh_count: int = 10,
+        batch_size: int = 500,
+        daily_budget: int = 12500,
+        volatility_days: int = 7
+    ):
+        """
+        Args:
+            tracker: PriceTracker 인스턴스
+            interval: 기록이 없는 검색어의 기본 갱신 주기 (초)
+            min_interval: 최소 갱신 주기 (초)
+            max_interval: 최대 갱신 주기 (초)
+            concurrency: 동시에 갱신할 검색어 수
+            jitter: 주기 흔들림 비율 (0.1이면 ±10%)
+            refresh_count: 검색어당 조회할 상품 수 (추적 상품을 productId로 찾기 위함)
+            batch_size: DB 기록 배치 크기
+            daily_budget: 추적 갱신에 쓸 일일 API 호출 수
+            volatility_days: 가격 변동성 계산 기간 (일)
+        """
+        self.tracker = tracker
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.concurrency = concurrency
+        self.jitter = jitter
+        self.refresh_count = refresh_count
+        self.batch_size = batch_size
+        self.daily_budget = daily_budget
+        self.volatility_days = volatility_days
+
+        self._task: Optional[asyncio.Task] = None
+        self._heap: List[Tuple[float, int, str]] = []  # (다음 조회 시각, 순번, 검색어)
+        self._seq = itertools.count()
+        self._groups: Dict[str, List[Dict]] = {}
+        self._targets: Dict[str, List[int]] = {}
+        self._intervals: Dict[str, float] = {}
+        self._calls_per_day = 0.0  # 현재 주기대로라면 하루 호출 수
+        self._synced_at: Optional[float] = None  # 아직 읽지 않았으면 None (시작하자마자 읽음)
+        self._failure_streak = 0
+        self._cycle_lock = asyncio.Lock()  # 큐를 읽고 바꾸는 갱신 주기와 refresh_all이 겹치지 않도록
+
+        self.cycles = 0
+        self.keywords_refreshed = 0
+        self.records_written = 0
+        self.failures = 0
+        self.last_cycle_keywords = 0
+        self.last_cycle_seconds = 0.0
+        self.next_run_at: Optional[float] = None
+
+    def start(self):
+        """백그라운드 갱신 시작"""
+        if self._task is None or self._task.done():
+            self._task = detached_task(self._run())
+            logger.info(
+                f"⏰ 추적 갱신 스케줄러 시작 (주기 {self.min_interval:.0f}~{self.max_interval:.0f}초, "
+                f"동시 {self.concurrency}개)"
+            )
+
+    async def stop(self):
+        """백그라운드 갱신 중지"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                async with self._cycle_lock:
+                    if self._synced_at is None or time.monotonic() - self._synced_at >= self.min_interval:
+                        await self._sync()
+
+                    due = self._pop_due(time.monotonic())
+                    if due:
+                        await self._refresh(due)
+                self._failure_streak = 0
+                if due:
+                    continue
+            except Exception as e:
+                self.failures += 1
+                SCHEDULER_FAILURES.inc()
+                logger.error(f"❌ 추적 갱신 실패: {type(e).__name__}: {e}", exc_info=True)
+
+                # 실패가 이어지면 재시도 간격을 늘림 (곧바로 다시 돌며 로그만 쌓지 않도록)
+                delay = min(self.min_interval, RETRY_BASE_DELAY * 2 ** self._failure_streak)
+                self._failure_streak += 1
+                self.next_run_at = time.time() + delay
+                await asyncio.sleep(delay)
+                continue
+
+            wake_at = self._synced_at + self.min_interval
+            if self._heap:
+                wake_at = min(wake_at, self._heap[0][0])
+            delay = max(0.0, wake_at - time.monotonic())
+            self.next_run_at = time.time() + delay
+            await asyncio.sleep(delay)
+
+    async def _sync(self):
+        """추적 상품/알림 목록을 다시 읽어 큐에 반영 (새 검색어는 즉시 조회)"""
+        tracked, alerts = await asyncio.gather(
+            asyncio.to_thread(self.tracker.db.get_tracked_products),
+            asyncio.to_thread(self.tracker.db.get_price_alerts)
+        )
+
+        groups: Dict[str, List[Dict]] = {}
+        for item in tracked:
+            groups.setdefault(normalize_query(item['keyword']), []).append(item)
+
+        targets: Dict[str, List[int]] = {}
+        for alert in alerts:
+            targets.setdefault(normalize_query(alert['keyword']), []).append(alert['target_price'])
+
+        now = time.monotonic()
+        for key in groups.keys() - self._groups.keys():
+            heapq.heappush(self._heap, (now, next(self._seq), key))
+        for key in self._groups.keys() - groups.keys():
+            self._set_interval(key, None)
+
+        self._groups = groups
+        self._targets = targets
+        self._synced_at = now
+
+    def _pop_due(self, now: float) -> List[str]:
+        """조회 시각이 된 검색어 꺼내기 (추적이 끝난 검색어는 버림)"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, key = heapq.heappop(self._heap)
+            if key in self._groups:
+                due.append(key)
+        return due
+
+    async def refresh_all(self) -> int:
+        """
+        추적 중인 모든 검색어를 즉시 갱신 (진행 중인 갱신 주기가 끝난 뒤 큐를 비우고 다시 예약)
+
+        Returns:
+            갱신한 검색어 수
+        """
+        async with self._cycle_lock:
+            await self._sync()
+            keys = list(self._groups)
+            self._heap = []
+            await self._refresh(keys)
+        return len(keys)
+
+    async def _refresh(self, keys: List[str]):
+        """검색어들을 동시에 갱신하고 기록을 배치로 저장한 뒤 다음 조회 시각 예약"""
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def refresh(key: str) -> Tuple[List[Dict], List[int]]:
+            async with semaphore:
+                try:
+                    return await self._refresh_group(key, self._groups[key])
+                except Exception as e:
+                    self.failures += 1
+                    SCHEDULER_FAILURES.inc()
+                    logger.warning(f"⚠️ '{key}' 추적 갱신 실패: {e}")
+                    return [], []
+
+        results = await asyncio.gather(*(refresh(key) for key in keys))
+        records = [record for group_records, _ in results for record in group_records]
+
+        try:
+            for i in range(0, len(records), self.batch_size):
+                await asyncio.to_thread(self.tracker.db.add_price_records, records[i:i + self.batch_size])
+        except Exception as e:
+            self.failures += 1
+            SCHEDULER_FAILURES.inc()
+            logger.error(f"❌ 추적 갱신 기록 저장 실패: {e}")
+
+        window = self.volatility_days * DAY_SECONDS
+        since = datetime.now(timezone.utc) - timedelta(seconds=window)
+        try:
+            # 이번 주기의 검색어 통계를 한 번의 쿼리로 조회
+            stats = await asyncio.to_thread(
+                self.tracker.db.get_price_change_stats_by_group,
+                {key: [item['keyword'] for item in self._groups[key]] for key in keys if key in self._groups},
+                since.strftime('%Y-%m-%d %H:%M:%S')
+            )
+        except Exception as e:
+            # 통계 조회에 실패해도 검색어가 큐에서 빠지지 않도록 변동 없음으로 예약
+            logger.warning(f"⚠️ 다음 조회 예약용 가격 변동 통계 조회 실패: {e}")
+            stats = {}
+
+        for key, (_, prices) in zip(keys, results):
+            self._schedule_next(key, prices, stats.get(key), window)
+
+        elapsed = time.monotonic() - started
+        self.cycles += 1
+        self.keywords_refreshed += len(keys)
+        self.records_written += len(records)
+        SCHEDULER_CYCLES.inc()
+        SCHEDULER_KEYWORDS_REFRESHED.inc(len(keys))
+        SCHEDULER_RECORDS_WRITTEN.inc(len(records))
+        self.last_cycle_keywords = len(keys)
+        self.last_cycle_seconds = elapsed
+
+        logger.info(f"⏰ 추적 갱신 완료: 검색어 {len(keys)}개, 기록 {len(records)}개 ({elapsed:.1f}초)")
+
+    async def _refresh_group(self, keyword: str, items: List[Dict]) -> Tuple[List[Dict], List[int]]:
+        """한 검색어를 조회해 해당 검색어의 추적 상품별 가격 기록 생성 (저장은 _refresh에서 일괄로)"""
+        products = await self.tracker.search_products(
+            keyword, count=self.refresh_count, priority=PRIORITY_BACKGROUND, record=False
+        )
+        if not products:
+            return [], []
+
+        by_id = {p['product_id']: p for p in products if p.get('product_id')}
+        records = {}
+        for item in items:
+            # productId로 같은 상품을 찾고, 없으면 추적 시작 때처럼 첫 번째 결과 사용
+            product = by_id.get(item.get('product_id')) or products[0]
+            records[product['product_id'] or product['title']] = {
+                'product_name': product['title'],
+                'platform': product['platform'],
+                'price': product['price'],
+                'product_id': product['product_id'],
+                'mall_name': product['mall_name']
+            }
+        return list(records.values()), [r['price'] for r in records.values()]
+
+    def _schedule_next(self, key: str, prices: List[int], stats: Optional[Dict], window: float):
+        """
+        이번 갱신에서 조회한 가격과 가격 변동 통계로 다음 조회 간격을 정해 큐에 다시 넣기
+
+        Args:
+            key: 정규화된 검색어
+            prices: 이번 갱신에서 조회한 추적 상품 가격
+            stats: get_price_change_stats_by_group()의 이 검색어 통계 (조회 실패 시 None - 변동 없음으로 취급)
+            window: 통계 기간 (초)
+        """
+        if key not in self._groups:
+            return
+
+        since_last_change = None
+        if stats and stats['last_change_at']:
+            last_change = datetime.strptime(stats['last_change_at'], '%Y-%m-%d %H:%M:%S')
+            since_last_change = (datetime.now(timezone.utc).replace(tzinfo=None) - last_change).total_seconds()
+
+        alert_distance = None
+        if prices and self._targets.get(key):
+            price = min(prices)
+            alert_distance = min(max(0.0, (price - t) / max(t, 1)) for t in self._targets[key])
+
+        changes = stats['changes'] if stats else 0
+        if changes or since_last_change is not None or alert_distance is not None:
+            interval = adaptive_interval(
+                changes, window, since_last_change, alert_distance,
+                self.min_interval, self.max_interval
+            )
+        else:
+            interval = self.interval
+
+        self._set_interval(key, interval)
+
+        # 전체 호출량이 예산을 넘으면 모든 주기를 같은 비율로 늘림
+        scale = max(1.0, self._calls_per_day / self.daily_budget) if self.daily_budget else 1.0
+        delay = interval * scale * (1 + random.uniform(-self.jitter, self.jitter))
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), key))
+
+    def _set_interval(self, key: str, interval: Optional[float]):
+        """검색어 주기 갱신 (하루 예상 호출 수 유지)"""
+        old = self._intervals.pop(key, None)
+        if old:
+            self._calls_per_day -= DAY_SECONDS / old
+        if interval:
+            self._intervals[key] = interval
+            self._calls_per_day += DAY_SECONDS / interval
+
+    def stats(self) -> Dict:
+        """스케줄러 처리량 통계"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "cycles": self.cycles,
+            "keywords_refreshed": self.keywords_refreshed,
+            "records_written": self.records_written,
+            "failures": self.failures,
+            "last_cycle_keywords": self.last_cycle_keywords,
+            "last_cycle_seconds": round(self.last_cycle_seconds, 3),
+            "keywords_per_second": round(self.last_cycle_keywords / self.last_cycle_seconds, 2)
+            if self.last_cycle_seconds else 0.0,
+            "queue_depth": len(self._heap),
+            "tracked_keywords": len(self._groups),
+            "planned_calls_per_day": round(self._calls_per_day),
+            "next_run_at": self.next_run_at
+        }
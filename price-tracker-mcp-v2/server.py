@@ -1,25 +1,230 @@
 """
 Price Tracker MCP Server - 네이버 쇼핑 전용
 """
-from fastmcp import FastMCP
-from price_tracker import PriceTracker
+import asyncio
+import logging
+import signal
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+from fastmcp import Context, FastMCP
+from fastmcp.server.middleware import Middleware
+from mcp.types import ProgressNotification, ProgressNotificationParams
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from progress import PARTIAL_META_KEY, ProgressCallback
+from response import cap_response, project, project_history, to_columnar
+from metrics import CONTENT_TYPE, REGISTRY, TOOL_CALLS, TOOL_DURATION, observe_stats
+from tracing import PROFILER, TRACER, start_trace
 from config import Config
 
+if TYPE_CHECKING:
+    from price_tracker import PriceTracker
+
+logger = logging.getLogger(__name__)
+
 # MCP 서버 초기화
 mcp = FastMCP("Price Tracker - 네이버 쇼핑")
 
-# PriceTracker 인스턴스
-tracker = PriceTracker()
+# 트레이싱 / 프로파일러 (선택, 기본 꺼짐)
+TRACER.configure(
+    enabled=Config.TRACING_ENABLED,
+    sample_rate=Config.TRACE_SAMPLE_RATE,
+    export_path=Config.TRACE_EXPORT_PATH
+)
+PROFILER.configure(Config.PROFILE_SAMPLE_RATE, Config.PROFILE_INTERVAL_MS)
+
+# PriceTracker 인스턴스 (첫 사용 시 생성)
+# DB 열기/마이그레이션, 알림 로드가 서버 바인딩을 늦추지 않도록 import 시점에 만들지 않음
+_tracker: Optional["PriceTracker"] = None
+_tracker_init: Optional[asyncio.Future] = None
+_tracker_error: Optional[str] = None
+_tracker_init_seconds: Optional[float] = None
+
+
+def _create_tracker() -> "PriceTracker":
+    """PriceTracker 생성 (작업 스레드에서 실행, price_tracker 모듈 import 포함)"""
+    global _tracker_init_seconds
+    started = time.perf_counter()
+    from price_tracker import PriceTracker
+    tracker = PriceTracker()
+    _tracker_init_seconds = time.perf_counter() - started
+    logger.info(f"✅ PriceTracker 준비 완료 ({_tracker_init_seconds:.2f}초)")
+    return tracker
+
+
+async def get_tracker() -> "PriceTracker":
+    """
+    PriceTracker 반환
+
+    처음 호출되면 작업 스레드에서 생성하고, 생성 중에 들어온 호출은 같은 생성을
+    기다림. 생성에 실패하면 다음 호출에서 다시 시도함. 처음 생성에 성공한 호출이
+    백그라운드 작업(추적 갱신 스케줄러, 베스트 딜 갱신)을 한 번만 시작함.
+    """
+    global _tracker, _tracker_init, _tracker_error
+    if _tracker is not None:
+        return _tracker
+
+    if _tracker_init is None or (_tracker_init.done() and (_tracker_init.cancelled() or _tracker_init.exception())):
+        _tracker_init = asyncio.ensure_future(asyncio.to_thread(_create_tracker))
+
+    try:
+        # 기다리던 도구 호출이 취소돼도 생성은 계속
+        tracker = await asyncio.shield(_tracker_init)
+    except Exception as e:
+        _tracker_error = f"{type(e).__name__}: {e}"
+        raise
+    if _tracker is None:
+        _tracker, _tracker_error = tracker, None
+        _start_background(tracker)
+    return _tracker
+
+
+def _start_background(tracker: "PriceTracker"):
+    """PriceTracker 백그라운드 작업 시작"""
+    if Config.TRACK_REFRESH_ENABLED:
+        tracker.scheduler.start()
+    tracker.start_best_deals_refresh()
+
+
+def tool_failed(result) -> bool:
+    """도구 결과가 오류이거나 success=False 응답인지 확인"""
+    content = result.structured_content
+    if isinstance(content, dict) and "result" in content and "success" not in content:
+        content = content["result"]
+    return result.is_error or (isinstance(content, dict) and content.get("success") is False)
+
+
+class MetricsMiddleware(Middleware):
+    """
+    도구별 호출 수와 실행 시간 기록 (status: ok, failure=success:false 응답, error=예외)
+
+    등록되지 않은 도구 이름은 모두 tool="unknown"으로 기록 (클라이언트가 보낸 임의의
+    이름마다 새 시계열이 생기지 않도록)
+    """
+
+    async def on_call_tool(self, context, call_next):
+        tool = context.message.name
+        if await mcp.get_tool(tool) is None:
+            tool = "unknown"
+        started = time.perf_counter()
+        status = "error"
+        try:
+            result = await call_next(context)
+            status = "failure" if tool_failed(result) else "ok"
+            return result
+        finally:
+            TOOL_DURATION.labels(tool).observe(time.perf_counter() - started)
+            TOOL_CALLS.labels(tool, status).inc()
+
+
+class TracingMiddleware(Middleware):
+    """도구 호출마다 루트 span 시작 (샘플링), 일부 호출은 샘플링 프로파일러로 기록"""
+
+    async def on_call_tool(self, context, call_next):
+        tool = context.message.name
+        profiled = PROFILER.should_sample()
+        if profiled:
+            PROFILER.begin(tool)
+        try:
+            with start_trace(f"tool {tool}", tool=tool, profiled=profiled) as root:
+                result = await call_next(context)
+                if root is not None and tool_failed(result):
+                    root.set_error("success=false")
+                return result
+        finally:
+            if profiled:
+                PROFILER.end(tool)
+
+
+def progress_reporter(
+    ctx: Optional[Context],
+    shape: Optional[Callable[[Dict, int], Dict]] = None
+) -> Optional[ProgressCallback]:
+    """
+    진행 상황을 MCP 알림으로 전달하는 콜백 생성
+
+    진행률과 진행 문구는 progress 알림(notifications/progress)의 progress/total/message로,
+    항목별 부분 결과는 같은 알림의 _meta[PARTIAL_META_KEY]로 보내 클라이언트가 전체
+    작업이 끝나기 전에 결과를 받을 수 있게 함 (progress.progress_partial로 꺼냄).
+    요청에 progressToken이 없으면 보내지 않음
+
+    Args:
+        ctx: 도구 호출 Context
+        shape: (부분 결과, 전체 수)를 받아 보낼 부분 결과로 바꾸는 함수 (필드 선택, 크기 제한 등)
+    """
+    if ctx is None or ctx.request_context is None:
+        return None
+    token = (ctx.request_context.meta or {}).get("progressToken")
+    if token is None:
+        return None
+
+    async def report(done: int, total: int, message: str, partial: Dict):
+        try:
+            if shape is not None:
+                partial = shape(partial, total)
+            await ctx.session.send_notification(
+                ProgressNotification(params=ProgressNotificationParams(
+                    progress_token=token, progress=done, total=total, message=message,
+                    _meta={PARTIAL_META_KEY: partial}
+                )),
+                related_request_id=ctx.request_id
+            )
+        except Exception as e:
+            # 알림 전송 실패가 도구 실행을 중단시키지 않도록 함
+            logger.debug(f"진행 상황 전송 실패: {e}")
+
+    return report
+
+
+def batch_search_entry(keyword: str, item: Dict, fields: Optional[List[str]], max_bytes: int) -> Dict:
+    """batch_search 검색어별 응답 (필드 선택, 크기 제한 적용)"""
+    if 'error' in item:
+        return {"success": False, "error": item['error']}
+    return cap_response({
+        "success": True,
+        "total_count": len(item['result']),
+        "products": project(item['result'], fields)
+    }, "products", max_bytes)
+
+
+def batch_compare_entry(keyword: str, item: Dict, fields: Optional[List[str]], max_bytes: int) -> Dict:
+    """batch_compare 검색어별 응답 (필드 선택, 크기 제한 적용)"""
+    if 'error' in item:
+        return {"success": False, "error": item['error']}
+
+    result = item['result']
+    if result['total_count'] == 0:
+        return {"success": False, "error": f"'{keyword}' 상품을 찾을 수 없습니다."}
+
+    return cap_response({
+        "success": True,
+        "statistics": {
+            "total_count": result['total_count'],
+            "lowest_price": result['lowest_price'],
+            "highest_price": result['highest_price'],
+            "average_price": result['average_price']
+        },
+        "top_products": project(result['products'], fields)
+    }, "top_products", max_bytes)
+
+
+def batch_progress_shape(entry, fields: Optional[List[str]]) -> Callable[[Dict, int], Dict]:
+    """일괄 도구의 부분 결과를 최종 응답과 같은 검색어별 응답으로 변환하는 함수"""
+    def shape(partial: Dict, total: int) -> Dict:
+        max_bytes = Config.RESPONSE_MAX_BYTES // max(total, 1)
+        return {keyword: entry(keyword, item, fields, max_bytes) for keyword, item in partial.items()}
+    return shape
 
 
 @mcp.tool()
-def search_product(keyword: str, count: int = 10) -> dict:
+async def search_product(keyword: str, count: int = 10, fields: Optional[List[str]] = None) -> dict:
     """
     네이버 쇼핑에서 상품 검색
     
     Args:
         keyword: 검색할 상품 키워드 (예: "무선이어폰", "노트북")
         count: 검색 결과 개수 (기본 10개, 최대 100개)
+        fields: 반환할 상품 필드 (예: ["title", "price", "link"], 기본 전체)
     
     Returns:
         상품 목록 및 검색 결과
@@ -27,17 +232,19 @@ def search_product(keyword: str, count: int = 10) -> dict:
     Example:
         search_product("에어팟 프로")
         search_product("삼성 갤럭시북", count=20)
+        search_product("노트북", fields=["title", "price"])
     """
     try:
-        products = tracker.search_products(keyword, count)
+        tracker = await get_tracker()
+        products = await tracker.search_products(keyword, count)
         
-        return {
+        return cap_response({
             "success": True,
             "keyword": keyword,
             "total_count": len(products),
-            "products": products,
+            "products": project(products, fields),
             "message": f"'{keyword}' 검색 완료: {len(products)}개 상품 발견"
-        }
+        }, "products", Config.RESPONSE_MAX_BYTES)
     except Exception as e:
         return {
             "success": False,
@@ -47,12 +254,19 @@ def search_product(keyword: str, count: int = 10) -> dict:
 
 
 @mcp.tool()
-def compare_prices(keyword: str) -> dict:
+async def compare_prices(
+    keyword: str,
+    deep: bool = False,
+    fields: Optional[List[str]] = None,
+    ctx: Context = None
+) -> dict:
     """
     상품 가격 비교 및 최저가 찾기
     
     Args:
         keyword: 검색할 상품 키워드
+        deep: 여러 페이지(최대 1000개)를 가격순/정확도순으로 비교 (기본 False)
+        fields: 반환할 상품 필드 (예: ["title", "price", "link"], 기본 전체)
     
     Returns:
         최저가, 최고가, 평균가 및 상위 10개 상품 정보
@@ -60,9 +274,11 @@ def compare_prices(keyword: str) -> dict:
     Example:
         compare_prices("아이폰 15")
         compare_prices("LG 그램")
+        compare_prices("무선이어폰", deep=True)
     """
     try:
-        result = tracker.compare_prices(keyword)
+        tracker = await get_tracker()
+        result = await tracker.compare_prices(keyword, deep=deep, on_progress=progress_reporter(ctx))
         
         if result['total_count'] == 0:
             return {
@@ -70,7 +286,7 @@ def compare_prices(keyword: str) -> dict:
                 "message": f"'{keyword}' 상품을 찾을 수 없습니다."
             }
         
-        return {
+        return cap_response({
             "success": True,
             "keyword": result['keyword'],
             "statistics": {
@@ -79,9 +295,14 @@ def compare_prices(keyword: str) -> dict:
                 "highest_price": result['highest_price'],
                 "average_price": result['average_price']
             },
-            "top_products": result['products'],
+            "top_products": project(result['products'], fields),
+            **({
+                "pages_fetched": result['pages_fetched'],
+                "total_available": result['total_available'],
+                "partial": result['partial']
+            } if deep else {}),
             "message": f"최저가: {result['lowest_price']:,}원 | 평균가: {result['average_price']:,}원"
-        }
+        }, "top_products", Config.RESPONSE_MAX_BYTES)
     except Exception as e:
         return {
             "success": False,
@@ -91,7 +312,97 @@ def compare_prices(keyword: str) -> dict:
 
 
 @mcp.tool()
-def set_price_alert(keyword: str, target_price: int) -> dict:
+async def batch_search(
+    keywords: List[str],
+    count: int = 10,
+    fields: Optional[List[str]] = None,
+    ctx: Context = None
+) -> dict:
+    """
+    여러 상품 한 번에 검색 (쇼핑 목록 등)
+    
+    Args:
+        keywords: 검색할 상품 키워드 목록 (최대 20개)
+        count: 키워드별 검색 결과 개수 (기본 10개)
+        fields: 반환할 상품 필드 (예: ["title", "price"], 기본 전체)
+    
+    Returns:
+        키워드별 상품 목록 (실패한 키워드는 error 포함)
+    
+    Example:
+        batch_search(["무선이어폰", "키보드", "마우스"])
+    """
+    try:
+        tracker = await get_tracker()
+        on_progress = progress_reporter(ctx, batch_progress_shape(batch_search_entry, fields))
+        batch = await tracker.batch_search(keywords, count, on_progress=on_progress)
+        
+        # 응답 크기 제한은 키워드별로 나눠서 적용
+        max_bytes = Config.RESPONSE_MAX_BYTES // max(len(batch), 1)
+        results = {
+            keyword: batch_search_entry(keyword, item, fields, max_bytes) for keyword, item in batch.items()
+        }
+        
+        succeeded = sum(1 for r in results.values() if r['success'])
+        return {
+            "success": True,
+            "results": results,
+            "message": f"{len(results)}개 키워드 검색 완료 (실패 {len(results) - succeeded}개)"
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"일괄 검색 실패: {str(e)}"
+        }
+
+
+@mcp.tool()
+async def batch_compare(
+    keywords: List[str],
+    deep: bool = False,
+    fields: Optional[List[str]] = None,
+    ctx: Context = None
+) -> dict:
+    """
+    여러 상품 가격 한 번에 비교
+    
+    Args:
+        keywords: 비교할 상품 키워드 목록 (최대 20개)
+        deep: 여러 페이지를 가격순/정확도순으로 비교 (기본 False)
+        fields: 반환할 상품 필드 (예: ["title", "price"], 기본 전체)
+    
+    Returns:
+        키워드별 최저가, 최고가, 평균가 및 상위 상품 (실패한 키워드는 error 포함)
+    
+    Example:
+        batch_compare(["아이폰 15", "갤럭시 S24"])
+    """
+    try:
+        tracker = await get_tracker()
+        on_progress = progress_reporter(ctx, batch_progress_shape(batch_compare_entry, fields))
+        batch = await tracker.batch_compare(keywords, deep=deep, on_progress=on_progress)
+        
+        max_bytes = Config.RESPONSE_MAX_BYTES // max(len(batch), 1)
+        results = {
+            keyword: batch_compare_entry(keyword, item, fields, max_bytes) for keyword, item in batch.items()
+        }
+        
+        succeeded = sum(1 for r in results.values() if r['success'])
+        return {
+            "success": True,
+            "results": results,
+            "message": f"{len(results)}개 키워드 비교 완료 (실패 {len(results) - succeeded}개)"
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"일괄 비교 실패: {str(e)}"
+        }
+
+@mcp.tool()
+async def set_price_alert(keyword: str, target_price: int) -> dict:
     """
     상품 가격 알림 설정
     
@@ -107,7 +418,8 @@ def set_price_alert(keyword: str, target_price: int) -> dict:
         set_price_alert("맥북", 1500000)
     """
     try:
-        result = tracker.set_price_alert(keyword, target_price)
+        tracker = await get_tracker()
+        result = await tracker.set_price_alert(keyword, target_price)
         
         return {
             "success": True,
@@ -125,23 +437,43 @@ def set_price_alert(keyword: str, target_price: int) -> dict:
 
 
 @mcp.tool()
-def get_price_history(keyword: str, days: int = 30) -> dict:
+async def get_price_history(
+    keyword: str,
+    days: int = 30,
+    resolution: str = "auto",
+    fields: Optional[List[str]] = None,
+    format: str = "rows"
+) -> dict:
     """
     상품 가격 히스토리 조회
     
     Args:
         keyword: 상품 키워드
         days: 조회 기간 (일, 기본 30일)
+        resolution: 조회 단위 - auto(기간에 따라 자동), raw(원본 기록), daily(일 단위), weekly(주 단위)
+        fields: 반환할 기록 필드 (예: ["price", "created_at"], 기본 전체)
+            - raw: product_name, platform, price, created_at(첫 관측), last_seen(마지막 관측), observations(관측 횟수)
+            - daily/weekly: product_name, platform, date, open_price, close_price,
+              min_price, max_price, average_price, count
+              (price, created_at, observations를 지정하면 close_price, date, count 값을 그 이름으로 반환)
+        format: rows(기록별 객체) 또는 columnar(컬럼별 배열 + 상품명/플랫폼 공유 사전)
     
     Returns:
-        가격 변동 히스토리
+        가격 변동 히스토리 (daily/weekly는 기간별 시가/종가/최저/최고/평균가)
     
     Example:
         get_price_history("아이패드")
         get_price_history("닌텐도 스위치", days=90)
+        get_price_history("맥북", days=365, resolution="weekly")
+        get_price_history("아이패드", format="columnar")
     """
     try:
-        history = tracker.get_price_history(keyword, days)
+        tracker = await get_tracker()
+        if format not in ("rows", "columnar"):
+            raise ValueError(f"지원하지 않는 형식: {format} (rows, columnar)")
+        resolution = tracker.pick_history_resolution(days, resolution)
+        history = await tracker.get_price_history(keyword, days, resolution)
+        history = project_history(history, fields, resolution)
         
         if not history:
             return {
@@ -149,14 +481,15 @@ def get_price_history(keyword: str, days: int = 30) -> dict:
                 "message": f"'{keyword}'의 가격 히스토리가 없습니다."
             }
         
-        return {
+        return cap_response({
             "success": True,
             "keyword": keyword,
             "period_days": days,
+            "resolution": resolution,
             "total_records": len(history),
-            "history": history,
+            "history": to_columnar(history) if format == "columnar" else history,
             "message": f"{days}일간 {len(history)}개 가격 기록 조회"
-        }
+        }, "history", Config.RESPONSE_MAX_BYTES)
     except Exception as e:
         return {
             "success": False,
@@ -166,7 +499,7 @@ def get_price_history(keyword: str, days: int = 30) -> dict:
 
 
 @mcp.tool()
-def track_product(keyword: str) -> dict:
+async def track_product(keyword: str) -> dict:
     """
     상품 추적 시작
     
@@ -181,7 +514,8 @@ def track_product(keyword: str) -> dict:
         track_product("다이슨 청소기")
     """
     try:
-        result = tracker.track_product(keyword)
+        tracker = await get_tracker()
+        result = await tracker.track_product(keyword)
         
         return {
             "success": result['success'],
@@ -198,7 +532,7 @@ def track_product(keyword: str) -> dict:
 
 
 @mcp.tool()
-def list_tracked_products() -> dict:
+async def list_tracked_products() -> dict:
     """
     추적 중인 상품 목록 조회
     
@@ -209,14 +543,15 @@ def list_tracked_products() -> dict:
         list_tracked_products()
     """
     try:
-        products = tracker.list_tracked_products()
+        tracker = await get_tracker()
+        products = await tracker.list_tracked_products()
         
-        return {
+        return cap_response({
             "success": True,
             "total_count": len(products),
             "tracked_products": products,
             "message": f"{len(products)}개 상품 추적 중"
-        }
+        }, "tracked_products", Config.RESPONSE_MAX_BYTES)
     except Exception as e:
         return {
             "success": False,
@@ -226,7 +561,7 @@ def list_tracked_products() -> dict:
 
 
 @mcp.tool()
-def get_best_deals(limit: int = 10) -> dict:
+async def get_best_deals(limit: int = 10, ctx: Context = None) -> dict:
     """
     베스트 딜 추천 (가격 대비 가치가 높은 상품)
     
@@ -241,12 +576,16 @@ def get_best_deals(limit: int = 10) -> dict:
         get_best_deals(limit=5)
     """
     try:
-        deals = tracker.get_best_deals(limit=limit)
+        tracker = await get_tracker()
+        deals = await tracker.get_best_deals(limit=limit, on_progress=progress_reporter(ctx))
         
         return {
             "success": True,
             "total_count": len(deals),
             "best_deals": deals,
+            "partial": bool(tracker.best_deals_missing),
+            "missing_keywords": tracker.best_deals_missing,
+            "updated_at": tracker.best_deals_updated_at,
             "message": f"{len(deals)}개 베스트 딜 추천"
         }
     except Exception as e:
@@ -256,19 +595,181 @@ def get_best_deals(limit: int = 10) -> dict:
             "message": f"베스트 딜 조회 실패: {str(e)}"
         }
 
+
+@mcp.tool()
+async def check_price_alerts(ctx: Context = None) -> dict:
+    """
+    설정된 모든 가격 알림을 지금 확인 (검색어별로 결과가 나오는 대로 진행 상황 전달)
+    
+    Returns:
+        목표가 이하로 내려온 알림 목록
+    
+    Example:
+        check_price_alerts()
+    """
+    try:
+        tracker = await get_tracker()
+        triggered = await tracker.check_price_alerts(on_progress=progress_reporter(ctx))
+        
+        return cap_response({
+            "success": True,
+            "total_count": len(triggered),
+            "triggered_alerts": triggered,
+            "message": f"{len(triggered)}개 알림 트리거됨"
+        }, "triggered_alerts", Config.RESPONSE_MAX_BYTES)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"알림 확인 실패: {str(e)}"
+        }
+
+
+@mcp.tool()
+async def get_triggered_alerts(limit: int = 20) -> dict:
+    """
+    트리거된 가격 알림 조회 (검색/추적 중 목표가 이하 가격이 관측된 알림)
+    
+    Args:
+        limit: 조회할 알림 개수 (기본 20개)
+    
+    Returns:
+        최근 트리거된 알림 목록
+    
+    Example:
+        get_triggered_alerts()
+        get_triggered_alerts(limit=5)
+    """
+    try:
+        tracker = await get_tracker()
+        triggers = await tracker.get_triggered_alerts(limit=limit)
+        
+        return cap_response({
+            "success": True,
+            "total_count": len(triggers),
+            "triggered_alerts": triggers,
+            "message": f"{len(triggers)}개 알림 트리거됨"
+        }, "triggered_alerts", Config.RESPONSE_MAX_BYTES)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"알림 조회 실패: {str(e)}"
+        }
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Prometheus 메트릭 (/metrics) - 캐시/호출 한도/스케줄러 통계는 스크레이프 시점에 반영"""
+    if _tracker is not None:
+        observe_stats(_tracker.get_stats())
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+async def profile_endpoint(request: Request) -> Response:
+    """
+    샘플링 프로파일러 누적 스택 (/debug/profile, collapsed 형식)
+
+    ?reset=true 이면 반환 후 누적 스택을 비움
+    """
+    text = PROFILER.collapsed()
+    if request.query_params.get("reset", "").lower() in ("1", "true"):
+        PROFILER.reset()
+    return Response(text, media_type="text/plain; charset=utf-8")
+
+
+def dump_profile():
+    """누적 스택을 PROFILE_OUTPUT_PATH에 저장 (SIGUSR1)"""
+    try:
+        stacks = PROFILER.dump(Config.PROFILE_OUTPUT_PATH)
+        logger.info(f"🔥 프로파일 저장: {Config.PROFILE_OUTPUT_PATH} ({stacks}개 스택)")
+    except OSError as e:
+        logger.warning(f"⚠️ 프로파일 저장 실패: {e}")
+
+
+@mcp.custom_route("/healthz", methods=["GET"])
+async def healthz(request: Request) -> Response:
+    """생존 확인 - 이벤트 루프가 응답하면 200 (초기화 완료 여부와 무관)"""
+    return JSONResponse({"status": "ok"})
+
+
+@mcp.custom_route("/readyz", methods=["GET"])
+async def readyz(request: Request) -> Response:
+    """준비 확인 - PriceTracker 초기화가 끝났으면 200, 아니면 503"""
+    if _tracker is not None:
+        return JSONResponse({"status": "ready", "init_seconds": round(_tracker_init_seconds or 0, 3)})
+    if _tracker_error is not None:
+        return JSONResponse({"status": "error", "error": _tracker_error}, status_code=503)
+    return JSONResponse({"status": "starting"}, status_code=503)
+
+
+if Config.METRICS_ENABLED:
+    mcp.add_middleware(MetricsMiddleware())
+    mcp.custom_route("/metrics", methods=["GET"])(metrics_endpoint)
+
+if TRACER.enabled or PROFILER.enabled:
+    mcp.add_middleware(TracingMiddleware())
+
+if PROFILER.enabled:
+    mcp.custom_route("/debug/profile", methods=["GET"])(profile_endpoint)
+
+
+async def warm_up():
+    """서버 바인딩과 동시에 PriceTracker 생성 (백그라운드 작업은 get_tracker가 시작)"""
+    try:
+        await get_tracker()
+    except Exception as e:
+        # /readyz가 503과 오류를 보여주고, 첫 도구 호출에서 다시 시도함
+        logger.error(f"❌ PriceTracker 초기화 실패: {type(e).__name__}: {e}", exc_info=True)
+
+
+async def close_tracker():
+    """
+    종료 시 PriceTracker 정리
+
+    생성 스레드는 취소할 수 없으므로 생성 중이면 끝날 때까지 기다린 뒤 만들어진 PriceTracker를 닫음
+    """
+    global _tracker
+    tracker = _tracker
+    if tracker is None and _tracker_init is not None and not _tracker_init.cancelled():
+        try:
+            tracker = await _tracker_init
+        except Exception:
+            tracker = None
+    _tracker = None
+    if tracker is not None:
+        await tracker.aclose()
+
+
+async def main():
+    """서버 실행 (초기화와 추적 갱신 스케줄러는 백그라운드로 함께 실행, 종료 시 정리)"""
+    if PROFILER.enabled and hasattr(signal, "SIGUSR1"):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, dump_profile)
+    
+    warm_up_task = asyncio.create_task(warm_up())
+    try:
+        # PlayMCP 호환 설정
+        # - transport='streamable-http': MCP 2025-03-26 표준 (PlayMCP 필수)
+        # - host='0.0.0.0': 외부 접속 허용 (Cloudtype/Docker 필수)
+        # - port=8000: Cloudtype 기본 포트 (SERVER_HOST/SERVER_PORT로 변경 가능)
+        await mcp.run_async(transport='streamable-http', host=Config.SERVER_HOST, port=Config.SERVER_PORT)
+    finally:
+        warm_up_task.cancel()
+        await asyncio.gather(warm_up_task, return_exceptions=True)
+        try:
+            await close_tracker()
+        finally:
+            TRACER.close()
+
+
 if __name__ == "__main__":
     # 환경변수 검증
     if Config.validate():
         print("✅ API 설정 완료")
         print(f"📊 설정 정보: {Config.get_api_info()}")
         print("\n🚀 [PlayMCP 호환] Streamable HTTP 서버 시작 중...")
-        print("📍 외부 접속: 0.0.0.0:8000")
+        print(f"📍 외부 접속: {Config.SERVER_HOST}:{Config.SERVER_PORT}")
         
-        # PlayMCP 호환 설정
-        # - transport='streamable-http': MCP 2025-03-26 표준 (PlayMCP 필수)
-        # - host='0.0.0.0': 외부 접속 허용 (Cloudtype/Docker 필수)
-        # - port=8000: Cloudtype 기본 포트
-        mcp.run(transport='streamable-http', host='0.0.0.0', port=8000)
+        asyncio.run(main())
     else:
         print("\n❌ 환경변수 설정이 필요합니다")
         print("💡 Cloudtype 환경변수에서 NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET을 확인하세요")
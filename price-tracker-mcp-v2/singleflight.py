@@ -0,0 +1,85 @@
+"""
+동일 요청 병합 (single-flight)
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Set
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출이 하나의 실행 결과를 공유"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self._detached: Set[asyncio.Task] = set()  # 기다리는 호출자가 없어도 끝까지 실행할 Task
+        self.leaders = 0  # 실제 실행된 호출 수
+        self.shared = 0   # 진행 중인 호출에 합류한 수
+
+    def in_flight(self, key: Hashable) -> bool:
+        """해당 키의 호출이 진행 중인지 확인"""
+        return key in self._inflight
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """
+        호출 시작 (이미 진행 중이면 기존 Task 반환)
+
+        결과를 기다리지 않는 백그라운드 호출용 - 호출자가 모두 취소되어도 계속 실행됨
+
+        Args:
+            key: 병합 키
+            fn: 실제 호출을 수행하는 코루틴 함수
+        """
+        task = self._start(key, fn)
+        self._detached.add(task)
+        return task
+
+    def _start(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.shared += 1
+            return task
+
+        task = asyncio.create_task(fn())
+        self._inflight[key] = task
+        self.leaders += 1
+
+        def _done(finished: asyncio.Task):
+            if self._inflight.get(key) is finished:
+                del self._inflight[key]
+            self._detached.discard(finished)
+
+        task.add_done_callback(_done)
+        return task
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        호출 후 결과 대기
+
+        한 호출자가 취소되어도 공유 Task는 다른 호출자를 위해 계속 실행되고,
+        마지막 호출자까지 취소되면 공유 Task도 취소하여 업스트림 작업을 해제함
+        """
+        task = self._start(key, fn)
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1 and task not in self._detached:
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def cancel_all(self):
+        """진행 중인 모든 호출 취소"""
+        for task in list(self._inflight.values()):
+            task.cancel()
+
+    def stats(self) -> Dict:
+        """병합 통계"""
+        return {
+            "in_flight": len(self._inflight),
+            "leaders": self.leaders,
+            "shared": self.shared
+        }
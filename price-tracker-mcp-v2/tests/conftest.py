@@ -0,0 +1,66 @@
+"""
+테스트 공용 설정 - 임시 DB를 쓰는 PriceTracker와 네이버 API 대신 쓰는 가짜 검색 함수
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from config import Config  # noqa: E402
+
+
+def make_items(query: str, total: int):
+    """검색어별 가짜 상품 목록 (가격은 순위마다 1000원씩 증가)"""
+    return [
+        {
+            "title": f"<b>{query}</b> 상품 {rank}",
+            "link": f"https://example.com/{rank}",
+            "image": "",
+            "lprice": str(100000 + rank * 1000),
+            "mallName": "네이버",
+            "productId": str(rank)
+        }
+        for rank in range(1, min(total, 1000) + 1)
+    ]
+
+
+class FakeNaver:
+    """NaverShoppingAPI.search_products 대체 (요청 기록 포함)"""
+
+    def __init__(self, total: int = 30):
+        self.total = total
+        self.calls = []
+
+    async def search_products(self, query, display=10, start=1, sort="sim", priority=0):
+        self.calls.append({"query": query, "display": display, "start": start, "sort": sort})
+        items = make_items(query, self.total)
+        if sort == "dsc":
+            items.reverse()
+        page = items[start - 1:start - 1 + display]
+        return {"total": self.total, "start": start, "display": len(page), "items": page}
+
+
+@pytest.fixture
+def tracker(tmp_path, monkeypatch):
+    """임시 DB를 쓰는 PriceTracker (네이버 검색은 FakeNaver, 기록은 바로 저장)"""
+    monkeypatch.setattr(Config, "DATABASE_PATH", str(tmp_path / "test.db"))
+    monkeypatch.setattr(Config, "DB_WRITE_BEHIND", False)
+    monkeypatch.setattr(Config, "CACHE_ENABLED", False)
+
+    from price_tracker import PriceTracker
+
+    instance = PriceTracker()
+    fake = FakeNaver()
+    monkeypatch.setattr(instance.naver, "search_products", fake.search_products)
+    instance.fake_naver = fake
+    yield instance
+    asyncio.run(instance.aclose())
+
+
+def count_history(tracker) -> int:
+    conn = tracker.db._connect()
+    return conn.execute("SELECT COUNT(*) FROM price_history").fetchone()[0]
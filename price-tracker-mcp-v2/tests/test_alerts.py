@@ -0,0 +1,45 @@
+"""
+AlertIndex 알림 매칭 테스트
+"""
+from alerts import AlertIndex, current_price
+
+
+def make_index() -> AlertIndex:
+    index = AlertIndex()
+    index.load([
+        {"id": 1, "keyword": "노트북", "target_price": 1000},
+        {"id": 2, "keyword": "노트북 ", "target_price": 800},
+    ])
+    return index
+
+
+def test_match_finds_alerts_at_or_above_price():
+    index = make_index()
+    assert [a["id"] for a in index.match("노트북", 900)] == [1]
+    assert [a["id"] for a in index.match("노트북", 800)] == [2, 1]
+    assert index.match("노트북", 1001) == []
+
+
+def test_match_does_not_mark_until_notified():
+    index = make_index()
+    assert index.match("노트북", 900)
+    assert index.match("노트북", 900)
+
+    index.mark_notified(1, 900)
+    assert index.match("노트북", 900) == []
+    assert [a["id"] for a in index.match("노트북", 850)] == [1]
+
+
+def test_notified_keeps_one_price_per_alert():
+    index = make_index()
+    for price in range(500, 800):
+        index.mark_notified(1, price)
+        index.mark_notified(2, price)
+    assert index.stats()["notified"] == 2
+
+
+def test_current_price_uses_only_top_relevance_results():
+    products = [{"price": 3000}, {"price": 2000}, {"price": 100}]
+    assert current_price(products) == {"price": 3000}
+    assert current_price(products, top_n=2) == {"price": 2000}
+    assert current_price([], top_n=2) is None
@@ -0,0 +1,39 @@
+"""
+오프라인 벤치마크 측정 테스트 (가짜 네이버 서버)
+"""
+import asyncio
+import os
+import sys
+import types
+
+from config import Config
+from conftest import PROJECT_DIR
+
+sys.path.insert(0, os.path.join(PROJECT_DIR, "benchmarks"))
+
+import run as bench  # noqa: E402
+from fake_naver import FakeNaverServer  # noqa: E402
+
+
+def test_unique_keywords_cost_one_upstream_call_each(tmp_path, monkeypatch):
+    import server
+
+    fake = FakeNaverServer(latency_ms=1, jitter_ms=0).start()
+    monkeypatch.setattr(Config, "NAVER_API_URL", fake.url)
+    monkeypatch.setattr(Config, "DATABASE_PATH", str(tmp_path / "bench.db"))
+    # 벤치마크 환경 설정(BACKGROUND_OFF_ENV)과 같은 값
+    monkeypatch.setattr(Config, "TRACK_REFRESH_ENABLED", bench.BACKGROUND_OFF_ENV["TRACK_REFRESH_ENABLED"] == "true")
+    monkeypatch.setattr(Config, "BEST_DEAL_REFRESH_INTERVAL", float(bench.BACKGROUND_OFF_ENV["BEST_DEAL_REFRESH_INTERVAL"]))
+    monkeypatch.setattr(server, "_tracker", None)
+    monkeypatch.setattr(server, "_tracker_init", None)
+
+    args = types.SimpleNamespace(only=["tracker:search_products"], warm=False,
+                                 iterations=len(bench.KEYWORDS), concurrency=5)
+    try:
+        results = asyncio.run(bench.run(args, fake))
+    finally:
+        fake.stop()
+
+    assert [r["name"] for r in results] == ["tracker:search_products"]
+    assert results[0]["errors"] == 0
+    assert results[0]["upstream_per_call"] == 1.0
@@ -0,0 +1,50 @@
+"""
+ResponseCache TTL/LRU 테스트
+"""
+import types
+
+import cache as cache_module
+from cache import ResponseCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def make_cache(monkeypatch, **kwargs):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    return ResponseCache(**kwargs), clock
+
+
+def test_entry_is_fresh_then_stale_then_expired(monkeypatch):
+    cache, clock = make_cache(monkeypatch, ttls={"asc": 10}, stale_ttl=20)
+    key = ResponseCache.make_key("노트북", 10, 1, "asc")
+    cache.set(key, {"items": []}, size=10)
+
+    assert cache.get(key) == ({"items": []}, ResponseCache.FRESH)
+    clock.now += 15
+    assert cache.get(key) == ({"items": []}, ResponseCache.STALE)
+    clock.now += 20
+    assert cache.get(key) == (None, None)
+    # 만료돼도 한도 초과 시 대체 응답용으로 남아 있음
+    assert cache.peek(key) == {"items": []}
+
+
+def test_evicts_least_recently_used_by_entries_and_bytes(monkeypatch):
+    cache, _ = make_cache(monkeypatch, max_entries=2, max_bytes=100)
+    a, b, c = (ResponseCache.make_key(q, 10, 1, "sim") for q in "abc")
+    cache.set(a, "a", size=10)
+    cache.set(b, "b", size=10)
+    cache.get(a)
+    cache.set(c, "c", size=10)
+    assert cache.peek(b) is None and cache.peek(a) == "a"
+
+    cache.set(b, "b", size=95)
+    assert cache.peek(a) is None and cache.peek(c) is None
+    assert cache.stats()["bytes"] == 95
+    assert cache.stats()["evictions"] == 3
@@ -0,0 +1,37 @@
+"""
+ProductClassifier 분류 규칙 테스트
+"""
+from classifier import RULE_PHONE_MIN_PRICE, ProductClassifier
+
+
+def make_classifier() -> ProductClassifier:
+    return ProductClassifier(
+        phone_keywords=["아이폰", "galaxy"],
+        accessory_keywords=["케이스", "필름", "보호필름"],
+        phone_min_price=100000
+    )
+
+
+def item(title: str, price: int) -> dict:
+    return {"title": title, "lprice": str(price)}
+
+
+def test_phone_search_filters_cheap_items_and_accessories():
+    classifier = make_classifier()
+    accepted, filtered = classifier.classify("아이폰 15", [
+        item("<b>아이폰</b> 15 128GB", 1200000),
+        item("아이폰 15 투명 케이스", 150000),
+        item("아이폰 15 거치대", 9000),
+        item("아이폰 15 보호필름", 120000),
+    ])
+
+    assert [(title, price) for _, title, price in accepted] == [("아이폰 15 128GB", 1200000)]
+    assert filtered == {"accessory:케이스": 1, RULE_PHONE_MIN_PRICE: 1, "accessory:보호필름": 1}
+    assert classifier.stats()[RULE_PHONE_MIN_PRICE] == 1
+
+
+def test_non_phone_search_keeps_cheap_items_and_honors_limit():
+    classifier = make_classifier()
+    assert classifier.is_phone_keyword("Galaxy S24")
+    accepted, _ = classifier.classify("마우스", [item(f"마우스 {i}", 9000) for i in range(5)], limit=2)
+    assert len(accepted) == 2
@@ -0,0 +1,310 @@
+"""
+Database 가격 기록 조회 테스트
+"""
+import sqlite3
+
+import pytest
+
+from database import Database
+
+
+def make_db(tmp_path, **kwargs) -> Database:
+    return Database(db_path=str(tmp_path / "test.db"), **kwargs)
+
+
+def record(price: int, mall: str) -> dict:
+    return {
+        "product_name": "노트북 상품 1",
+        "platform": "네이버쇼핑",
+        "price": price,
+        "product_id": "1",
+        "mall_name": mall
+    }
+
+
+def test_price_change_stats_keep_malls_apart(tmp_path):
+    db = make_db(tmp_path)
+    db.add_tracked_product(product_name="노트북 상품 1", keyword="노트북", product_id="1")
+
+    # 판매처별로는 가격이 그대로인 관측이 번갈아 들어옴
+    for _ in range(3):
+        db.add_price_records([record(1000, "쿠팡"), record(1200, "11번가")])
+    stats = db.get_price_change_stats(["노트북"], "2000-01-01 00:00:00")
+    assert stats["changes"] == 0
+
+    db.add_price_records([record(900, "쿠팡")])
+    stats = db.get_price_change_stats(["노트북"], "2000-01-01 00:00:00")
+    assert stats["changes"] == 1
+    db.close()
+
+
+def test_price_history_includes_intervals_open_since_start(tmp_path):
+    db = make_db(tmp_path, history_mode="intervals")
+    db.add_price_records([record(1000, "쿠팡")])
+    conn = db._connect()
+    with conn:
+        # 기간 전에 시작해 기간 안까지 이어진 구간 행, 기간 전에 끝난 행
+        conn.execute("UPDATE price_history SET created_at = '2026-01-01 00:00:00', valid_to = '2026-01-20 00:00:00'")
+        conn.execute('''
+            INSERT INTO price_history (product_id, platform_id, mall_id, price, created_at)
+            SELECT product_id, platform_id, mall_id, 1200, '2025-12-01 00:00:00' FROM price_history
+        ''')
+
+    # 구간은 첫/마지막 관측 시각과 관측 횟수를 가진 한 항목으로 반환
+    history = db.get_price_history("노트북", "2026-01-10 00:00:00")
+    assert [(h["price"], h["created_at"], h["last_seen"], h["observations"]) for h in history] == [
+        (1000, "2026-01-01 00:00:00", "2026-01-20 00:00:00", 1)
+    ]
+    assert len(db.get_price_history("노트북", "2025-12-15 00:00:00")) == 1
+    assert len(db.get_price_history("노트북", "2025-11-15 00:00:00")) == 2
+    db.close()
+
+
+def test_price_history_date_filter_uses_range_seeks(tmp_path):
+    db = make_db(tmp_path)
+    query, params = db._history_since(db._product_filter("노트북"), ["%노트북%"], "2026-01-01 00:00:00")
+    plan = " | ".join(row[3] for row in db._connect().execute(f"EXPLAIN QUERY PLAN {query}", params))
+    assert "idx_price_history_product_created (product_id=? AND created_at>?)" in plan
+    assert "idx_price_history_product_valid_to (product_id=? AND valid_to>?)" in plan
+    db.close()
+
+
+def test_notified_alerts_load_latest_trigger_per_alert(tmp_path):
+    db = make_db(tmp_path)
+    alert_id = db.add_price_alert("노트북", 1500)
+    for price in (1400, 1300, 1450):
+        db.add_alert_triggers([{"alert_id": alert_id, "price": price, "product_name": "노트북 상품 1", "product_id": "1"}])
+
+    assert db.get_notified_alerts() == [(alert_id, 1450)]
+    db.close()
+
+
+def test_rollup_backfill_breaks_same_second_ties_by_insert_order(tmp_path):
+    db = make_db(tmp_path)
+    prices = [1500000, 1499000, 1498000, 1497000, 1496000]
+    for price in prices:
+        db.add_price_records([record(price, "쿠팡")])
+
+    conn = db._connect()
+    with conn:
+        conn.execute("UPDATE price_history SET created_at = '2026-01-02 10:00:00'")
+        conn.execute("DROP TABLE price_daily")
+        conn.execute("DROP TABLE price_weekly")
+        db._migration_price_rollups(conn)
+
+    for table in ("price_daily", "price_weekly"):
+        row = conn.execute(f"SELECT open_price, close_price, count FROM {table}").fetchone()
+        assert row == (prices[0], prices[-1], 5)
+
+    db.close()
+
+
+def test_rollup_update_breaks_same_second_ties_by_insert_order(tmp_path):
+    db = make_db(tmp_path)
+    prices = [1500000, 1499000, 1496000]
+    db.add_price_records([record(price, "쿠팡") for price in prices[:2]])
+    db.add_price_records([record(prices[2], "쿠팡")])
+
+    row = db._connect().execute("SELECT open_price, close_price, count FROM price_daily").fetchone()
+    assert row == (prices[0], prices[-1], 3)
+    db.close()
+
+
+def test_migrates_legacy_history_without_building_history_fts(tmp_path, monkeypatch):
+    path = str(tmp_path / "test.db")
+    legacy = sqlite3.connect(path)
+    with legacy:
+        legacy.execute('''
+            CREATE TABLE price_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                product_name TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                price INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        legacy.execute('''
+            INSERT INTO price_history (product_name, platform, price, created_at)
+            VALUES ('노트북 상품 1', '네이버쇼핑', 1000, '2026-01-02 00:00:00')
+        ''')
+    legacy.close()
+
+    statements = []
+    connect = sqlite3.connect
+
+    def traced_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(sqlite3, "connect", traced_connect)
+    db = Database(db_path=path)
+
+    assert not [sql for sql in statements if "price_history_fts" in sql]
+    assert [h["price"] for h in db.get_price_history("노트북", "2026-01-01 00:00:00")] == [1000]
+    db.close()
+
+
+def test_reads_serve_committed_rows_when_buffer_flush_fails(tmp_path):
+    db = make_db(tmp_path, write_behind=True, write_flush_interval=3600)
+    db.add_tracked_product(product_name="노트북 상품 1", keyword="노트북", product_id="1")
+    db.add_price_records([record(1000, "쿠팡")])
+    db.flush()
+
+    def locked(batch):
+        raise sqlite3.OperationalError("database is locked")
+
+    save, db.writer.flush_fn = db.writer.flush_fn, locked
+    db.add_price_records([record(900, "쿠팡")])
+
+    assert [h["price"] for h in db.get_price_history("노트북")] == [1000]
+    assert db.get_price_change_stats(["노트북"], "2000-01-01 00:00:00")["changes"] == 0
+    assert [r["min_price"] for r in db.get_price_rollup("노트북", "daily")] == [1000]
+
+    db.writer.flush_fn = save
+    db.close()
+
+
+def test_rollup_backfill_matches_incremental_rollups(tmp_path, monkeypatch):
+    import database
+
+    db = make_db(tmp_path, history_mode="intervals")
+    observations = [
+        ("2026-01-05 09:00:00", [record(1000, "쿠팡"), record(1200, "11번가")]),
+        ("2026-01-05 09:00:00", [record(1000, "쿠팡")]),  # 같은 시각에 같은 가격 재관측
+        ("2026-01-05 12:00:00", [record(1000, "쿠팡"), record(1200, "11번가")]),
+        ("2026-01-05 18:00:00", [record(900, "쿠팡")]),
+        ("2026-01-06 08:00:00", [record(900, "쿠팡"), record(1200, "11번가")]),  # 날짜를 넘긴 같은 가격
+        ("2026-01-06 20:00:00", [record(900, "쿠팡"), record(1100, "11번가")]),
+    ]
+    for timestamp, records in observations:
+        monkeypatch.setattr(database, "utc_timestamp", lambda: timestamp)
+        db.add_price_records(records)
+
+    conn = db._connect()
+
+    def snapshot():
+        return {
+            table: conn.execute(f"SELECT * FROM {table} ORDER BY product_id, platform_id, bucket").fetchall()
+            for table in ("price_daily", "price_weekly")
+        }
+
+    incremental = snapshot()
+    with conn:
+        conn.execute("DELETE FROM price_daily")
+        conn.execute("DELETE FROM price_weekly")
+        db._backfill_rollups(conn)
+
+    assert snapshot() == incremental
+    daily_counts = [row[8] for row in incremental["price_daily"]]
+    assert sum(daily_counts) == 10
+    db.close()
+
+
+def test_price_history_returns_one_entry_per_interval(tmp_path):
+    db = make_db(tmp_path, history_mode="intervals")
+    for price in (1000, 1000, 1000, 900):
+        db.add_price_records([record(price, "쿠팡")])
+
+    history = db.get_price_history("노트북")
+    assert [(h["price"], h["observations"]) for h in history] == [(900, 1), (1000, 3)]
+    assert all(h["last_seen"] >= h["created_at"] for h in history)
+    db.close()
+
+
+def test_price_change_stats_by_group_counts_each_group(tmp_path):
+    db = make_db(tmp_path)
+    db.add_tracked_product(product_name="노트북 상품 1", keyword="노트북", product_id="1")
+    db.add_tracked_product(product_name="노트북 상품 1", keyword="노트북 ", product_id="1")
+    for price in (1000, 900, 1000):
+        db.add_price_records([record(price, "쿠팡")])
+
+    stats = db.get_price_change_stats_by_group(
+        {"노트북": ["노트북", "노트북 "], "모니터": ["모니터"]}, "2000-01-01 00:00:00"
+    )
+    # 두 검색어가 같은 상품을 추적해도 변경은 한 번씩만 셈
+    assert stats["노트북"]["changes"] == 2
+    assert stats["모니터"] == {"changes": 0, "last_change_at": None}
+    db.close()
+
+
+def test_connections_are_reused_per_thread_with_wal_pragmas(tmp_path):
+    import threading
+
+    db = make_db(tmp_path, cache_size_kb=2048, busy_timeout_ms=1234)
+    conn = db._connect()
+    assert db._connect() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -2048
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db._connect()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+    assert len(db._connections) == 2
+
+    # close()는 다른 스레드가 연 연결까지 닫음
+    db.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        other[0].execute("SELECT 1")
+
+
+def test_keyword_lookup_uses_trigram_index_and_short_keyword_fallback(tmp_path):
+    db = make_db(tmp_path)
+    if not db.fts_enabled:
+        pytest.skip("SQLite FTS5 trigram 미지원")
+    db.add_price_records([
+        {"product_name": "Galaxy Buds Pro 버즈", "platform": "네이버쇼핑", "price": 1000, "product_id": "1"},
+        {"product_name": "아이패드 에어", "platform": "네이버쇼핑", "price": 2000, "product_id": "2"},
+    ])
+
+    # 3글자 이상은 trigram 색인으로, LIKE처럼 대소문자 구분 없이 찾음
+    plan = " | ".join(row[3] for row in db._connect().execute(
+        f"EXPLAIN QUERY PLAN {db._product_filter('galaxy buds')}", ["%galaxy buds%"]
+    ))
+    assert "products_fts" in plan
+    assert [h["price"] for h in db.get_price_history("galaxy buds")] == [1000]
+    # trigram으로 찾을 수 없는 2글자 검색어는 LIKE 스캔
+    assert [h["price"] for h in db.get_price_history("버즈")] == [1000]
+    assert db.get_price_history("갤럭시") == []
+    db.close()
+
+
+def test_renamed_product_keeps_history_under_its_naver_product_id(tmp_path):
+    db = make_db(tmp_path)
+    db.add_price_records([{"product_name": "노트북 구형 이름", "platform": "네이버쇼핑", "price": 1000, "product_id": "7"}])
+    db.add_price_records([{"product_name": "노트북 신형 이름", "platform": "네이버쇼핑", "price": 900, "product_id": "7"}])
+    db.add_price_records([{"product_name": "노트북 신형 이름", "platform": "네이버쇼핑", "price": 800}])
+
+    conn = db._connect()
+    assert conn.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 2
+    # productId가 같은 기록은 최신 제목 아래 하나의 히스토리로 조회되고, 예전 제목으로는 찾지 않음
+    history = db.get_price_history("신형 이름")
+    assert sorted((h["price"], h["product_name"]) for h in history) == [
+        (800, "노트북 신형 이름"), (900, "노트북 신형 이름"), (1000, "노트북 신형 이름")
+    ]
+    assert db.get_price_history("구형 이름") == []
+    db.close()
+
+
+def test_observation_count_migration_matches_earlier_rollup_backfill(tmp_path):
+    db = make_db(tmp_path, history_mode="intervals")
+    db.add_price_records([record(1000, "쿠팡")])
+    db.add_price_records([record(900, "11번가")])
+    conn = db._connect()
+    with conn:
+        # v5 스키마: 관측 횟수 컬럼 없음, 구간 행은 시작/마지막 관측만 남음
+        conn.execute('''
+            UPDATE price_history SET created_at = '2026-01-01 00:00:00', valid_to = '2026-01-01 12:00:00'
+            WHERE price = 1000
+        ''')
+        conn.execute("ALTER TABLE price_history DROP COLUMN observations")
+        conn.execute("PRAGMA user_version = 5")
+    db.close()
+
+    db = make_db(tmp_path, history_mode="intervals")
+    rows = db._connect().execute("SELECT price, observations FROM price_history ORDER BY price").fetchall()
+    assert rows == [(900, 1), (1000, 2)]
+    db.close()
@@ -0,0 +1,35 @@
+"""
+메트릭 레지스트리/Prometheus 출력 테스트
+"""
+import asyncio
+
+from metrics import Counter, Histogram, Registry
+
+
+def test_histogram_renders_cumulative_buckets_per_label():
+    registry = Registry()
+    histogram = Histogram("demo_seconds", "데모 \"지연\"", ["tool"], buckets=(0.1, 1.0), registry=registry)
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.labels("search").observe(value)
+    Counter("demo_total", "호출 수", ["status"], registry=registry).labels("ok").inc(2)
+
+    lines = registry.render().splitlines()
+    assert lines[:7] == [
+        '# HELP demo_seconds 데모 \\"지연\\"',
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{tool="search",le="0.1"} 1',
+        'demo_seconds_bucket{tool="search",le="1"} 3',
+        'demo_seconds_bucket{tool="search",le="+Inf"} 4',
+        'demo_seconds_sum{tool="search"} 4.05',
+        'demo_seconds_count{tool="search"} 4',
+    ]
+    assert lines[-1] == 'demo_total{status="ok"} 2'
+
+
+def test_db_queries_are_timed_per_statement(tracker):
+    from metrics import DB_QUERY_DURATION
+
+    child = DB_QUERY_DURATION.labels("get_price_history")
+    before = sum(child.counts)
+    asyncio.run(tracker.get_price_history("노트북", days=7))
+    assert sum(child.counts) == before + 1
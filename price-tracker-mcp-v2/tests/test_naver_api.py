@@ -0,0 +1,142 @@
+"""
+NaverShoppingAPI 클라이언트 테스트 (httpx MockTransport)
+"""
+import asyncio
+
+import httpx
+
+from cache import ResponseCache
+from naver_api import NaverShoppingAPI
+from rate_limiter import RateLimiter
+
+
+class Upstream:
+    """네이버 검색 API 대체 (요청 기록, 응답 상태 지정)"""
+
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.requests = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(dict(request.url.params))
+        await asyncio.sleep(0.01)
+        if self.status != 200:
+            return httpx.Response(self.status, json={"errorMessage": "rate limited"})
+        query = request.url.params["query"]
+        return httpx.Response(200, json={"total": 1, "items": [{"title": query, "lprice": "1000"}]})
+
+
+def make_api(upstream: Upstream, **kwargs) -> NaverShoppingAPI:
+    api = NaverShoppingAPI("id", "secret", http2=False, **kwargs)
+    api._client = httpx.AsyncClient(transport=httpx.MockTransport(upstream.handler))
+    return api
+
+
+def test_identical_concurrent_queries_share_one_request():
+    upstream = Upstream()
+    api = make_api(upstream)
+
+    async def run():
+        results = await asyncio.gather(
+            api.search_products("노트북"), api.search_products("  노트북 "), api.search_products("모니터")
+        )
+        await api.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert [r["items"][0]["title"] for r in results] == ["노트북", "노트북", "모니터"]
+    assert len(upstream.requests) == 2
+    assert api.flight.stats()["shared"] == 1
+
+
+def test_fresh_cache_hit_skips_upstream():
+    upstream = Upstream()
+    api = make_api(upstream, cache=ResponseCache())
+
+    async def run():
+        first = await api.search_products("노트북", sort="asc")
+        second = await api.search_products("노트북", sort="asc")
+        await api.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert len(upstream.requests) == 1
+
+
+def test_rate_limited_response_falls_back_to_cached_result():
+    upstream = Upstream()
+    cache = ResponseCache(ttls={"sim": 0}, stale_ttl=0)
+    limiter = RateLimiter(per_second=100)
+    api = make_api(upstream, cache=cache, limiter=limiter)
+
+    async def run():
+        await api.search_products("노트북")
+        upstream.status = 429
+        result = await api.search_products("노트북")
+        await api.aclose()
+        return result
+
+    result = asyncio.run(run())
+    assert result["degraded"] is True
+    assert result["items"][0]["title"] == "노트북"
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_upstream_gets_original_query_and_cache_uses_normalized_key():
+    upstream = Upstream()
+    api = make_api(upstream, cache=ResponseCache())
+
+    async def run():
+        await api.search_products("iPhone 15  Pro")
+        await api.search_products("iphone 15 pro")
+        await api.aclose()
+
+    asyncio.run(run())
+    assert [r["query"] for r in upstream.requests] == ["iPhone 15  Pro"]
+
+
+def test_invalid_json_response_becomes_error_result():
+    async def handler(request):
+        return httpx.Response(200, text="<html>점검 중</html>")
+
+    api = NaverShoppingAPI("id", "secret", http2=False)
+    api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def run():
+        result = await api.search_products("노트북")
+        await api.aclose()
+        return result
+
+    result = asyncio.run(run())
+    assert result["items"] == []
+    assert "JSON" in result["error"]
+
+
+def test_stale_hit_returns_cached_result_and_refreshes_in_background():
+    calls = []
+
+    async def handler(request):
+        calls.append(dict(request.url.params))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"total": 1, "items": [{"title": "노트북", "lprice": str(len(calls))}]})
+
+    cache = ResponseCache(ttls={"sim": 0}, stale_ttl=60)
+    api = NaverShoppingAPI("id", "secret", http2=False, cache=cache)
+    api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def run():
+        first = await api.search_products("노트북")
+        stale = await api.search_products("노트북")
+        calls_when_returned = len(calls)
+        await asyncio.sleep(0.1)
+        refreshed = await api.search_products("노트북")
+        await api.aclose()
+        return first, stale, calls_when_returned, refreshed
+
+    first, stale, calls_when_returned, refreshed = asyncio.run(run())
+    # 만료된 응답을 기다림 없이 반환하고, 갱신은 백그라운드에서 한 번만 수행
+    assert stale == first
+    assert calls_when_returned == 1
+    assert refreshed["items"][0]["lprice"] == "2"
+    assert cache.stats()["stale_hits"] == 2
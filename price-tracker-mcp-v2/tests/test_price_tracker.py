@@ -0,0 +1,155 @@
+"""
+PriceTracker 가격 기록/심층 비교 테스트
+"""
+import asyncio
+import sqlite3
+
+from config import Config
+from conftest import count_history, make_items
+
+
+def test_track_product_records_price_once(tracker):
+    asyncio.run(tracker.track_product("노트북"))
+    assert count_history(tracker) == 1
+
+
+def test_track_product_records_price_once_with_search_recording(tracker, monkeypatch):
+    monkeypatch.setattr(Config, "RECORD_SEARCH_RESULTS", True)
+    asyncio.run(tracker.track_product("노트북"))
+    assert count_history(tracker) == 1
+
+
+def test_search_products_records_results_when_enabled(tracker, monkeypatch):
+    monkeypatch.setattr(Config, "RECORD_SEARCH_RESULTS", True)
+    products = asyncio.run(tracker.search_products("노트북", count=5))
+    assert count_history(tracker) == len(products) == 5
+
+    asyncio.run(tracker.search_products("노트북", count=5, record=False))
+    assert count_history(tracker) == 5
+
+
+def test_deep_compare_fetches_last_partial_page(tracker):
+    tracker.fake_naver.total = 250
+    result = asyncio.run(tracker.deep_compare_prices("노트북", max_pages=10, timeout=5))
+
+    starts = sorted({call["start"] for call in tracker.fake_naver.calls})
+    assert starts == [1, 101, 201]
+    assert result["total_count"] == 250
+    assert result["highest_price"] == 100000 + 250 * 1000
+    assert not result["partial"]
+
+
+def test_deep_compare_fetches_second_page_below_two_full_pages(tracker):
+    tracker.fake_naver.total = 150
+    result = asyncio.run(tracker.deep_compare_prices("노트북", max_pages=10, timeout=5))
+
+    assert result["pages_planned"] == 4
+    assert result["total_count"] == 150
+
+
+def test_deep_compare_respects_page_budget(tracker):
+    tracker.fake_naver.total = 1000
+    result = asyncio.run(tracker.deep_compare_prices("노트북", max_pages=5, timeout=5))
+
+    # 페이지 예산은 정렬별로 적용
+    assert result["pages_planned"] == len(tracker.fake_naver.calls) == 10
+    for sort in ("asc", "sim"):
+        starts = sorted(call["start"] for call in tracker.fake_naver.calls if call["sort"] == sort)
+        assert starts == [1, 101, 201, 301, 401]
+
+
+def test_deep_compare_default_budget_covers_full_window_per_sort(tracker):
+    tracker.fake_naver.total = 5000
+    result = asyncio.run(tracker.deep_compare_prices("노트북", timeout=5))
+
+    assert result["pages_planned"] == 20
+    assert result["total_count"] == 1000
+
+
+def test_failed_trigger_write_does_not_suppress_alert(tracker, monkeypatch):
+    asyncio.run(tracker.set_price_alert("노트북", 150000))
+    records = [{"product_name": "노트북 상품 1", "platform": "네이버쇼핑", "price": 120000,
+                "product_id": "1", "mall_name": "네이버"}]
+
+    add_alert_triggers = tracker.db.add_alert_triggers
+
+    def locked(triggers):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(tracker.db, "add_alert_triggers", locked)
+    assert asyncio.run(tracker.notify_prices("노트북", records)) == []
+
+    monkeypatch.setattr(tracker.db, "add_alert_triggers", add_alert_triggers)
+    assert len(asyncio.run(tracker.notify_prices("노트북", records))) == 1
+    assert asyncio.run(tracker.notify_prices("노트북", records)) == []
+
+
+def test_alerts_use_top_relevance_price_in_every_path(tracker, monkeypatch):
+    # 정확도순 첫 결과는 비싸고, 가격순/뒤쪽 결과에 싼 상품이 있는 검색어
+    async def search_products(query, display=10, start=1, sort="sim", priority=0):
+        items = make_items(query, 30)
+        if sort == "sim":
+            items.reverse()
+        page = items[start - 1:start - 1 + display]
+        return {"total": 30, "start": start, "display": len(page), "items": page}
+
+    monkeypatch.setattr(tracker.naver, "search_products", search_products)
+    asyncio.run(tracker.set_price_alert("노트북", 120000))
+
+    asyncio.run(tracker.search_products("노트북", count=10))
+    asyncio.run(tracker.deep_compare_prices("노트북", timeout=5))
+    assert asyncio.run(tracker.check_price_alerts()) == []
+    assert asyncio.run(tracker.get_triggered_alerts()) == []
+
+    asyncio.run(tracker.set_price_alert("노트북", 130000))
+    triggered = asyncio.run(tracker.check_price_alerts())
+    assert [(a["target_price"], a["current_price"]) for a in triggered] == [(130000, 130000)]
+    assert [t["price"] for t in asyncio.run(tracker.get_triggered_alerts())] == [130000]
+
+
+def test_check_price_alerts_searches_each_normalized_keyword_once(tracker):
+    async def run():
+        await tracker.set_price_alert("노트북", 100000)
+        await tracker.set_price_alert(" 노트북  ", 102000)
+        await tracker.set_price_alert("노트북", 105000)
+        await tracker.set_price_alert("모니터", 200000)
+        tracker.fake_naver.calls.clear()
+        return await tracker.check_price_alerts()
+
+    triggered = asyncio.run(run())
+    assert sorted(call["query"] for call in tracker.fake_naver.calls) == ["노트북", "모니터"]
+    # 현재가 101000원: 목표가 이상인 알림만 트리거
+    assert sorted((a["keyword"].strip(), a["target_price"]) for a in triggered) == [
+        ("노트북", 102000), ("노트북", 105000), ("모니터", 200000)
+    ]
+
+
+def test_best_deals_fan_out_drops_slow_keywords_and_shares_refresh(tracker, monkeypatch):
+    import time
+
+    monkeypatch.setattr(Config, "BEST_DEAL_KEYWORDS", ["노트북", "모니터", "느린검색"])
+    monkeypatch.setattr(Config, "BEST_DEAL_TIMEOUT", 0.2)
+    search = tracker.fake_naver.search_products
+
+    async def search_products(query, *args, **kwargs):
+        if query == "느린검색":
+            await asyncio.sleep(2)
+        return await search(query, *args, **kwargs)
+
+    monkeypatch.setattr(tracker.naver, "search_products", search_products)
+    refreshes = []
+    refresh = tracker.refresh_best_deals
+    monkeypatch.setattr(tracker, "refresh_best_deals", lambda **kw: refreshes.append(1) or refresh(**kw))
+
+    async def run():
+        started = time.monotonic()
+        results = await asyncio.gather(tracker.get_best_deals(), tracker.get_best_deals())
+        return results, time.monotonic() - started
+
+    (first, second), elapsed = asyncio.run(run())
+    assert first == second
+    assert sorted(deal["keyword"] for deal in first) == ["노트북", "모니터"]
+    assert tracker.best_deals_missing == ["느린검색"]
+    assert len(refreshes) == 1
+    # 검색어를 동시에 조회하므로 느린 검색어의 시간 제한만큼만 걸림
+    assert elapsed < 1
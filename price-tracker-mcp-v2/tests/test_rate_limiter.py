@@ -0,0 +1,60 @@
+"""
+RateLimiter 우선순위/일일 한도 테스트
+"""
+import asyncio
+
+import pytest
+
+from rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, QuotaExceeded, RateLimiter
+
+
+def test_interactive_calls_go_before_queued_background_calls():
+    limiter = RateLimiter(per_second=50, burst=1)
+    order = []
+
+    async def call(name, priority):
+        await limiter.acquire(priority)
+        order.append(name)
+
+    async def run():
+        await limiter.acquire()  # 토큰을 비워 이후 호출이 대기열에 쌓이도록
+        await asyncio.gather(
+            call("background-1", PRIORITY_BACKGROUND),
+            call("background-2", PRIORITY_BACKGROUND),
+            call("interactive", PRIORITY_INTERACTIVE)
+        )
+
+    asyncio.run(run())
+    assert order == ["interactive", "background-1", "background-2"]
+
+
+def test_daily_limit_raises_quota_exceeded():
+    limiter = RateLimiter(per_second=100, daily_limit=2)
+
+    async def run():
+        await limiter.acquire()
+        await limiter.acquire()
+        with pytest.raises(QuotaExceeded):
+            await limiter.acquire()
+
+    asyncio.run(run())
+    assert limiter.stats()["remaining"] == 0
+
+
+def test_daily_usage_survives_restart(tmp_path):
+    from database import Database
+
+    db = Database(db_path=str(tmp_path / "test.db"))
+    limiter = RateLimiter(per_second=100, daily_limit=3, store=db)
+
+    async def run():
+        await limiter.acquire()
+        await limiter.acquire()
+        await limiter._save_task
+
+    asyncio.run(run())
+    # 재시작한 프로세스도 오늘 사용량을 이어받음
+    restarted = RateLimiter(per_second=100, daily_limit=3, store=db)
+    assert restarted.stats()["used"] == 2
+    assert restarted.remaining == 1
+    db.close()
@@ -0,0 +1,78 @@
+"""
+도구 응답 필드 선택 테스트
+"""
+import asyncio
+
+import pytest
+
+from response import PRODUCT_FIELDS, cap_response, json_size, project, project_history, to_columnar
+
+
+ROLLUP_ROW = {
+    "product_name": "노트북", "platform": "네이버쇼핑", "date": "2026-01-02",
+    "open_price": 1000, "close_price": 900, "min_price": 800, "max_price": 1100,
+    "average_price": 950, "count": 4
+}
+
+
+def test_project_history_maps_raw_names_onto_rollup_columns():
+    rows = project_history([ROLLUP_ROW], ["price", "created_at", "observations", "min_price"], "daily")
+    assert rows == [{"price": 900, "created_at": "2026-01-02", "observations": 4, "min_price": 800}]
+
+
+def test_project_history_names_valid_fields_for_resolution():
+    with pytest.raises(ValueError, match="open_price"):
+        project_history([ROLLUP_ROW], ["lowest"], "weekly")
+    with pytest.raises(ValueError, match="raw 히스토리에서 지원하지 않는 필드: open_price"):
+        project_history([], ["open_price"], "raw")
+
+
+def test_project_history_accepts_empty_history():
+    assert project_history([], ["price"], "daily") == []
+
+
+def test_project_validates_fields_on_empty_results():
+    with pytest.raises(ValueError, match="지원하지 않는 필드: bogus"):
+        project([], ["bogus"])
+    assert project([], ["title", "price"]) == []
+
+
+def test_project_fields_match_tracker_products(tracker):
+    products = asyncio.run(tracker.search_products("노트북", count=1))
+    assert tuple(products[0]) == PRODUCT_FIELDS
+    assert project(products, ["title", "price"]) == [{"title": products[0]["title"], "price": products[0]["price"]}]
+
+
+HISTORY = [
+    {"product_name": "노트북 상품 1", "platform": "네이버쇼핑", "price": 1000 - i, "created_at": f"2026-01-0{i + 1}"}
+    for i in range(5)
+]
+
+
+def test_to_columnar_shares_repeated_strings():
+    columnar = to_columnar(HISTORY)
+    assert columnar["count"] == 5
+    assert columnar["dictionaries"] == {"product_name": ["노트북 상품 1"], "platform": ["네이버쇼핑"]}
+    assert columnar["columns"]["product_name"] == [0] * 5
+    assert columnar["columns"]["price"] == [1000, 999, 998, 997, 996]
+    assert json_size(columnar) < json_size(HISTORY)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_cap_response_trims_rows_to_fit_byte_budget(columnar):
+    history = to_columnar(HISTORY) if columnar else HISTORY
+    response = {"success": True, "history": history}
+    full = json_size(response)
+
+    assert cap_response(response, "history", full) is response
+    capped = cap_response(response, "history", full - 1)
+    assert capped["truncated"] is True
+    assert 0 < capped["returned_count"] < 5
+    assert json_size(capped) <= full - 1
+
+    kept = capped["history"]
+    if columnar:
+        assert kept["count"] == capped["returned_count"]
+        assert kept["columns"]["price"] == [1000, 999, 998, 997, 996][:kept["count"]]
+    else:
+        assert kept == HISTORY[:capped["returned_count"]]
@@ -0,0 +1,157 @@
+"""
+TrackingScheduler 갱신 테스트
+"""
+import asyncio
+
+from config import Config
+from conftest import count_history
+
+
+def test_refresh_records_each_observation_once(tracker, monkeypatch):
+    monkeypatch.setattr(Config, "RECORD_SEARCH_RESULTS", True)
+
+    async def run():
+        await tracker.track_product("노트북")
+        return await tracker.scheduler.refresh_all()
+
+    assert asyncio.run(run()) == 1
+    # 추적 시작 1건 + 갱신 1건
+    assert count_history(tracker) == 2
+    assert tracker.scheduler.stats()["records_written"] == 1
+
+
+def test_refresh_exports_throughput_metrics(tracker):
+    from metrics import (
+        SCHEDULER_CYCLES, SCHEDULER_KEYWORDS_PER_SECOND, SCHEDULER_KEYWORDS_REFRESHED, observe_stats, REGISTRY
+    )
+
+    cycles = SCHEDULER_CYCLES.labels().value
+    refreshed = SCHEDULER_KEYWORDS_REFRESHED.labels().value
+
+    async def run():
+        await tracker.track_product("노트북")
+        await tracker.track_product("모니터")
+        await tracker.scheduler.refresh_all()
+
+    asyncio.run(run())
+    observe_stats(tracker.get_stats())
+
+    assert SCHEDULER_CYCLES.labels().value == cycles + 1
+    assert SCHEDULER_KEYWORDS_REFRESHED.labels().value == refreshed + 2
+    assert SCHEDULER_KEYWORDS_PER_SECOND.labels().value > 0
+    text = REGISTRY.render()
+    assert "price_tracker_scheduler_last_cycle_seconds " in text
+    assert "# TYPE price_tracker_scheduler_failures_total counter" in text
+
+
+def test_first_sync_runs_right_after_start_on_fresh_host(tracker, monkeypatch):
+    import time
+    import types
+
+    import scheduler
+
+    # 부팅 직후 호스트처럼 monotonic 시계가 최소 주기보다 작은 값
+    monkeypatch.setattr(scheduler, "time", types.SimpleNamespace(monotonic=lambda: 10.0, time=time.time))
+
+    async def run():
+        await tracker.track_product("노트북")
+        tracker.scheduler.start()
+        await asyncio.sleep(0.2)
+        stats = tracker.scheduler.stats()
+        await tracker.scheduler.stop()
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats["tracked_keywords"] == 1
+    assert stats["cycles"] == 1
+
+
+def test_failed_sync_backs_off_instead_of_spinning(tracker, monkeypatch):
+    async def broken_sync():
+        raise RuntimeError("db locked")
+
+    monkeypatch.setattr(tracker.scheduler, "_sync", broken_sync)
+
+    async def run():
+        tracker.scheduler.start()
+        await asyncio.sleep(0.5)
+        failures = tracker.scheduler.failures
+        await tracker.scheduler.stop()
+        return failures
+
+    assert asyncio.run(run()) == 1
+    assert tracker.scheduler.stats()["next_run_at"] is not None
+
+
+def test_refresh_reads_change_stats_once_per_cycle(tracker, monkeypatch):
+    reads = []
+    read_stats = tracker.db.get_price_change_stats_by_group
+    monkeypatch.setattr(tracker.db, "get_price_change_stats_by_group", lambda *a: reads.append(a) or read_stats(*a))
+
+    async def run():
+        for keyword in ("노트북", "모니터", "키보드"):
+            await tracker.track_product(keyword)
+        return await tracker.scheduler.refresh_all()
+
+    assert asyncio.run(run()) == 3
+    assert len(reads) == 1
+    assert sorted(reads[0][0]) == ["노트북", "모니터", "키보드"]
+    assert tracker.scheduler.stats()["queue_depth"] == 3
+
+
+def test_refresh_all_waits_for_running_cycle(tracker, monkeypatch):
+    release = asyncio.Event()
+    refresh_group = tracker.scheduler._refresh_group
+
+    async def slow_refresh_group(keyword, items):
+        await release.wait()
+        return await refresh_group(keyword, items)
+
+    monkeypatch.setattr(tracker.scheduler, "_refresh_group", slow_refresh_group)
+
+    async def run():
+        await tracker.track_product("노트북")
+        await tracker.track_product("모니터")
+        tracker.scheduler.start()
+        await asyncio.sleep(0.1)  # 백그라운드 주기가 두 검색어를 꺼내 갱신 중
+
+        refresh = asyncio.create_task(tracker.scheduler.refresh_all())
+        await asyncio.sleep(0.1)
+        release.set()
+        refreshed = await refresh
+        depth = tracker.scheduler.stats()["queue_depth"]
+        await tracker.scheduler.stop()
+        return refreshed, depth
+
+    # 겹친 두 갱신이 같은 검색어를 두 번 예약하지 않음
+    assert asyncio.run(run()) == (2, 2)
+
+
+def test_keywords_sharing_a_normalized_query_refresh_with_one_search(tracker):
+    async def run():
+        await tracker.track_product("노트북")
+        await tracker.track_product("  노트북 ")
+        await tracker.track_product("모니터")
+        tracker.fake_naver.calls.clear()
+        return await tracker.scheduler.refresh_all()
+
+    assert asyncio.run(run()) == 2
+    assert sorted(call["query"] for call in tracker.fake_naver.calls) == ["노트북", "모니터"]
+
+
+def test_adaptive_interval_follows_volatility_recency_and_alert_distance():
+    from scheduler import adaptive_interval
+
+    day = 86400
+    # 변동 없고 알림도 없으면 최대 간격
+    assert adaptive_interval(0, 7 * day, None, None, 300, 21600) == 21600
+    # 평균 변경 간격의 절반: 7일에 14번(12시간마다) 바뀌면 6시간마다
+    assert adaptive_interval(14, 7 * day, None, None, 300, 86400) == 21600
+    # 하루 24번 바뀌면 30분마다
+    assert adaptive_interval(24, day, None, None, 300, 21600) == 1800
+    # 방금 바뀐 상품은 최소 간격까지 줄어듦
+    assert adaptive_interval(0, day, 60, None, 300, 21600) == 300
+    # 목표가 도달 시 최소 간격, 거리 50% 이상이면 최대 간격
+    assert adaptive_interval(0, day, None, 0.0, 300, 21600) == 300
+    assert adaptive_interval(0, day, None, 0.6, 300, 21600) == 21600
+    assert adaptive_interval(0, day, None, 0.25, 300, 21600) == 300 + 0.5 * (21600 - 300)
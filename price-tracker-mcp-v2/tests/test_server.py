@@ -0,0 +1,175 @@
+"""
+MCP 도구 호출 테스트 (메모리 내 클라이언트)
+"""
+import asyncio
+import warnings
+
+from fastmcp import Client
+from mcp.types import ProgressNotification
+
+from progress import PARTIAL_META_KEY, progress_partial
+from response import json_size
+
+
+def test_batch_search_streams_partials_in_progress_notifications(tracker, monkeypatch):
+    import server
+
+    monkeypatch.setattr(server, "_tracker", tracker)
+    messages = []
+    partials = {}
+
+    async def on_progress(progress, total, message):
+        messages.append((progress, total, message))
+
+    async def on_message(message):
+        if isinstance(message, ProgressNotification):
+            partials.update(progress_partial(message.params))
+
+    async def run():
+        async with Client(server.mcp, message_handler=on_message) as client:
+            return await client.call_tool(
+                "batch_search", {"keywords": ["노트북", "모니터"], "count": 3, "fields": ["title", "price"]},
+                progress_handler=on_progress
+            )
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        result = asyncio.run(run())
+
+    assert result.structured_content["success"]
+    assert [(progress, total) for progress, total, _ in messages] == [(1, 2), (2, 2)]
+    for _, _, message in messages:
+        assert message.startswith("'") and "완료" in message and "{" not in message
+    assert partials == result.structured_content["results"]
+    assert set(partials["노트북"]["products"][0]) == {"title", "price"}
+    assert not [w for w in caught if "Deprecat" in type(w.message).__name__]
+
+
+def test_batch_progress_shape_applies_response_cap(monkeypatch):
+    import server
+
+    monkeypatch.setattr(server.Config, "RESPONSE_MAX_BYTES", 1000)
+    products = [{"title": f"상품 {i}", "price": 1000 + i, "link": "https://example.com/" + "x" * 50} for i in range(50)]
+    shape = server.batch_progress_shape(server.batch_search_entry, ["title", "price"])
+
+    entry = shape({"노트북": {"result": products}}, 2)["노트북"]
+    assert entry["total_count"] == 50
+    assert 0 < len(entry["products"]) < 50
+    assert json_size(entry) <= 500
+
+
+def test_progress_partial_ignores_plain_notifications():
+    assert progress_partial({"progressToken": 1, "progress": 1, "message": "50% 완료"}) is None
+    assert progress_partial({"_meta": {PARTIAL_META_KEY: {"a": 1}}}) == {"a": 1}
+
+
+def test_lazy_init_after_failed_warm_up_starts_background_tasks(tracker, monkeypatch):
+    import server
+
+    monkeypatch.setattr(server, "_tracker", None)
+    monkeypatch.setattr(server, "_tracker_init", None)
+    monkeypatch.setattr(server, "_tracker_error", None)
+    attempts = []
+
+    def create_tracker():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("disk I/O error")
+        return tracker
+
+    monkeypatch.setattr(server, "_create_tracker", create_tracker)
+
+    async def run():
+        await server.warm_up()
+        assert server._tracker_error == "OSError: disk I/O error"
+
+        assert await server.get_tracker() is tracker
+        assert await server.get_tracker() is tracker
+        running = tracker.scheduler.stats()["running"], not tracker._best_deals_task.done()
+        await tracker.scheduler.stop()
+        tracker._best_deals_task.cancel()
+        return running
+
+    assert asyncio.run(run()) == (True, True)
+    assert len(attempts) == 2
+
+
+def test_metrics_label_unregistered_tools_as_unknown(tracker, monkeypatch):
+    import server
+    from metrics import TOOL_CALLS
+
+    monkeypatch.setattr(server, "_tracker", tracker)
+
+    async def run():
+        async with Client(server.mcp) as client:
+            await client.call_tool("get_triggered_alerts", {})
+            for name in ("bogus_1", "bogus_2"):
+                try:
+                    await client.call_tool(name, {})
+                except Exception:
+                    pass
+
+    asyncio.run(run())
+    tools = {labels[0] for _, _, labels, _ in TOOL_CALLS.samples()}
+    assert {"get_triggered_alerts", "unknown"} <= tools
+    assert not tools & {"bogus_1", "bogus_2"}
+
+
+def test_get_price_history_fields_for_long_range(tracker, monkeypatch):
+    import server
+
+    monkeypatch.setattr(server, "_tracker", tracker)
+    asyncio.run(tracker.track_product("노트북"))
+
+    result = asyncio.run(server.get_price_history("노트북", days=90, fields=["price", "created_at"]))
+    assert result["success"], result
+    assert result["resolution"] == "daily"
+    assert set(result["history"][0]) == {"price", "created_at"}
+
+    result = asyncio.run(server.get_price_history("노트북", days=7, fields=["average_price"]))
+    assert not result["success"]
+    assert "사용 가능: product_name, platform, price, created_at" in result["error"]
+
+
+def test_compare_prices_deep_reports_pages_and_projects_fields(tracker, monkeypatch):
+    import server
+
+    monkeypatch.setattr(server, "_tracker", tracker)
+    tracker.fake_naver.total = 250
+
+    result = asyncio.run(server.compare_prices("노트북", deep=True, fields=["title", "price"]))
+    assert result["success"], result
+    assert result["statistics"]["total_count"] == 250
+    assert result["pages_fetched"] == 6 and not result["partial"]
+    assert set(result["top_products"][0]) == {"title", "price"}
+
+
+def test_shutdown_during_warm_up_closes_the_tracker_it_creates(tracker, monkeypatch):
+    import time
+
+    import server
+
+    monkeypatch.setattr(server, "_tracker", None)
+    monkeypatch.setattr(server, "_tracker_init", None)
+    monkeypatch.setattr(server, "_tracker_error", None)
+    closed = []
+    aclose = tracker.aclose
+
+    async def record_aclose():
+        closed.append(tracker)
+        await aclose()
+
+    def slow_create_tracker():
+        time.sleep(0.3)
+        return tracker
+
+    async def stop_quickly(**kwargs):
+        await asyncio.sleep(0.05)  # 생성이 끝나기 전에 서버가 종료됨
+
+    monkeypatch.setattr(tracker, "aclose", record_aclose)
+    monkeypatch.setattr(server, "_create_tracker", slow_create_tracker)
+    monkeypatch.setattr(server.mcp, "run_async", stop_quickly)
+
+    asyncio.run(server.main())
+    assert closed == [tracker]
+    assert server._tracker is None
@@ -0,0 +1,88 @@
+"""
+요청 트레이싱 테스트
+"""
+import asyncio
+
+from tracing import TRACER, current_span, start_trace
+
+
+def test_background_loops_started_in_a_tool_call_do_not_join_its_trace(tracker, monkeypatch):
+    monkeypatch.setattr(TRACER, "enabled", True)
+    seen = {}
+
+    async def scheduler_run():
+        seen["scheduler"] = current_span()
+
+    async def best_deals_loop():
+        seen["best_deals"] = current_span()
+
+    monkeypatch.setattr(tracker.scheduler, "_run", scheduler_run)
+    monkeypatch.setattr(tracker, "_best_deals_loop", best_deals_loop)
+
+    async def run():
+        with start_trace("tool search_product") as root:
+            assert root is not None
+            tracker.scheduler.start()
+            tracker.start_best_deals_refresh()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert seen == {"scheduler": None, "best_deals": None}
+
+
+def test_trace_exports_one_otlp_line_per_request(tmp_path):
+    import json
+
+    from tracing import Tracer
+
+    tracer = Tracer()
+    path = tmp_path / "traces.jsonl"
+    tracer.configure(True, export_path=str(path))
+
+    with tracer.start_trace("tools/call search_product", tool="search_product"):
+        with tracer.span("naver.request") as request:
+            request.set_attribute("http.status_code", 200)
+        with tracer.span("db.insert_price_records"):
+            pass
+    with tracer.start_trace("tools/call compare_prices"):
+        pass
+    tracer.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    spans = json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    root = next(s for s in spans if not s.get("parentSpanId"))
+    assert root["name"] == "tools/call search_product"
+    assert sorted(s["name"] for s in spans if s.get("parentSpanId") == root["spanId"]) == [
+        "db.insert_price_records", "naver.request"
+    ]
+    assert {s["traceId"] for s in spans} == {root["traceId"]}
+    assert tracer.stats()["exported_spans"] == 4
+
+
+def test_profiler_samples_only_while_a_tool_call_is_active():
+    import time
+
+    from tracing import SamplingProfiler
+
+    profiler = SamplingProfiler()
+    profiler.configure(1.0, interval_ms=1)
+
+    def busy_tool_body():
+        deadline = time.monotonic() + 0.2
+        while time.monotonic() < deadline:
+            pass
+
+    profiler.begin("search_product")
+    busy_tool_body()
+    profiler.end("search_product")
+    time.sleep(0.05)
+    samples = profiler.stats()["samples"]
+    time.sleep(0.1)
+
+    assert samples > 0
+    assert profiler.stats()["samples"] == samples
+    assert any(
+        line.startswith("tool:search_product;") and "busy_tool_body" in line
+        for line in profiler.collapsed().splitlines()
+    )
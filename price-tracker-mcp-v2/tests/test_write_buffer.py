@@ -0,0 +1,113 @@
+"""
+PriceRecordWriter 일괄 저장/재시도 테스트
+"""
+import threading
+
+import pytest
+
+from write_buffer import PriceRecordWriter
+
+
+class FlakyStore:
+    """fail_times번 실패한 뒤 저장에 성공하는 flush_fn"""
+
+    def __init__(self, fail_times: int):
+        self.fail_times = fail_times
+        self.saved = []
+
+    def __call__(self, batch):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("database is locked")
+        self.saved.extend(batch)
+
+
+def make_writer(store, **kwargs) -> PriceRecordWriter:
+    return PriceRecordWriter(store, batch_size=100, flush_interval=3600, **kwargs)
+
+
+def test_failed_batch_is_retried_on_next_flush():
+    store = FlakyStore(fail_times=1)
+    writer = make_writer(store)
+    writer.add(("a",))
+
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    writer.add(("b",))
+    assert writer.stats()["pending"] == 2
+
+    assert writer.flush() == 2
+    assert store.saved == [("a",), ("b",)]
+    writer.close()
+
+
+def test_retry_backlog_counts_toward_max_pending():
+    store = FlakyStore(fail_times=1)
+    writer = make_writer(store, max_pending=2)
+    writer.add(("a",))
+    writer.add(("b",))
+    with pytest.raises(RuntimeError):
+        writer.flush()
+
+    # 재시도 대기 기록이 자리를 차지하므로 저장될 때까지 add()가 대기
+    blocked = threading.Thread(target=writer.add, args=(("c",),))
+    blocked.start()
+    blocked.join(0.2)
+    assert blocked.is_alive()
+
+    writer.flush()
+    blocked.join(1)
+    assert not blocked.is_alive()
+    writer.close()
+    assert store.saved == [("a",), ("b",), ("c",)]
+
+
+def test_batch_dropped_after_max_retries():
+    store = FlakyStore(fail_times=2)
+    writer = make_writer(store, max_pending=2, max_retries=2)
+    writer.add(("a",))
+    writer.add(("b",))
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            writer.flush()
+
+    stats = writer.stats()
+    assert stats["dropped"] == 2
+    assert stats["pending"] == 0
+    writer.add(("c",))
+    writer.add(("d",))
+    writer.close()
+    assert store.saved == [("c",), ("d",)]
+
+
+def test_dropping_retry_batch_keeps_untried_records():
+    store = FlakyStore(fail_times=2)
+    writer = make_writer(store, max_retries=2)
+    writer.add(("a",))
+    with pytest.raises(RuntimeError):
+        writer.flush()
+
+    # 재시도 배치(a)만 두 번째 실패로 버려지고, 아직 시도하지 않은 b는 남음
+    writer.add(("b",))
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    assert writer.stats()["dropped"] == 1
+    assert writer.stats()["pending"] == 1
+
+    assert writer.flush() == 1
+    assert store.saved == [("b",)]
+    writer.close()
+
+
+def test_close_unregisters_even_if_final_flush_fails(monkeypatch):
+    import write_buffer
+
+    unregistered = []
+    monkeypatch.setattr(write_buffer.atexit, "unregister", unregistered.append)
+    writer = make_writer(FlakyStore(fail_times=10))
+    writer.add(("a",))
+
+    with pytest.raises(RuntimeError):
+        writer.close()
+    assert unregistered == [writer.close]
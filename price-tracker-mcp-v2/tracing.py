@@ -0,0 +1,483 @@
+"""
+요청 트레이싱과 샘플링 프로파일러 (선택 기능, 기본 꺼짐)
+
+- 트레이싱: 도구 호출마다 루트 span을 만들고 contextvars로 하위 span(PriceTracker,
+  네이버 API, HTTP 연결 단계, DB 쿼리)을 연결함. 끝난 요청은 OTLP JSON 한 줄로 파일에 기록.
+  활성 span이 없으면 span()/traced()는 아무것도 하지 않음.
+- 프로파일러: 일부 도구 호출 동안 스레드 스택을 주기적으로 수집해 flamegraph용
+  collapsed 형식("프레임;프레임;... 횟수")으로 누적함.
+"""
+import asyncio
+import atexit
+import contextvars
+import functools
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kind
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+# OTLP status code
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+def _otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict) -> List[Dict]:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items() if v is not None]
+
+
+class Trace:
+    """한 루트 span 아래의 span 모음"""
+
+    __slots__ = ("trace_id", "spans", "exported")
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List["Span"] = []
+        self.exported = False
+
+
+class Span:
+    """작업 구간 하나"""
+
+    __slots__ = (
+        "tracer", "trace", "span_id", "parent_id", "name", "kind",
+        "start_ns", "end_ns", "attributes", "events", "status", "message"
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        trace: Trace,
+        name: str,
+        parent: Optional["Span"] = None,
+        kind: int = KIND_INTERNAL,
+        attributes: Optional[Dict] = None
+    ):
+        self.tracer = tracer
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else ""
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes or {}
+        self.events: List[Dict] = []
+        self.status = 0
+        self.message = ""
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes):
+        self.events.append({"timeUnixNano": str(time.time_ns()), "name": name,
+                            "attributes": _otlp_attributes(attributes)})
+
+    def set_error(self, error):
+        """오류 상태로 표시 (예외 또는 메시지)"""
+        self.status = STATUS_ERROR
+        self.message = f"{type(error).__name__}: {error}" if isinstance(error, BaseException) else str(error)
+
+    def end(self, error: Optional[BaseException] = None):
+        if self.end_ns:
+            return
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.set_error(error)
+        self.tracer._finish(self)
+
+    def to_otlp(self) -> Dict:
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "events": self.events
+        }
+        if self.status:
+            span["status"] = {"code": self.status, "message": self.message}
+        return span
+
+
+class _SpanContext:
+    """span을 현재 span으로 지정하는 컨텍스트 매니저"""
+
+    __slots__ = ("span", "_token")
+
+    def __init__(self, span: Span):
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self._token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        # 취소는 오류가 아니라 호출자가 결과를 기다리지 않은 것
+        self.span.end(exc if exc is not None and not isinstance(exc, asyncio.CancelledError) else None)
+        return False
+
+
+class _NoopContext:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopContext()
+
+
+class Tracer:
+    """span 생성과 OTLP JSON 파일 내보내기 (백그라운드 스레드에서 기록)"""
+
+    def __init__(self):
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.export_path: Optional[str] = None
+        self.service_name = "price-tracker-mcp"
+
+        self.traces = 0
+        self.exported_spans = 0
+        self.dropped = 0
+
+        self._queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue(maxsize=10000)
+        self._writer: Optional[threading.Thread] = None
+
+    def configure(
+        self,
+        enabled: bool,
+        sample_rate: float = 1.0,
+        export_path: Optional[str] = None,
+        service_name: str = "price-tracker-mcp"
+    ):
+        """
+        Args:
+            enabled: 트레이싱 사용 여부
+            sample_rate: 트레이싱할 요청 비율 (0~1)
+            export_path: OTLP JSON 기록 파일 (요청마다 한 줄)
+            service_name: resource의 service.name
+        """
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.export_path = export_path
+        self.service_name = service_name
+
+        if enabled and export_path and self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="trace-exporter", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+    def start_trace(self, name: str, kind: int = KIND_SERVER, **attributes):
+        """
+        새 요청의 루트 span 시작 (샘플링에서 빠지면 아무것도 하지 않음)
+
+        이미 활성 span이 있으면 그 아래 span으로 만듦
+        """
+        parent = _current.get()
+        if parent is not None:
+            return _SpanContext(Span(self, parent.trace, name, parent, kind, attributes))
+        if not self.enabled or random.random() >= self.sample_rate:
+            return _NOOP
+        self.traces += 1
+        return _SpanContext(Span(self, Trace(), name, None, kind, attributes))
+
+    def span(self, name: str, kind: int = KIND_INTERNAL, **attributes):
+        """현재 span 아래에 하위 span 시작 (활성 span이 없으면 아무것도 하지 않음)"""
+        parent = _current.get()
+        if parent is None:
+            return _NOOP
+        return _SpanContext(Span(self, parent.trace, name, parent, kind, attributes))
+
+    def traced(self, name: Optional[str] = None, **attributes) -> Callable:
+        """함수 실행을 하위 span으로 기록하는 데코레이터 (기본 이름: 클래스.메서드)"""
+        def decorator(func: Callable) -> Callable:
+            span_name = name or func.__qualname__
+
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    if _current.get() is None:
+                        return await func(*args, **kwargs)
+                    with self.span(span_name, **attributes):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if _current.get() is None:
+                    return func(*args, **kwargs)
+                with self.span(span_name, **attributes):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def http_trace(self, parent: Span) -> Callable:
+        """
+        httpx 요청의 extensions["trace"] 콜백 - 연결(DNS+TCP), TLS, 요청 전송, 응답 대기/수신
+        단계를 parent 아래 span으로 기록
+        """
+        open_spans: Dict[str, Span] = {}
+
+        async def trace(event_name: str, info: Dict):
+            step, _, phase = event_name.rpartition(".")
+            if phase == "started":
+                open_spans[step] = Span(self, parent.trace, f"http {step}", parent, KIND_CLIENT)
+            elif phase in ("complete", "failed"):
+                span = open_spans.pop(step, None)
+                if span is not None:
+                    span.end(info.get("exception") if phase == "failed" else None)
+
+        return trace
+
+    def _finish(self, span: Span):
+        trace = span.trace
+        if trace.exported:
+            # 루트가 끝난 뒤 완료된 span (백그라운드로 이어진 작업)
+            self._export([span])
+            return
+        trace.spans.append(span)
+        if not span.parent_id:
+            trace.exported = True
+            spans, trace.spans = trace.spans, []
+            self._export(spans)
+
+    def _export(self, spans: List[Span]):
+        if self._writer is None:
+            return
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += len(spans)
+
+    def _write_loop(self):
+        while True:
+            spans = self._queue.get()
+            if spans is None:
+                return
+            batch = [spans]
+            while True:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    self._write(batch)
+                    return
+                batch.append(more)
+            self._write(batch)
+
+    def _write(self, batch: List[List[Span]]):
+        lines = []
+        for spans in batch:
+            lines.append(json.dumps({
+                "resourceSpans": [{
+                    "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                    "scopeSpans": [{
+                        "scope": {"name": "price-tracker"},
+                        "spans": [span.to_otlp() for span in spans]
+                    }]
+                }]
+            }, ensure_ascii=False, separators=(",", ":")))
+            self.exported_spans += len(spans)
+        try:
+            with open(self.export_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logger.warning(f"⚠️ 트레이스 기록 실패: {e}")
+
+    def close(self):
+        """남은 트레이스 기록 후 기록 스레드 종료"""
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+        self._writer = None
+        atexit.unregister(self.close)
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "traces": self.traces,
+            "exported_spans": self.exported_spans,
+            "dropped_spans": self.dropped
+        }
+
+
+# 대기 중인 스레드의 맨 위 프레임 (파일, 함수) - 프로파일에서 제외
+_IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+class SamplingProfiler:
+    """
+    선택된 도구 호출이 실행 중인 동안만 모든 스레드의 스택을 주기적으로 수집
+
+    이벤트 루프 스레드의 스택 앞에는 그 시점에 프로파일링 중인 도구 이름을 붙임
+    (동시에 여러 도구가 실행 중이면 모두 표시). 다른 스레드는 스레드 이름을 붙임.
+    """
+
+    def __init__(self):
+        self.sample_rate = 0.0
+        self.interval = 0.005
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.profiled_calls = 0
+
+        self._active: Counter = Counter()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loop_thread_id: Optional[int] = None
+
+    def configure(self, sample_rate: float, interval_ms: float = 5):
+        """
+        Args:
+            sample_rate: 프로파일링할 도구 호출 비율 (0~1, 0이면 사용 안 함)
+            interval_ms: 스택 수집 간격 (밀리초)
+        """
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def should_sample(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def begin(self, label: str):
+        """도구 호출 프로파일링 시작 (이벤트 루프 스레드에서 호출)"""
+        with self._lock:
+            self._active[label] += 1
+            self.profiled_calls += 1
+        self._loop_thread_id = threading.get_ident()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def end(self, label: str):
+        with self._lock:
+            self._active[label] -= 1
+            if self._active[label] <= 0:
+                del self._active[label]
+            if not self._active:
+                self._wake.clear()
+
+    def _run(self):
+        me = threading.get_ident()
+        while True:
+            self._wake.wait()
+            with self._lock:
+                labels = "+".join(sorted(self._active))
+            if labels:
+                self._sample(me, labels)
+            time.sleep(self.interval)
+
+    def _sample(self, me: int, labels: str):
+        names = {t.ident: t.name for t in threading.enumerate()}
+        collected = []
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == me:
+                continue
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            root = f"tool:{labels}" if thread_id == self._loop_thread_id else f"thread:{names.get(thread_id, thread_id)}"
+            collected.append(root + ";" + ";".join(reversed(stack)))
+
+        with self._lock:
+            self.stacks.update(collected)
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """누적 스택 (flamegraph.pl / speedscope의 collapsed 형식)"""
+        with self._lock:
+            items = self.stacks.most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in items)
+
+    def dump(self, path: str) -> int:
+        """누적 스택을 파일로 저장하고 스택 종류 수 반환"""
+        text = self.collapsed()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return text.count("\n")
+
+    def reset(self):
+        with self._lock:
+            self.stacks.clear()
+            self.samples = 0
+
+    def stats(self) -> Dict:
+        return {
+            "sample_rate": self.sample_rate,
+            "interval_ms": self.interval * 1000,
+            "profiled_calls": self.profiled_calls,
+            "samples": self.samples,
+            "stacks": len(self.stacks)
+        }
+
+
+TRACER = Tracer()
+PROFILER = SamplingProfiler()
+
+span = TRACER.span
+traced = TRACER.traced
+start_trace = TRACER.start_trace
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def detached_task(coro) -> asyncio.Task:
+    """
+    호출 측의 contextvars를 물려받지 않는 Task 생성 (오래 도는 백그라운드 루프용)
+
+    도구 호출 중에 시작돼도 이후 span이 이미 끝난 그 호출의 트레이스에 붙지 않음
+    """
+    return contextvars.Context().run(asyncio.create_task, coro)
@@ -0,0 +1,145 @@
+"""
+가격 기록 write-behind 버퍼 (모아서 한 트랜잭션으로 저장)
+"""
+import atexit
+import logging
+import queue
+import threading
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PriceRecordWriter:
+    """
+    가격 기록을 큐에 모았다가 개수 또는 시간 기준으로 일괄 저장
+
+    저장을 기다리는 기록(재시도 대기 포함)이 max_pending개면 add()가 대기하여 호출 측에
+    backpressure를 전달함. 저장에 max_retries번 연속 실패한 기록은 버림
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[List[Tuple]], None],
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+        max_retries: int = 5
+    ):
+        """
+        Args:
+            flush_fn: 기록 목록을 한 트랜잭션으로 저장하는 함수
+            batch_size: 이 개수가 쌓이면 즉시 저장
+            flush_interval: 최대 저장 간격 (초)
+            max_pending: 저장 대기 기록 최대 수 (재시도 대기 포함, 초과 시 add() 대기)
+            max_retries: 같은 기록의 저장 시도 횟수 (넘으면 버림)
+        """
+        self.flush_fn = flush_fn
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+
+        self._queue: "queue.Queue[Tuple]" = queue.Queue()
+        self._slots = threading.Semaphore(max_pending)  # 저장이 끝나거나 버려질 때 반환
+        self._retry: List[Tuple] = []
+        self._retry_attempts = 0
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+
+        self.flushed = 0
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0
+
+        self._thread = threading.Thread(target=self._run, name="price-record-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, record: Tuple):
+        """기록 추가 (저장 대기 기록이 가득 차면 공간이 생길 때까지 대기)"""
+        if self._closed:
+            self.flush_fn([record])
+            return
+
+        self._slots.acquire()
+        self._queue.put(record)
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """
+        대기 중인 기록을 모두 저장하고 저장된 개수 반환
+
+        이전에 실패한 기록은 자기 시도 횟수를 가진 별도 배치로 먼저 저장하고, 새 기록은
+        그 뒤에 따로 저장함 (재시도 배치가 버려져도 한 번도 시도하지 않은 기록은 남음)
+        """
+        with self._flush_lock:
+            saved = 0
+            if self._retry:
+                saved += self._write(self._retry, self._retry_attempts)
+
+            batch = []
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if batch:
+                saved += self._write(batch, 0)
+            return saved
+
+    def _write(self, batch: List[Tuple], attempts: int) -> int:
+        """배치 하나를 저장 (실패 시 재시도 대기로 남기거나 max_retries회째면 버리고 예외 전파)"""
+        try:
+            self.flush_fn(batch)
+        except Exception as e:
+            self.failures += 1
+            attempts += 1
+            if attempts < self.max_retries:
+                # 다음 저장 때 다시 시도 (자리를 계속 차지하므로 add()의 대기가 유지됨)
+                self._retry, self._retry_attempts = batch, attempts
+            else:
+                logger.error(f"❌ 가격 기록 {len(batch)}개 저장 {attempts}회 실패 - 버림: {e}")
+                self.dropped += len(batch)
+                self._retry, self._retry_attempts = [], 0
+                self._slots.release(len(batch))
+            raise
+
+        self._retry, self._retry_attempts = [], 0
+        self._slots.release(len(batch))
+        self.flushed += len(batch)
+        self.batches += 1
+        return len(batch)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"❌ 가격 기록 일괄 저장 실패: {e}")
+
+    def close(self):
+        """백그라운드 스레드 종료 후 남은 기록 저장"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        try:
+            self._thread.join()
+            self.flush()
+        finally:
+            atexit.unregister(self.close)
+
+    def stats(self) -> Dict:
+        """버퍼 통계"""
+        return {
+            "pending": self._queue.qsize() + len(self._retry),
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "failures": self.failures,
+            "dropped": self.dropped
+        }